@@ -68,6 +68,8 @@ def configure_logging(level: int = None):
 from arcade import key
 # noinspection PyPep8
 from arcade import resources
+# noinspection PyPep8
+from arcade import perf
 
 # --- Generated imports ---
 from .window_commands import close_window
@@ -124,6 +126,10 @@ def configure_logging(level: int = None):
 
 from .hitbox import calculate_hit_box_points_detailed
 from .hitbox import calculate_hit_box_points_simple
+from .hitbox import get_hit_box_cache_dir
+from .hitbox import get_hit_box_points
+from .hitbox import prewarm_hit_box_cache
+from .hitbox import set_hit_box_cache_dir
 
 from .drawing_support import get_four_byte_color
 from .drawing_support import get_three_float_color
@@ -132,7 +138,10 @@ def configure_logging(level: int = None):
 from .drawing_support import make_transparent_color
 
 from .texture import Texture
+from .texture import TextureCache
+from .texture import TexturePreload
 from .texture import cleanup_texture_cache
+from .texture import get_texture_cache
 from .texture import load_spritesheet
 from .texture import load_texture
 from .texture import load_texture_pair
@@ -140,6 +149,7 @@ def configure_logging(level: int = None):
 from .texture import make_circle_texture
 from .texture import make_soft_circle_texture
 from .texture import make_soft_square_texture
+from .texture import preload_textures
 from .texture import trim_image
 
 from .buffered_draw_commands import TShape
@@ -206,6 +216,7 @@ def configure_logging(level: int = None):
 from .joysticks import get_game_controllers
 from .joysticks import get_joysticks
 
+from .emitter import ArrayEmitter
 from .emitter import EmitBurst
 from .emitter import EmitController
 from .emitter import EmitInterval
@@ -245,6 +256,7 @@ def configure_logging(level: int = None):
 
 from .sprite_list import SpriteList
 from .sprite_list import check_for_collision
+from .sprite_list import check_for_collision_between_lists
 from .sprite_list import check_for_collision_with_list
 from .sprite_list import check_for_collision_with_lists
 from .sprite_list import get_closest_sprite
@@ -266,13 +278,20 @@ def configure_logging(level: int = None):
 from .version import VERSION
 
 from .paths import AStarBarrierList
+from .paths import AStarClusterGraph
+from .paths import AStarSearch
+from .paths import FlowField
 from .paths import astar_calculate_path
 from .paths import has_line_of_sight
+from .paths import has_line_of_sight_many
 
 from .context import ArcadeContext
 
 from .texture_atlas import TextureAtlas
 from .texture_atlas import AtlasRegion
+from .texture_atlas import AtlasAllocator
+from .texture_atlas import SkylineAllocator
+from .texture_atlas import StripAllocator
 
 # noinspection PyPep8
 from arcade import experimental
@@ -294,10 +313,14 @@ def configure_logging(level: int = None):
 # --- Generated __all__ ---
 
 __all__ = ['AStarBarrierList',
+           'AStarClusterGraph',
+           'AStarSearch',
            'AnimatedTimeBasedSprite',
            'AnimatedWalkingSprite',
            'AnimationKeyframe',
            'ArcadeContext',
+           'ArrayEmitter',
+           'AtlasAllocator',
            'Camera',
            'Color',
            'DEFAULT_FONT_NAMES',
@@ -315,6 +338,7 @@ def configure_logging(level: int = None):
            'FACE_UP',
            'FadeParticle',
            'FilenameOrTexture',
+           'FlowField',
            'LifetimeParticle',
            'MOUSE_BUTTON_LEFT',
            'MOUSE_BUTTON_MIDDLE',
@@ -336,15 +360,19 @@ def configure_logging(level: int = None):
            'Scene',
            'Shape',
            'ShapeElementList',
+           'SkylineAllocator',
            'Sound',
            'Sprite',
            'SpriteCircle',
            'SpriteList',
            'SpriteSolidColor',
+           'StripAllocator',
            'TShape',
            'Text',
            'Texture',
            'TextureAtlas',
+           'TextureCache',
+           'TexturePreload',
            'TileMap',
            'VERSION',
            'Vector',
@@ -355,6 +383,7 @@ def configure_logging(level: int = None):
            'calculate_hit_box_points_detailed',
            'calculate_hit_box_points_simple',
            'check_for_collision',
+           'check_for_collision_between_lists',
            'check_for_collision_with_list',
            'check_for_collision_with_lists',
            'clamp',
@@ -419,6 +448,8 @@ def configure_logging(level: int = None):
            'get_four_byte_color',
            'get_four_float_color',
            'get_game_controllers',
+           'get_hit_box_cache_dir',
+           'get_hit_box_points',
            'get_image',
            'get_joysticks',
            'get_pixel',
@@ -429,10 +460,12 @@ def configure_logging(level: int = None):
            'get_screens',
            'get_sprites_at_exact_point',
            'get_sprites_at_point',
+           'get_texture_cache',
            'create_text_image',
            'get_viewport',
            'get_window',
            'has_line_of_sight',
+           'has_line_of_sight_many',
            'is_point_in_polygon',
            'isometric_grid_to_screen',
            'lerp',
@@ -464,11 +497,14 @@ def configure_logging(level: int = None):
            'rand_vec_spread_deg',
            'read_tmx',
            'load_tilemap',
+           'preload_textures',
+           'prewarm_hit_box_cache',
            'rotate_point',
            'run',
            'schedule',
            'screen_to_isometric_grid',
            'set_background_color',
+           'set_hit_box_cache_dir',
            'set_viewport',
            'set_window',
            'start_render',
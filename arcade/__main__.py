@@ -1,8 +1,10 @@
+import argparse
 import sys
 import arcade
+from arcade.resources import resolve_resource_path
 
 
-if __name__ == "__main__":
+def show_info():
     window = arcade.Window()
     version_str = f"Arcade {arcade.__version__}"
     print()
@@ -13,3 +15,34 @@
     print('version:', window.ctx.gl_version)
     print('python:', sys.version)
     print('platform:', sys.platform)
+
+
+def prewarm_hit_boxes(args):
+    arcade.set_hit_box_cache_dir(args.cache_dir)
+    directory = resolve_resource_path(args.directory)
+    count = arcade.prewarm_hit_box_cache(directory, args.algorithm, args.detail)
+    print(f"Cached {args.algorithm} hit boxes for {count} images in {directory}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m arcade", description="Show information about Arcade")
+    subparsers = parser.add_subparsers(dest="command")
+
+    prewarm = subparsers.add_parser(
+        "prewarm-hit-boxes",
+        help="Store the hit boxes of all images in a directory in the hit box cache",
+    )
+    prewarm.add_argument("directory", help="Directory with the images. Can be a :resources: path.")
+    prewarm.add_argument("--cache-dir", required=True, help="The hit box cache directory")
+    prewarm.add_argument("--algorithm", choices=("Simple", "Detailed"), default="Simple")
+    prewarm.add_argument("--detail", type=float, default=4.5, help="Hit box detail for the Detailed algorithm")
+
+    args = parser.parse_args(argv)
+    if args.command == "prewarm-hit-boxes":
+        prewarm_hit_boxes(args)
+    else:
+        show_info()
+
+
+if __name__ == "__main__":
+    main()
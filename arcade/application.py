@@ -12,6 +12,7 @@
 import pyglet.gl as gl
 
 import arcade
+from arcade import perf
 from arcade import get_display_size
 from arcade import get_viewport
 from arcade import set_viewport
@@ -236,8 +237,9 @@ def on_update(self, delta_time: float):
         pass
 
     def _dispatch_updates(self, delta_time: float):
-        self.dispatch_event('update', delta_time)
-        self.dispatch_event('on_update', delta_time)
+        with perf.scope("window.on_update"):
+            self.dispatch_event('update', delta_time)
+            self.dispatch_event('on_update', delta_time)
 
     def set_update_rate(self, rate: float):
         """
@@ -599,6 +601,14 @@ def dispatch_events(self):
         """ Dispatch events """
         super().dispatch_events()
 
+    def dispatch_event(self, event_type: str, *args):
+        """ Dispatch a single event to the attached handlers """
+        # Outside of the event loop pyglet queues events instead of dispatching them
+        if event_type == "on_draw" and pyglet.app.event_loop.is_running:
+            with perf.scope("window.on_draw"), perf.gpu_scope("window.on_draw.gpu"):
+                return super().dispatch_event(event_type, *args)
+        return super().dispatch_event(event_type, *args)
+
 
 def open_window(width: int, height: int, window_title: str, resizable: bool = False,
                 antialiasing: bool = True) -> Window:
@@ -71,10 +71,6 @@ def __init__(self, window: pyglet.window.Window, gc_mode: str = "auto"):
             vertex_shader=":resources:shaders/shape_element_list_vs.glsl",
             fragment_shader=":resources:shaders/shape_element_list_fs.glsl",
         )
-        # self.sprite_list_program = self.load_program(
-        #     vertex_shader=':resources:shaders/sprites/sprite_list_instanced_vs.glsl',
-        #     fragment_shader=':resources:shaders/sprites/sprite_list_instanced_fs.glsl',
-        # )
         self.sprite_list_program_no_cull: Program = self.load_program(
             vertex_shader=":resources:shaders/sprites/sprite_list_geometry_vs.glsl",
             geometry_shader=":resources:shaders/sprites/sprite_list_geometry_no_cull_geo.glsl",
@@ -82,6 +78,7 @@ def __init__(self, window: pyglet.window.Window, gc_mode: str = "auto"):
         )
         self.sprite_list_program_no_cull["Texture"] = 0
         self.sprite_list_program_no_cull["uv_texture"] = 1
+        self.sprite_list_program_no_cull["list_scale"] = 1.0
 
         self.sprite_list_program_cull: Program = self.load_program(
             vertex_shader=":resources:shaders/sprites/sprite_list_geometry_vs.glsl",
@@ -90,6 +87,15 @@ def __init__(self, window: pyglet.window.Window, gc_mode: str = "auto"):
         )
         self.sprite_list_program_cull["Texture"] = 0
         self.sprite_list_program_cull["uv_texture"] = 1
+        self.sprite_list_program_cull["list_scale"] = 1.0
+
+        self.sprite_list_program_instanced: Program = self.load_program(
+            vertex_shader=":resources:shaders/sprites/sprite_list_instanced_vs.glsl",
+            fragment_shader=":resources:shaders/sprites/sprite_list_instanced_fs.glsl",
+        )
+        self.sprite_list_program_instanced["Texture"] = 0
+        self.sprite_list_program_instanced["uv_texture"] = 1
+        self.sprite_list_program_instanced["list_scale"] = 1.0
 
         # Shapes
         self.shape_line_program: Program = self.load_program(
@@ -3,11 +3,14 @@
 over their lifetime
 """
 
+from array import array
+
 import arcade
-from arcade.particle import Particle
-from typing import Callable, cast
+from arcade.particle import FilenameOrTexture, Particle
+from typing import Callable, Optional, Tuple, cast
 from arcade.utils import _Vec2
-from arcade.arcade_types import Point, Vector
+from arcade.arcade_types import Color, Point, Vector
+from arcade.math import Mat3
 
 
 ##########
@@ -177,3 +180,294 @@ def can_reap(self):
             self._reap_cb()
             self._reap_cb = None
         return can_reap
+
+
+class ArrayEmitter:
+    """
+    Emits and manages a large number of simple particles.
+
+    Instead of a Sprite for each particle, the state of all the particles is
+    stored in flat arrays. The position, size, angle, color and texture arrays
+    use the same layout as the SpriteList buffers and are written straight to
+    the GPU when drawing. Dead particles are removed by moving the live
+    particles to the front of the arrays during the update.
+
+    Every particle moves in a straight line, rotates and fades from
+    ``start_alpha`` to ``end_alpha`` over its lifetime. Use :py:class:`Emitter`
+    for particles that need custom behavior.
+    """
+    def __init__(
+        self,
+        center_xy: Point,
+        emit_controller: EmitController,
+        texture: FilenameOrTexture,
+        change_xy_factory: Callable[[], Vector],
+        lifetime_factory: Callable[[], float],
+        offset_factory: Optional[Callable[[], Point]] = None,
+        scale: float = 1.0,
+        angle: float = 0.0,
+        change_angle: float = 0.0,
+        color: Color = (255, 255, 255),
+        start_alpha: int = 255,
+        end_alpha: int = 0,
+        change_xy: Vector = (0.0, 0.0),
+        emit_done_cb: Optional[Callable[["ArrayEmitter"], None]] = None,
+        reap_cb: Optional[Callable[[], None]] = None,
+        capacity: int = 1000,
+    ):
+        """
+        :param Point center_xy: Position of the emitter
+        :param EmitController emit_controller: Controls how many particles are emitted
+        :param FilenameOrTexture texture: Texture used by all the particles
+        :param change_xy_factory: Returns the velocity of a new particle,
+                                  relative to the angle of the emitter
+        :param lifetime_factory: Returns the lifetime of a new particle in seconds
+        :param offset_factory: Returns the position of a new particle relative to the emitter
+        :param float scale: Scale of the particles
+        :param float angle: Initial angle of the particles
+        :param float change_angle: Rotation speed of the particles
+        :param Color color: Color of the particles
+        :param int start_alpha: Alpha of new particles
+        :param int end_alpha: Alpha of particles at the end of their lifetime
+        :param Vector change_xy: Velocity of the emitter
+        :param emit_done_cb: Called when the emitter is done emitting
+        :param reap_cb: Called when the emitter can be deleted
+        :param int capacity: Initial capacity of the particle arrays
+        """
+        self.change_x = change_xy[0]
+        self.change_y = change_xy[1]
+
+        self.center_x = center_xy[0]
+        self.center_y = center_xy[1]
+        self.angle = 0.0
+        self.change_angle = 0.0
+        self.rate_factory = emit_controller
+        self.change_xy_factory = change_xy_factory
+        self.lifetime_factory = lifetime_factory
+        self.offset_factory = offset_factory
+        self._emit_done_cb = emit_done_cb
+        self._reap_cb = reap_cb
+
+        if isinstance(texture, str):
+            texture = arcade.load_texture(texture)
+        self.texture = texture
+        self.particle_angle = angle
+        self.particle_change_angle = change_angle
+        self.particle_color = color
+        self.start_alpha = start_alpha
+        self.end_alpha = end_alpha
+        self._width = texture.width * scale
+        self._height = texture.height * scale
+
+        self._count = 0
+        self._capacity = max(capacity, 1)
+
+        # Same layout as the SpriteList buffers
+        self._pos_data = array("f", [0] * self._capacity * 2)
+        self._size_data = array("f", [self._width, self._height]) * self._capacity
+        self._angle_data = array("f", [0] * self._capacity)
+        self._color_data = array("B", [color[0], color[1], color[2], start_alpha]) * self._capacity
+        self._texture_data = array("i", [0] * self._capacity)
+
+        # Simulation only
+        self._velocity_data = array("f", [0] * self._capacity * 2)
+        self._change_angle_data = array("f", [0] * self._capacity)
+        self._lifetime_elapsed_data = array("f", [0] * self._capacity)
+        self._lifetime_data = array("f", [0] * self._capacity)
+
+        self._ctx: Optional["arcade.ArcadeContext"] = None
+        self._program: Optional["arcade.gl.Program"] = None
+        self._atlas: Optional["arcade.TextureAtlas"] = None
+        self._geometry: Optional["arcade.gl.Geometry"] = None
+        self._buffers: Tuple[Tuple["arcade.gl.Buffer", array, int], ...] = ()
+        self._buffer_capacity = 0
+        self._texture_slot = -1
+
+    def _grow(self):
+        """Double the capacity of the particle arrays"""
+        extend_by = self._capacity
+        self._capacity *= 2
+
+        self._pos_data.extend([0] * extend_by * 2)
+        self._size_data.extend(array("f", [self._width, self._height]) * extend_by)
+        self._angle_data.extend([0] * extend_by)
+        self._color_data.extend(array("B", self._color_data[:4]) * extend_by)
+        self._texture_data.extend(array("i", [self._texture_slot]) * extend_by)
+        self._velocity_data.extend([0] * extend_by * 2)
+        self._change_angle_data.extend([0] * extend_by)
+        self._lifetime_elapsed_data.extend([0] * extend_by)
+        self._lifetime_data.extend([0] * extend_by)
+
+    def _emit(self):
+        """Emit one particle, its initial position and velocity are relative to the position and angle of the emitter"""
+        if self._count >= self._capacity:
+            self._grow()
+
+        i = self._count
+        self._count += 1
+
+        x, y = self.center_x, self.center_y
+        if self.offset_factory:
+            offset = self.offset_factory()
+            x += offset[0]
+            y += offset[1]
+
+        # given the velocity, rotate it by emitter's current angle
+        vel = _Vec2(*self.change_xy_factory()).rotated(self.angle)
+
+        self._pos_data[i * 2] = x
+        self._pos_data[i * 2 + 1] = y
+        self._velocity_data[i * 2] = vel.x
+        self._velocity_data[i * 2 + 1] = vel.y
+        self._angle_data[i] = self.particle_angle
+        self._change_angle_data[i] = self.particle_change_angle
+        self._color_data[i * 4 + 3] = self.start_alpha
+        self._lifetime_elapsed_data[i] = 0.0
+        self._lifetime_data[i] = self.lifetime_factory()
+
+    def get_count(self):
+        return self._count
+
+    def get_pos(self) -> Point:
+        """Get position of emitter"""
+        return self.center_x, self.center_y
+
+    def update(self):
+        # update emitter
+        self.center_x += self.change_x
+        self.center_y += self.change_y
+        self.angle += self.change_angle
+
+        # update particles
+        emit_count = self.rate_factory.how_many(1 / 60, self._count)
+        for _ in range(emit_count):
+            self._emit()
+        self._update_particles(1 / 60)
+
+    def _update_particles(self, delta_time: float):
+        """
+        Move, rotate and fade all the particles in a single pass.
+        Live particles are moved to the front of the arrays.
+        """
+        pos = self._pos_data
+        velocity = self._velocity_data
+        angle = self._angle_data
+        change_angle = self._change_angle_data
+        color = self._color_data
+        lifetime_elapsed = self._lifetime_elapsed_data
+        lifetime = self._lifetime_data
+        start_alpha = self.start_alpha
+        alpha_range = self.end_alpha - self.start_alpha
+
+        live = 0
+        for i in range(self._count):
+            elapsed = lifetime_elapsed[i] + delta_time
+            particle_lifetime = lifetime[i]
+            if elapsed >= particle_lifetime:
+                continue
+
+            i2 = i * 2
+            if live == i:
+                pos[i2] += velocity[i2]
+                pos[i2 + 1] += velocity[i2 + 1]
+                angle[i] += change_angle[i]
+                lifetime_elapsed[i] = elapsed
+            else:
+                # Move the particle into the free slot
+                live2 = live * 2
+                change_x = velocity[i2]
+                change_y = velocity[i2 + 1]
+                pos[live2] = pos[i2] + change_x
+                pos[live2 + 1] = pos[i2 + 1] + change_y
+                velocity[live2] = change_x
+                velocity[live2 + 1] = change_y
+                rotation = change_angle[i]
+                angle[live] = angle[i] + rotation
+                change_angle[live] = rotation
+                lifetime_elapsed[live] = elapsed
+                lifetime[live] = particle_lifetime
+
+            alpha = start_alpha + alpha_range * elapsed / particle_lifetime
+            color[live * 4 + 3] = 0 if alpha < 0 else 255 if alpha > 255 else int(alpha)
+            live += 1
+
+        self._count = live
+
+    def _init_gl(self):
+        """Create the buffers and geometry. Needs a window."""
+        self._ctx = arcade.get_window().ctx
+        self._program = self._ctx.sprite_list_program_cull
+        self._atlas = self._ctx.default_atlas
+        self._create_buffers()
+
+    def _create_buffers(self):
+        ctx = self._ctx
+        self._buffer_capacity = self._capacity
+        pos_buf = ctx.buffer(reserve=self._capacity * 4 * 2)
+        size_buf = ctx.buffer(reserve=self._capacity * 4 * 2)
+        angle_buf = ctx.buffer(reserve=self._capacity * 4)
+        color_buf = ctx.buffer(reserve=self._capacity * 4)
+        texture_buf = ctx.buffer(reserve=self._capacity * 4)
+        self._buffers = (
+            (pos_buf, self._pos_data, 2),
+            (size_buf, self._size_data, 2),
+            (angle_buf, self._angle_data, 1),
+            (color_buf, self._color_data, 4),
+            (texture_buf, self._texture_data, 1),
+        )
+        self._geometry = ctx.geometry([
+            arcade.gl.BufferDescription(pos_buf, "2f", ["in_pos"]),
+            arcade.gl.BufferDescription(size_buf, "2f", ["in_size"]),
+            arcade.gl.BufferDescription(angle_buf, "1f", ["in_angle"]),
+            arcade.gl.BufferDescription(texture_buf, "u4", ["in_texture"]),
+            arcade.gl.BufferDescription(color_buf, "4f1", ["in_color"], normalized=["in_color"]),
+        ])
+
+    def draw(self, blend_function: Optional[tuple] = None):
+        """
+        Draw all the particles.
+
+        :param blend_function: Optional OpenGL blend function, such as
+                               ``ctx.BLEND_ADDITIVE``. Defaults to ``ctx.BLEND_DEFAULT``.
+        """
+        if self._count == 0:
+            return
+        if self._ctx is None:
+            self._init_gl()
+        if self._buffer_capacity < self._capacity:
+            self._create_buffers()
+
+        ctx, program, atlas, geometry = self._ctx, self._program, self._atlas, self._geometry
+        if ctx is None or program is None or atlas is None or geometry is None:
+            return
+
+        texture_slot, _ = atlas.add(self.texture)
+        if texture_slot != self._texture_slot:
+            self._texture_slot = texture_slot
+            self._texture_data[:] = array("i", [texture_slot]) * self._capacity
+
+        # Only write the live particles
+        for buffer, data, components in self._buffers:
+            buffer.write(memoryview(data)[:self._count * components])
+
+        ctx.enable(ctx.BLEND)
+        ctx.blend_func = blend_function or ctx.BLEND_DEFAULT
+        program["TextureTransform"] = Mat3()
+        program["list_offset"] = 0.0, 0.0
+        program["list_scale"] = 1.0
+        program["list_angle"] = 0.0
+        atlas.texture.use(0)
+        atlas.use_uv_texture(1)
+        geometry.render(program, mode=ctx.POINTS, vertices=self._count)
+
+    def can_reap(self):
+        """Determine if Emitter can be deleted"""
+        is_emit_complete = self.rate_factory.is_complete()
+        can_reap = is_emit_complete and self._count <= 0
+        if is_emit_complete and self._emit_done_cb:
+            self._emit_done_cb(self)
+            self._emit_done_cb = None
+        if can_reap and self._reap_cb:
+            self._reap_cb()
+            self._reap_cb = None
+        return can_reap
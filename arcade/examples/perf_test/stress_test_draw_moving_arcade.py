@@ -25,6 +25,8 @@
 
 STOP_COUNT = 15000
 RESULTS_FILE = "stress_test_draw_moving_arcade.csv"
+# "geometry" or "instanced"
+RENDER_MODE = "geometry"
 
 SCREEN_WIDTH = 1800
 SCREEN_HEIGHT = 1000
@@ -114,7 +116,7 @@ def setup(self):
         """ Set up the game and initialize the variables. """
 
         # Sprite lists
-        self.coin_list = arcade.SpriteList(use_spatial_hash=False)
+        self.coin_list = arcade.SpriteList(use_spatial_hash=False, render_mode=RENDER_MODE)
 
     def on_draw(self):
         """ Draw everything """
@@ -5,27 +5,94 @@
 import math
 
 from shapely import speedups  # type: ignore
-from shapely.geometry import Polygon, Point # type: ignore
+from shapely.geometry import Polygon  # type: ignore
 from typing import List
 
 from arcade import PointList
 
 _PRECISION = 2
 
+# The separating axis test takes time proportional to the product of the
+# vertex counts. Above this product shapely is faster.
+_SAT_MAX_VERTEX_PRODUCT = 150
+
 speedups.enable()
 
 
+def _get_convex_orientation(polygon: PointList) -> int:
+    """
+    Get the orientation of a convex polygon.
+
+    :returns: 1 for counter clockwise, -1 for clockwise and 0 if the
+              polygon is concave or degenerate (less than 3 points or no area).
+    """
+    if len(polygon) < 3:
+        return 0
+
+    orientation = 0
+    x1, y1 = polygon[-2]
+    x2, y2 = polygon[-1]
+    for x3, y3 in polygon:
+        # All the corners have to turn the same way
+        cross = (x2 - x1) * (y3 - y2) - (y2 - y1) * (x3 - x2)
+        if cross > 0:
+            if orientation < 0:
+                return 0
+            orientation = 1
+        elif cross < 0:
+            if orientation > 0:
+                return 0
+            orientation = -1
+        x1, y1 = x2, y2
+        x2, y2 = x3, y3
+
+    return orientation
+
+
+def _has_separating_edge(poly_a: PointList, orientation_a: int, poly_b: PointList) -> bool:
+    """
+    Check if ``poly_b`` is completely outside one of the edges of
+    the convex polygon ``poly_a``. Polygons only touching each other
+    are considered separated.
+    """
+    x1, y1 = poly_a[-1]
+    for x2, y2 in poly_a:
+        # Outward facing normal of the edge
+        normal_x = (y2 - y1) * orientation_a
+        normal_y = (x1 - x2) * orientation_a
+        x1, y1 = x2, y2
+        if normal_x == 0 and normal_y == 0:
+            continue
+
+        edge = x2 * normal_x + y2 * normal_y
+        if min([x * normal_x + y * normal_y for x, y in poly_b]) >= edge:
+            return True
+
+    return False
+
+
 def are_polygons_intersecting(poly_a: PointList,
                               poly_b: PointList) -> bool:
     """
     Return True if two polygons intersect.
 
+    Small convex polygons are checked using the separating axis theorem.
+    Concave polygons and polygons with many vertices fall back to shapely.
+
     :param PointList poly_a: List of points that define the first polygon.
     :param PointList poly_b: List of points that define the second polygon.
     :Returns: True or false depending if polygons intersect
 
     :rtype bool:
     """
+    if len(poly_a) * len(poly_b) <= _SAT_MAX_VERTEX_PRODUCT:
+        orientation_a = _get_convex_orientation(poly_a)
+        orientation_b = _get_convex_orientation(poly_b)
+        if orientation_a and orientation_b:
+            return not (
+                _has_separating_edge(poly_a, orientation_a, poly_b)
+                or _has_separating_edge(poly_b, orientation_b, poly_a)
+            )
 
     shapely_polygon_a = Polygon(poly_a)
     shapely_polygon_b = Polygon(poly_b)
@@ -37,9 +104,35 @@ def are_polygons_intersecting(poly_a: PointList,
     return r1 and not r2
 
 
+def _get_point_location(x: float, y: float, polygon) -> int:
+    """
+    Get the location of a point compared to a polygon.
+
+    :returns: 1 if the point is inside, 0 if on the edge and -1 if outside
+    """
+    winding_number = 0
+    x1, y1 = polygon[-1]
+    for x2, y2 in polygon:
+        # Which side of the edge is the point on?
+        side = (x2 - x1) * (y - y1) - (x - x1) * (y2 - y1)
+        if side == 0 and min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2):
+            return 0
+
+        if y1 <= y:
+            if y2 > y and side > 0:
+                winding_number += 1
+        elif y2 <= y and side < 0:
+            winding_number -= 1
+
+        x1, y1 = x2, y2
+
+    return 1 if winding_number else -1
+
+
 def is_point_in_polygon(x: float, y: float, polygon_point_list):
     """
-    Use ray-tracing to see if point is inside a polygon
+    Use the winding number to see if point is inside a polygon.
+    Points on the edge of the polygon are not inside it.
 
     Args:
         x:
@@ -49,10 +142,10 @@ def is_point_in_polygon(x: float, y: float, polygon_point_list):
     Returns: bool
 
     """
-    shapely_point = Point(x, y)
-    shapely_polygon = Polygon(polygon_point_list)
+    if len(polygon_point_list) < 3:
+        return False
 
-    return shapely_polygon.contains(shapely_point)
+    return _get_point_location(x, y, polygon_point_list) > 0
 
 
 def get_distance(x1: float, y1: float, x2: float, y2: float):
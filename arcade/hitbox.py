@@ -1,12 +1,36 @@
 """
 This module is used for calculating hit boxes
 """
+import hashlib
+import logging
+import os
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Optional, Union
+
 import pymunk
 
 from PIL import Image
 
 from pymunk import autogeometry
 
+LOG = logging.getLogger(__name__)
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".bmp")
+
+# Directory for the persistent hit box cache. None disables the cache.
+_cache_dir: Optional[Path] = None
+
+
+def _get_alpha_channel(image: Image) -> Image:
+    """
+    Get the alpha channel of an RGBA image as a single band image.
+    """
+    if len(image.getbands()) != 4:
+        raise TypeError("Error, calculate_points called on image not in RGBA format")
+    return image.getchannel(3)
+
 
 def calculate_hit_box_points_simple(image):
     """
@@ -18,61 +42,26 @@ def calculate_hit_box_points_simple(image):
     :Returns: List of points
 
     """
-    left_border = 0
-    good = True
-    while good and left_border < image.width:
-        for row in range(image.height):
-            pos = (left_border, row)
-            pixel = image.getpixel(pos)
-            if type(pixel) is int or len(pixel) != 4:
-                raise TypeError("Error, calculate_points called on image not in RGBA format")
-            else:
-                if pixel[3] != 0:
-                    good = False
-                    break
-        if good:
-            left_border += 1
-
-    right_border = image.width - 1
-    good = True
-    while good and right_border > 0:
-        for row in range(image.height):
-            pos = (right_border, row)
-            pixel = image.getpixel(pos)
-            if pixel[3] != 0:
-                good = False
-                break
-        if good:
-            right_border -= 1
-
-    top_border = 0
-    good = True
-    while good and top_border < image.height:
-        for column in range(image.width):
-            pos = (column, top_border)
-            pixel = image.getpixel(pos)
-            if pixel[3] != 0:
-                good = False
-                break
-        if good:
-            top_border += 1
-
-    bottom_border = image.height - 1
-    good = True
-    while good and bottom_border > 0:
-        for column in range(image.width):
-            pos = (column, bottom_border)
-            pixel = image.getpixel(pos)
-            if pixel[3] != 0:
-                good = False
-                break
-        if good:
-            bottom_border -= 1
+    alpha_channel = _get_alpha_channel(image)
+    alpha = alpha_channel.tobytes()
+
+    # Bounding box of the non transparent pixels
+    bbox = alpha_channel.getbbox()
 
     # If the image is empty, return an empty set
+    if bbox is None:
+        return []
+
+    left_border, top_border, right_border, bottom_border = bbox
+    right_border -= 1
+    bottom_border -= 1
+
+    # A sprite only covering the top row is also treated as empty
     if bottom_border == 0:
         return []
 
+    width = image.width
+
     def _check_corner_offset(start_x, start_y, x_direction, y_direction):
 
         bad = False
@@ -81,17 +70,13 @@ def _check_corner_offset(start_x, start_y, x_direction, y_direction):
             y = start_y + (offset * y_direction)
             x = start_x
             for count in range(offset + 1):
-                my_pixel = image.getpixel((x, y))
-                # print(f"({x}, {y}) = {pixel} | ", end="")
-                if my_pixel[3] != 0:
+                if alpha[y * width + x] != 0:
                     bad = True
                     break
                 y -= y_direction
                 x += x_direction
-            # print(f" - {bad}")
             if not bad:
                 offset += 1
-        # print(f"offset: {offset}")
         return offset
 
     def _r(point, height, width):
@@ -151,17 +136,17 @@ def calculate_hit_box_points_detailed(image: Image, hit_box_detail: float = 4.5)
 
     """
 
+    alpha = _get_alpha_channel(image).tobytes()
+    width = image.width
+    height = image.height
+
     def sample_func(sample_point):
         """ Method used to sample image. """
-        if sample_point[0] < 0 \
-                or sample_point[1] < 0 \
-                or sample_point[0] >= image.width \
-                or sample_point[1] >= image.height:
+        x, y = sample_point
+        if x < 0 or y < 0 or x >= width or y >= height:
             return 0
 
-        point_tuple = sample_point[0], sample_point[1]
-        color = image.getpixel(point_tuple)
-        if color[3] > 0:
+        if alpha[int(y) * width + int(x)] > 0:
             return 255
         else:
             return 0
@@ -250,3 +235,134 @@ def sample_func(sample_point):
 
     # print(f"{sprite.texture.name} Line-sets={len(line_set)}, Original points={original_points}, Downsampled points={downsampled_points}")
     return points
+
+
+def set_hit_box_cache_dir(path: Optional[Union[str, Path]]) -> None:
+    """
+    Set the directory for the persistent hit box cache.
+
+    Calculated hit boxes are stored in this directory, keyed by a hash of
+    the image data, the hit box algorithm and the detail. Textures with
+    the same image look up their hit box here instead of calculating it
+    again, even after restarting the game. The cache is disabled by default.
+
+    :param Union[str,Path] path: The cache directory. None disables the cache.
+    """
+    global _cache_dir
+    if path is None:
+        _cache_dir = None
+        return
+
+    _cache_dir = Path(path)
+    _cache_dir.mkdir(parents=True, exist_ok=True)
+
+
+def get_hit_box_cache_dir() -> Optional[Path]:
+    """
+    Get the directory for the persistent hit box cache.
+
+    :returns: The cache directory or None if the cache is disabled
+    """
+    return _cache_dir
+
+
+def _get_cache_path(image: Image, hit_box_algorithm: str, hit_box_detail: float) -> Path:
+    """Get the cache file for the hit box of an image"""
+    image_hash = hashlib.sha1(f"{image.mode}{image.size}".encode())
+    image_hash.update(image.tobytes())
+    # The detail is only used by the detailed algorithm
+    if hit_box_algorithm != "Detailed":
+        hit_box_detail = 0
+    return _cache_dir / f"{image_hash.hexdigest()}_{hit_box_algorithm.lower()}_{hit_box_detail}.bin"  # type: ignore
+
+
+def get_hit_box_points(image: Image, hit_box_algorithm: str = "Simple", hit_box_detail: float = 4.5):
+    """
+    Calculate the hit box of an image with the given algorithm. When a cache
+    directory is set with :py:func:`set_hit_box_cache_dir` the hit box is read
+    from the cache if possible, and stored there after calculating it.
+
+    Cache files store the coordinates as a typecode byte followed by
+    the raw array data in the byte order of the machine.
+
+    :param Image image: Image get hit box from.
+    :param str hit_box_algorithm: 'Simple' or 'Detailed'
+    :param float hit_box_detail: How detailed to make the hit box. Only used by 'Detailed'.
+
+    :Returns: List of points
+    """
+    if hit_box_algorithm not in ("Simple", "Detailed"):
+        raise ValueError("hit_box_algorithm must be 'Simple' or 'Detailed'")
+
+    path = None
+    if _cache_dir is not None:
+        path = _get_cache_path(image, hit_box_algorithm, hit_box_detail)
+        try:
+            data = path.read_bytes()
+            values = array(chr(data[0]), data[1:])
+        except (OSError, IndexError, ValueError):
+            # Missing, empty or broken cache file. Calculate the hit box again.
+            pass
+        else:
+            if len(values) % 2 == 0:
+                points = list(zip(values[::2], values[1::2]))
+                return tuple(points) if hit_box_algorithm == "Simple" else points
+
+    if hit_box_algorithm == "Simple":
+        points = calculate_hit_box_points_simple(image)
+    else:
+        points = calculate_hit_box_points_detailed(image, hit_box_detail)
+
+    if path is not None:
+        coordinates = [coordinate for point in points for coordinate in point]
+        # The detailed algorithm usually returns rounded integer coordinates
+        typecode = "i" if all(isinstance(coordinate, int) for coordinate in coordinates) else "d"
+        values = array(typecode, coordinates)
+        # Write to a temporary file first, so a crash can't leave a broken cache file behind
+        try:
+            with tempfile.NamedTemporaryFile(dir=_cache_dir, suffix=".tmp", delete=False) as fd:
+                fd.write(values.typecode.encode() + values.tobytes())
+            try:
+                os.replace(fd.name, path)
+            except OSError:
+                os.unlink(fd.name)
+                raise
+        except OSError as ex:
+            LOG.warning("Could not write hit box cache file %s: %s", path, ex)
+
+    return points
+
+
+def prewarm_hit_box_cache(
+    directory: Union[str, Path],
+    hit_box_algorithm: str = "Simple",
+    hit_box_detail: float = 4.5,
+) -> int:
+    """
+    Calculate the hit boxes for all images in a directory and its
+    sub directories and store them in the hit box cache. Can be used at
+    build time so the game doesn't have to calculate them on first start.
+
+    Images are converted to RGBA the same way :py:func:`arcade.load_texture`
+    does. Hit boxes of textures that are only a part of an image,
+    like the ones from sprite sheets, are not calculated.
+
+    :param Union[str,Path] directory: The directory with the images
+    :param str hit_box_algorithm: 'Simple' or 'Detailed'
+    :param float hit_box_detail: How detailed to make the hit box. Only used by 'Detailed'.
+
+    :returns: The number of images
+    """
+    if _cache_dir is None:
+        raise ValueError("No hit box cache directory set. Use set_hit_box_cache_dir().")
+
+    count = 0
+    for path in sorted(Path(directory).rglob("*")):
+        if path.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+
+        image = Image.open(path).convert("RGBA")
+        get_hit_box_points(image, hit_box_algorithm, hit_box_detail)
+        count += 1
+
+    return count
@@ -2,16 +2,72 @@
 Path-related functions.
 
 """
-from shapely import speedups  # type: ignore
-from shapely.geometry import LineString, Polygon  # type: ignore
+import heapq
+import math
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from arcade import Point
+from arcade import are_polygons_intersecting
 from arcade import check_for_collision_with_list
 from arcade import Sprite
 from arcade import SpriteList
+from arcade.geometry import _get_point_location
 
 
-speedups.enable()
+def _is_line_crossing_polygon(x1: float, y1: float, x2: float, y2: float, polygon) -> bool:
+    """
+    Check if a line segment crosses a polygon. It crosses when part of the
+    line is inside the polygon and part of it is outside. Lines only
+    touching the edge of the polygon don't cross it.
+    """
+    if len(polygon) < 3:
+        return False
+
+    dx = x2 - x1
+    dy = y2 - y1
+    length_2 = dx * dx + dy * dy
+    if length_2 == 0:
+        return False
+
+    # Split the line where it meets the edges of the polygon
+    splits = {0.0, 1.0}
+    ax, ay = polygon[-1]
+    for bx, by in polygon:
+        ex = bx - ax
+        ey = by - ay
+        denominator = dx * ey - dy * ex
+        qx = ax - x1
+        qy = ay - y1
+        if denominator != 0:
+            t = (qx * ey - qy * ex) / denominator
+            u = (qx * dy - qy * dx) / denominator
+            if 0 <= t <= 1 and 0 <= u <= 1:
+                splits.add(t)
+        elif qx * dy - qy * dx == 0:
+            # Collinear edge
+            for px, py in (ax, ay), (bx, by):
+                t = ((px - x1) * dx + (py - y1) * dy) / length_2
+                if 0 < t < 1:
+                    splits.add(t)
+        ax, ay = bx, by
+
+    # Each part of the line is completely inside, outside or on the edge
+    inside = False
+    outside = False
+    ordered_splits = sorted(splits)
+    for t1, t2 in zip(ordered_splits, ordered_splits[1:]):
+        t = (t1 + t2) / 2
+        location = _get_point_location(x1 + dx * t, y1 + dy * t, polygon)
+        if location > 0:
+            inside = True
+        elif location < 0:
+            outside = True
+        if inside and outside:
+            return True
+
+    return False
 
 
 def has_line_of_sight(point_1: Point,
@@ -22,8 +78,8 @@ def has_line_of_sight(point_1: Point,
     Determine if we have line of sight between two points. Having a line of
     sight means, that you can connect both points with straight line without
     intersecting any obstacle.
-    Thanks to the shapely efficiency and speedups boost, this method is very
-    fast. It can easily test 10 000 lines_of_sight.
+
+    Use :py:func:`has_line_of_sight_many` to check many lines at once.
 
     :param point_1: tuple -- coordinates of first position (x, y)
     :param point_2: tuple -- coordinates of second position (x, y)
@@ -31,12 +87,80 @@ def has_line_of_sight(point_1: Point,
     :param max_distance: int --
     :return: tuple -- (bool, list)
     """
-    line_of_sight = LineString([point_1, point_2])
-    if 0 < max_distance < line_of_sight.length:
-        return False
-    if not walls:
-        return True
-    return not any((Polygon(o.get_adjusted_hit_box()).crosses(line_of_sight) for o in walls))
+    return has_line_of_sight_many([point_1], [point_2], walls, max_distance)[0]
+
+
+def has_line_of_sight_many(origins: Iterable[Point],
+                           targets: Iterable[Point],
+                           walls: SpriteList,
+                           max_distance: int = -1) -> List[bool]:
+    """
+    Determine if we have line of sight between many pairs of points.
+
+    If the walls use a spatial hash, only the walls in the cells each line
+    passes through are checked. The offset, scale and angle of the walls
+    sprite list are taken into account.
+
+    :param origins: Start of each line
+    :param targets: End of each line
+    :param walls: Obstacle objects to check against
+    :param max_distance: Lines longer than this never have line of sight.
+                         Use -1 for no limit.
+    :return: List with True for each line with line of sight
+    """
+    spatial_hash = None
+    transformed = False
+    if isinstance(walls, SpriteList):
+        spatial_hash = walls.spatial_hash
+        transformed = walls._has_transform()
+
+    # Bounding box and hit box for each wall
+    wall_boxes: Dict[Sprite, Tuple[float, float, float, float, List[Point]]] = {}
+
+    def get_box(wall):
+        box = wall_boxes.get(wall)
+        if box is None:
+            points = wall.get_adjusted_hit_box()
+            if points:
+                box = (min(point[0] for point in points),
+                       max(point[0] for point in points),
+                       min(point[1] for point in points),
+                       max(point[1] for point in points),
+                       points)
+            else:
+                box = (math.inf, -math.inf, math.inf, -math.inf, points)
+            wall_boxes[wall] = box
+        return box
+
+    results = []
+    for (x1, y1), (x2, y2) in zip(origins, targets):
+        if 0 < max_distance < math.hypot(x2 - x1, y2 - y1):
+            results.append(False)
+            continue
+
+        # Move the line into the coordinate space of the walls
+        if transformed:
+            (x1, y1), (x2, y2) = walls._to_local_points([(x1, y1), (x2, y2)])
+
+        candidates: Iterable[Sprite]
+        if spatial_hash is not None:
+            candidates = spatial_hash.get_objects_for_line((x1, y1), (x2, y2))
+        else:
+            candidates = walls
+
+        min_x, max_x = (x1, x2) if x1 < x2 else (x2, x1)
+        min_y, max_y = (y1, y2) if y1 < y2 else (y2, y1)
+        visible = True
+        for wall in candidates:
+            box = get_box(wall)
+            if box[0] > max_x or box[1] < min_x or box[2] > max_y or box[3] < min_y:
+                continue
+            if _is_line_crossing_polygon(x1, y1, x2, y2, box[4]):
+                visible = False
+                break
+        results.append(visible)
+
+    return results
 
 
 """
@@ -59,7 +183,7 @@ class _AStarGraph(object):
     # Define a class board like grid with two barriers
 
     def __init__(self, barriers, left, right, bottom, top, diagonal_movement):
-        if barriers is set:
+        if isinstance(barriers, (set, _BarrierGrid)):
             self.barriers = barriers
         else:
             self.barriers = set(barriers)
@@ -116,68 +240,114 @@ def move_cost(self, a, b):
         return 1  # Normal movement cost
 
 
-def _AStarSearch(start, end, graph):
-    G = {}  # Actual movement cost to each position from the start position
-    F = {}  # Estimated movement cost of start to end going via this position
+class _AStarSearchState:
+    """
+    State of an A* search on the grid. The search can be run in several
+    steps, so a long search can be spread out over several frames.
 
-    # Initialize starting values
-    G[start] = 0
-    F[start] = graph.heuristic(start, end)
+    Open vertices are kept in a binary heap ordered by (F score, position).
+    Entries are never removed from the heap. When a vertex gets a better score
+    a new entry is pushed, and outdated entries are skipped when popped.
+    """
 
-    closed_vertices = set()
-    open_vertices = set([start])
-    came_from = {}
-
-    count = 0
-    while len(open_vertices) > 0:
-        count += 1
-        if count > 500:
-            break
-        # Get the vertex in the open list with the lowest F score
-        current = None
-        current_fscore = None
-        for pos in sorted(open_vertices):
-            if current is None or F[pos] < current_fscore:
-                current_fscore = F[pos]
-                current = pos
-
-        # Check if we have reached the goal
-        if current == end:
-            # Retrace our route backward
-            path = [current]
-            while current in came_from:
-                current = came_from[current]
-                path.append(current)
-            path.reverse()
-            if F[end] >= 10000:
-                return None
-            else:
-                return path
-            # return path, F[end]  # Done!
+    def __init__(self, start, end, graph):
+        self.start = start
+        self.end = end
+        self.graph = graph
 
-        # Mark the current vertex as closed
-        open_vertices.remove(current)
-        closed_vertices.add(current)
+        # Actual movement cost to each position from the start position
+        self.G = {start: 0}
+        # Estimated movement cost of start to end going via this position
+        self.F = {start: graph.heuristic(start, end)}
 
-        # Update scores for vertices near the current position
-        for neighbour in sorted(graph.get_vertex_neighbours(current)):
-            if neighbour in closed_vertices:
-                continue  # We have already processed this node exhaustively
-            candidate_g = G[current] + graph.move_cost(current, neighbour)
+        self.closed_vertices = set()
+        self.open_heap = [(self.F[start], start)]
+        self.came_from = {}
+
+        self.iterations = 0
+        self.finished = False
+        self.result = None
+
+    def run(self, max_iterations: Optional[int] = None, time_budget: Optional[float] = None) -> bool:
+        """
+        Continue the search.
+
+        :param int max_iterations: Maximum number of vertices to process in this call.
+                                   ``None`` for no limit.
+        :param float time_budget: Maximum time in seconds to spend in this call.
+                                  ``None`` for no limit.
+
+        :returns: True if the search is finished
+        """
+        if self.finished:
+            return True
+
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+        end = self.end
+        graph = self.graph
+        G = self.G
+        F = self.F
+        closed_vertices = self.closed_vertices
+        open_heap = self.open_heap
+        came_from = self.came_from
 
-            if neighbour not in open_vertices:
-                open_vertices.add(neighbour)  # Discovered a new vertex
-            elif candidate_g >= G[neighbour]:
-                continue  # This G score is worse than previously found
+        count = 0
+        while open_heap:
+            if max_iterations is not None and count >= max_iterations:
+                return False
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
 
-            # Adopt this G score
-            came_from[neighbour] = current
-            G[neighbour] = candidate_g
-            h = graph.heuristic(neighbour, end)
-            F[neighbour] = G[neighbour] + h
+            # Get the vertex in the open list with the lowest F score
+            current_fscore, current = heapq.heappop(open_heap)
+            if current in closed_vertices or current_fscore != F[current]:
+                continue  # Outdated heap entry
 
-    # Out-of-bounds
-    return None
+            count += 1
+            self.iterations += 1
+
+            # Check if we have reached the goal
+            if current == end:
+                # Retrace our route backward
+                path = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    path.append(current)
+                path.reverse()
+                if F[end] < 10000:
+                    self.result = path
+                self.finished = True
+                return True
+
+            # Mark the current vertex as closed
+            closed_vertices.add(current)
+
+            # Update scores for vertices near the current position
+            current_g = G[current]
+            for neighbour in graph.get_vertex_neighbours(current):
+                if neighbour in closed_vertices:
+                    continue  # We have already processed this node exhaustively
+                candidate_g = current_g + graph.move_cost(current, neighbour)
+
+                if neighbour in G and candidate_g >= G[neighbour]:
+                    continue  # This G score is worse than previously found
+
+                # Adopt this G score
+                came_from[neighbour] = current
+                G[neighbour] = candidate_g
+                F[neighbour] = candidate_g + graph.heuristic(neighbour, end)
+                heapq.heappush(open_heap, (F[neighbour], neighbour))
+
+        # Out-of-bounds
+        self.finished = True
+        return True
+
+
+def _AStarSearch(start, end, graph, max_iterations=500):
+    search = _AStarSearchState(start, end, graph)
+    search.run(max_iterations=max_iterations)
+    return search.result
 
 
 def _collapse(pos, grid_size):
@@ -188,10 +358,68 @@ def _expand(pos, grid_size):
     return int(pos[0] * grid_size),  int(pos[1] * grid_size)
 
 
+class _BarrierGrid:
+    """
+    Bitmap of the blocked grid locations inside the playing field.
+
+    Locations are stored column by column, so iterating the grid returns
+    the blocked locations in sorted order.
+    """
+    def __init__(self, left: int, right: int, bottom: int, top: int):
+        self.left = left
+        self.bottom = bottom
+        self.width = max(right - left + 1, 0)
+        self.height = max(top - bottom + 1, 0)
+        # 1 if a location is blocked
+        self.cells = bytearray(self.width * self.height)
+        # Number of blocking sprites covering each location
+        self.counts = array("H", bytes(2 * self.width * self.height))
+
+    def index(self, pos) -> int:
+        return (pos[0] - self.left) * self.height + pos[1] - self.bottom
+
+    def position(self, index: int):
+        return index // self.height + self.left, index % self.height + self.bottom
+
+    def block(self, index: int):
+        self.counts[index] += 1
+        self.cells[index] = 1
+
+    def unblock(self, index: int):
+        self.counts[index] -= 1
+        if self.counts[index] == 0:
+            self.cells[index] = 0
+
+    def __contains__(self, pos) -> bool:
+        x = pos[0] - self.left
+        y = pos[1] - self.bottom
+        if x < 0 or x >= self.width or y < 0 or y >= self.height:
+            return False
+        return self.cells[x * self.height + y] == 1
+
+    def __iter__(self):
+        height = self.height
+        cells = self.cells
+        for x in range(self.width):
+            for y in range(height):
+                if cells[x * height + y]:
+                    yield x + self.left, y + self.bottom
+
+    def __len__(self) -> int:
+        return self.cells.count(1)
+
+
 class AStarBarrierList:
     """
     Class that manages a list of barriers that can be encountered during
     A* path finding.
+
+    The blocking sprites are rasterized into a grid bitmap. Single sprites
+    can be added or removed with :py:meth:`add_blocker` and
+    :py:meth:`remove_blocker` without recalculating the whole grid.
+    The grid uses the offset, scale and angle the blocking sprite list
+    had when the sprites were added. Call :py:meth:`recalculate` after
+    changing them.
     """
     def __init__(self,
                  moving_sprite: Sprite,
@@ -218,71 +446,746 @@ def __init__(self,
         self.right = int(right // grid_size)
         self.moving_sprite = moving_sprite
         self.blocking_sprites = blocking_sprites
-        self.barrier_list = None
+        self.grid = _BarrierGrid(self.left, self.right, self.bottom, self.top)
+        # Grid indices blocked by each sprite
+        self._blocked_by: Dict[Sprite, List[int]] = {}
 
         self.recalculate()
 
+    @property
+    def barrier_list(self) -> List[Point]:
+        """Sorted list of the blocked grid locations"""
+        return list(self.grid)
+
     def recalculate(self):
         """
         Recalculate blocking sprites.
         """
-        # --- Iterate through the blocking sprites and find where we are blocked
+        self.grid = _BarrierGrid(self.left, self.right, self.bottom, self.top)
+        self._blocked_by = {}
+        for sprite in self.blocking_sprites:
+            self.add_blocker(sprite)
+
+    def add_blocker(self, sprite: Sprite):
+        """
+        Mark the grid locations blocked by a sprite. If the sprite
+        was already added, its old locations are replaced.
+
+        This doesn't add the sprite to ``blocking_sprites``, but the sprite
+        is placed using the transform of ``blocking_sprites``.
+
+        :param Sprite sprite: Sprite that blocks movement
+        """
+        if sprite in self._blocked_by:
+            self.remove_blocker(sprite)
+
+        indices: List[int] = []
+        self._blocked_by[sprite] = indices
+        if sprite is self.moving_sprite:
+            return
+
+        moving_sprite = self.moving_sprite
+        grid_size = self.grid_size
+
+        # Hit box of the moving sprite relative to its position
+        moving_x, moving_y = moving_sprite.position
+        moving_points = [(x - moving_x, y - moving_y) for x, y in moving_sprite.get_adjusted_hit_box()]
+        sprite_points = sprite.get_adjusted_hit_box()
+        if not moving_points or not sprite_points:
+            return
+
+        # Blocking sprites are in the coordinate space of their list
+        blocking_sprites = self.blocking_sprites
+        sprite_x, sprite_y = sprite.position
+        sprite_radius = sprite.collision_radius
+        if isinstance(blocking_sprites, SpriteList) and blocking_sprites._has_transform():
+            sprite_points = blocking_sprites._to_world_points(sprite_points)
+            sprite_x, sprite_y = blocking_sprites._to_world_points([(sprite_x, sprite_y)])[0]
+            sprite_radius *= abs(blocking_sprites.scale)
+
+        # Range of grid locations where the bounding boxes overlap
+        min_x = min(point[0] for point in sprite_points) - max(point[0] for point in moving_points)
+        max_x = max(point[0] for point in sprite_points) - min(point[0] for point in moving_points)
+        min_y = min(point[1] for point in sprite_points) - max(point[1] for point in moving_points)
+        max_y = max(point[1] for point in sprite_points) - min(point[1] for point in moving_points)
+        start_x = max(math.floor(min_x / grid_size), self.left)
+        end_x = min(math.ceil(max_x / grid_size), self.right)
+        start_y = max(math.floor(min_y / grid_size), self.bottom)
+        end_y = min(math.ceil(max_y / grid_size), self.top)
 
-        # Save original location
-        original_pos = self.moving_sprite.position
-        # Create a set of barriers
-        self.barrier_list = set()
-        # Loop through the grid
-        for cx in range(self.left, self.right + 1):
-            for cy in range(self.bottom, self.top + 1):
-                # Grid location
+        radius_sum = moving_sprite.collision_radius + sprite_radius
+        radius_sum_2 = radius_sum * radius_sum
+        grid = self.grid
+
+        for cx in range(start_x, end_x + 1):
+            for cy in range(start_y, end_y + 1):
                 cpos = cx, cy
-                # Pixel location
-                pos = _expand(cpos, self.grid_size)
+                pos_x, pos_y = _expand(cpos, grid_size)
+                if (pos_x - sprite_x) ** 2 + (pos_y - sprite_y) ** 2 > radius_sum_2:
+                    continue
+                points = [(x + pos_x, y + pos_y) for x, y in moving_points]
+                if are_polygons_intersecting(points, sprite_points):
+                    index = grid.index(cpos)
+                    grid.block(index)
+                    indices.append(index)
+
+    def remove_blocker(self, sprite: Sprite):
+        """
+        Unmark the grid locations blocked by a sprite.
+
+        This doesn't remove the sprite from ``blocking_sprites``.
+
+        :param Sprite sprite: Sprite added with :py:meth:`add_blocker` or
+                              part of ``blocking_sprites``
+        """
+        for index in self._blocked_by.pop(sprite):
+            self.grid.unblock(index)
+
 
-                # See if we'll have a collision if our sprite is at this location
-                self.moving_sprite.position = pos
-                if len(check_for_collision_with_list(self.moving_sprite, self.blocking_sprites)) > 0:
-                    self.barrier_list.add(cpos)
+def _create_graph(astar_barrier_list: AStarBarrierList, diagonal_movement: bool) -> _AStarGraph:
+    return _AStarGraph(astar_barrier_list.grid,
+                       astar_barrier_list.left,
+                       astar_barrier_list.right,
+                       astar_barrier_list.bottom,
+                       astar_barrier_list.top,
+                       diagonal_movement)
 
-        # Restore original location
-        self.moving_sprite.position = original_pos
-        self.barrier_list = sorted(self.barrier_list)
+
+class AStarSearch:
+    """
+    A* path search that can be spread out over several frames.
+
+    Create the search once and call :py:meth:`run` with an iteration or time
+    budget every update until it returns True. The resulting path is then
+    available in :py:attr:`path`.
+    """
+    def __init__(self,
+                 start_point: Point,
+                 end_point: Point,
+                 astar_barrier_list: AStarBarrierList,
+                 diagonal_movement=True):
+        """
+        :param Point start_point: Where to start the path
+        :param Point end_point: Where to end the path
+        :param AStarBarrierList astar_barrier_list: Barriers to path around
+        :param bool diagonal_movement: Allow diagonal moves
+        """
+        self.grid_size = astar_barrier_list.grid_size
+        graph = _create_graph(astar_barrier_list, diagonal_movement)
+        self._search = _AStarSearchState(_collapse(start_point, self.grid_size),
+                                         _collapse(end_point, self.grid_size),
+                                         graph)
+
+    def run(self, max_iterations: Optional[int] = None, time_budget: Optional[float] = None) -> bool:
+        """
+        Continue the search.
+
+        :param int max_iterations: Maximum number of grid locations to process in
+                                   this call. ``None`` for no limit.
+        :param float time_budget: Maximum time in seconds to spend in this call.
+                                  ``None`` for no limit.
+
+        :returns: True if the search is finished
+        """
+        return self._search.run(max_iterations=max_iterations, time_budget=time_budget)
+
+    @property
+    def finished(self) -> bool:
+        """True if the search is finished"""
+        return self._search.finished
+
+    @property
+    def iterations(self) -> int:
+        """Number of grid locations processed so far"""
+        return self._search.iterations
+
+    @property
+    def path(self) -> Optional[List[Point]]:
+        """
+        The path in pixel locations, or ``None`` if the search isn't finished
+        or no path was found.
+        """
+        if self._search.result is None:
+            return None
+        return [_expand(p, self.grid_size) for p in self._search.result]
 
 
 def astar_calculate_path(start_point: Point,
                          end_point: Point,
                          astar_barrier_list: AStarBarrierList,
-                         diagonal_movement=True):
+                         diagonal_movement=True,
+                         max_iterations: Optional[int] = 500,
+                         time_budget: Optional[float] = None):
     """
     :param Point start_point:
     :param Point end_point:
     :param AStarBarrierList astar_barrier_list:
     :param bool diagonal_movement:
+    :param int max_iterations: Give up after processing this many grid locations.
+                               ``None`` for no limit. Raise this for large maps.
+    :param float time_budget: Give up after this many seconds. ``None`` for no limit.
 
     Returns: List
 
     """
+    search = AStarSearch(start_point, end_point, astar_barrier_list, diagonal_movement)
+    search.run(max_iterations=max_iterations, time_budget=time_budget)
+    return search.path
+
+
+def _cluster_costs(graph, source, targets, reverse=False):
+    """
+    Dijkstra search from the source within the bounds of the graph.
+
+    :returns: Dict with the cost from the source to each target that could be
+              reached. If reverse is True, the cost from each target to the source.
+    """
+    remaining = set(targets)
+    costs = {}
+    G = {source: 0}
+    closed_vertices = set()
+    open_heap = [(0, source)]
+    while open_heap and remaining:
+        current_g, current = heapq.heappop(open_heap)
+        if current in closed_vertices:
+            continue
+        closed_vertices.add(current)
+        if current in remaining:
+            remaining.remove(current)
+            costs[current] = current_g
 
-    grid_size = astar_barrier_list.grid_size
-    mod_start = _collapse(start_point, grid_size)
-    mod_end = _collapse(end_point, grid_size)
+        for neighbour in graph.get_vertex_neighbours(current):
+            if neighbour in closed_vertices:
+                continue
+            if reverse:
+                candidate_g = current_g + graph.move_cost(neighbour, current)
+            else:
+                candidate_g = current_g + graph.move_cost(current, neighbour)
+            if neighbour not in G or candidate_g < G[neighbour]:
+                G[neighbour] = candidate_g
+                heapq.heappush(open_heap, (candidate_g, neighbour))
 
-    left = astar_barrier_list.left
-    right = astar_barrier_list.right
+    return costs
 
-    bottom = astar_barrier_list.bottom
-    top = astar_barrier_list.top
 
-    barrier_list = astar_barrier_list.barrier_list
+class AStarClusterGraph:
+    """
+    Hierarchical path finding (HPA*) on top of an :py:class:`AStarBarrierList`.
 
-    graph = _AStarGraph(barrier_list, left, right, bottom, top, diagonal_movement)
-    result = _AStarSearch(mod_start, mod_end, graph)
+    The grid is split into square clusters. Neighbouring clusters are connected
+    through entrances on their shared border, and the cost between the
+    entrances of a cluster is calculated once and cached. A path is found by
+    searching this much smaller graph of entrances, then the path is refined
+    with a normal A* search inside each cluster.
+
+    Paths are close to, but not always as short as the paths from
+    :py:func:`astar_calculate_path`. Entrances between clusters are only
+    placed on open grid locations. Inside a cluster the same move costs as
+    :py:func:`astar_calculate_path` are used, so a path can still cross a
+    barrier inside a cluster when going around it is much more expensive.
+
+    Use :py:meth:`add_blocker` and :py:meth:`remove_blocker` to change the
+    barriers. Only the clusters around the changed grid locations are
+    recalculated.
+    """
+    def __init__(self,
+                 astar_barrier_list: AStarBarrierList,
+                 cluster_size: int = 10,
+                 diagonal_movement=True):
+        """
+        :param AStarBarrierList astar_barrier_list: Barriers to path around
+        :param int cluster_size: Width and height of a cluster in grid locations
+        :param bool diagonal_movement: Allow diagonal moves
+        """
+        if cluster_size < 1:
+            raise ValueError("cluster_size must be at least 1")
+
+        self.astar_barrier_list = astar_barrier_list
+        self.cluster_size = cluster_size
+        self.diagonal_movement = diagonal_movement
+
+        self._grid = astar_barrier_list.grid
+        self._graph = _create_graph(astar_barrier_list, diagonal_movement)
+        self._columns = 0
+        self._rows = 0
+        # (cluster x, cluster y, vertical) -> transitions over the right or top border of the cluster
+        self._borders: Dict[Tuple[int, int, int], List[Tuple[Point, Point]]] = {}
+        # Edges between entrances of neighbouring clusters
+        self._inter_edges: Dict[Point, Dict[Point, float]] = {}
+        # Cluster -> cached edges between the entrances inside the cluster
+        self._intra_edges: Dict[Tuple[int, int], Dict[Point, Dict[Point, float]]] = {}
+
+        self.recalculate()
+
+    def recalculate(self):
+        """
+        Recalculate all the clusters. This is done automatically if
+        ``recalculate`` is called on the barrier list.
+        """
+        barrier_list = self.astar_barrier_list
+        self._grid = barrier_list.grid
+        self._graph = _create_graph(barrier_list, self.diagonal_movement)
+        self._columns = math.ceil(self._grid.width / self.cluster_size)
+        self._rows = math.ceil(self._grid.height / self.cluster_size)
+        self._borders = {}
+        self._inter_edges = {}
+        self._intra_edges = {}
+
+        for kx in range(self._columns):
+            for ky in range(self._rows):
+                if kx + 1 < self._columns:
+                    self._update_border((kx, ky, 0))
+                if ky + 1 < self._rows:
+                    self._update_border((kx, ky, 1))
+
+    def _get_cluster(self, pos) -> Tuple[int, int]:
+        return ((pos[0] - self._grid.left) // self.cluster_size,
+                (pos[1] - self._grid.bottom) // self.cluster_size)
+
+    def _get_cluster_graph(self, cluster) -> _AStarGraph:
+        """Graph limited to the grid locations of a cluster"""
+        left = self._grid.left + cluster[0] * self.cluster_size
+        bottom = self._grid.bottom + cluster[1] * self.cluster_size
+        right = min(left + self.cluster_size - 1, self.astar_barrier_list.right)
+        top = min(bottom + self.cluster_size - 1, self.astar_barrier_list.top)
+        return _AStarGraph(self._grid, left, right, bottom, top, self.diagonal_movement)
+
+    def _find_transitions(self, border) -> List[Tuple[Point, Point]]:
+        """
+        Find the transitions over a border. Every run of open locations on
+        both sides of the border is an entrance. Short entrances get one
+        transition in the middle, long ones a transition at each end.
+        """
+        kx, ky, vertical = border
+        graph = self._get_cluster_graph((kx, ky))
+        if vertical:
+            pairs = [((x, graph.top), (x, graph.top + 1)) for x in range(graph.left, graph.right + 1)]
+        else:
+            pairs = [((graph.right, y), (graph.right + 1, y)) for y in range(graph.bottom, graph.top + 1)]
+
+        grid = self._grid
+        transitions: List[Tuple[Point, Point]] = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and pair[0] not in grid and pair[1] not in grid:
+                run.append(pair)
+                continue
+            if len(run) >= 6:
+                transitions.append(run[0])
+                transitions.append(run[-1])
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        return transitions
+
+    def _update_border(self, border):
+        """Recalculate the transitions over a border"""
+        old_transitions = self._borders.get(border, [])
+        new_transitions = self._find_transitions(border)
+        self._borders[border] = new_transitions
+        if new_transitions == old_transitions:
+            return
+
+        for pos_a, pos_b in old_transitions:
+            for start, end in (pos_a, pos_b), (pos_b, pos_a):
+                edges = self._inter_edges[start]
+                del edges[end]
+                if not edges:
+                    del self._inter_edges[start]
+
+        for pos_a, pos_b in new_transitions:
+            for start, end in (pos_a, pos_b), (pos_b, pos_a):
+                self._inter_edges.setdefault(start, {})[end] = self._graph.move_cost(start, end)
+
+        # The entrances of the clusters on both sides changed
+        kx, ky, vertical = border
+        self._intra_edges.pop((kx, ky), None)
+        self._intra_edges.pop((kx, ky + 1) if vertical else (kx + 1, ky), None)
+
+    def _get_entrances(self, cluster) -> Set[Point]:
+        kx, ky = cluster
+        entrances: Set[Point] = set()
+        entrances.update(pos_a for pos_a, _ in self._borders.get((kx, ky, 0), ()))
+        entrances.update(pos_a for pos_a, _ in self._borders.get((kx, ky, 1), ()))
+        entrances.update(pos_b for _, pos_b in self._borders.get((kx - 1, ky, 0), ()))
+        entrances.update(pos_b for _, pos_b in self._borders.get((kx, ky - 1, 1), ()))
+        return entrances
+
+    def _get_intra_edges(self, cluster) -> Dict[Point, Dict[Point, float]]:
+        """Get the cached edges between the entrances of a cluster"""
+        edges = self._intra_edges.get(cluster)
+        if edges is None:
+            graph = self._get_cluster_graph(cluster)
+            entrances = self._get_entrances(cluster)
+            edges = {}
+            for entrance in entrances:
+                costs = _cluster_costs(graph, entrance, entrances)
+                del costs[entrance]
+                edges[entrance] = costs
+            self._intra_edges[cluster] = edges
+        return edges
+
+    def _invalidate(self, clusters):
+        for kx, ky in clusters:
+            self._intra_edges.pop((kx, ky), None)
+            for border in (kx, ky, 0), (kx, ky, 1), (kx - 1, ky, 0), (kx, ky - 1, 1):
+                if border in self._borders:
+                    self._update_border(border)
+
+    def _invalidate_indices(self, indices):
+        grid = self._grid
+        self._invalidate({self._get_cluster(grid.position(index)) for index in indices})
+
+    def add_blocker(self, sprite: Sprite):
+        """
+        Add a blocking sprite to the barrier list and update the clusters it touches.
+
+        :param Sprite sprite: Sprite that blocks movement
+        """
+        if self._grid is not self.astar_barrier_list.grid:
+            self.recalculate()
+        # noinspection PyProtectedMember
+        blocked_by = self.astar_barrier_list._blocked_by
+        old_indices = blocked_by.get(sprite, [])
+        self.astar_barrier_list.add_blocker(sprite)
+        self._invalidate_indices(old_indices + blocked_by[sprite])
+
+    def remove_blocker(self, sprite: Sprite):
+        """
+        Remove a blocking sprite from the barrier list and update the clusters it touched.
+
+        :param Sprite sprite: Sprite added with :py:meth:`add_blocker` or
+                              part of the barrier list's ``blocking_sprites``
+        """
+        if self._grid is not self.astar_barrier_list.grid:
+            self.recalculate()
+        # noinspection PyProtectedMember
+        old_indices = self.astar_barrier_list._blocked_by[sprite]
+        self.astar_barrier_list.remove_blocker(sprite)
+        self._invalidate_indices(old_indices)
+
+    def _find_abstract_path(self, start, end) -> Optional[List[Point]]:
+        """Search the graph of entrances from the start to the end location"""
+        start_cluster = self._get_cluster(start)
+        end_cluster = self._get_cluster(end)
+        start_edges = _cluster_costs(self._get_cluster_graph(start_cluster),
+                                     start, self._get_entrances(start_cluster))
+        end_edges = _cluster_costs(self._get_cluster_graph(end_cluster),
+                                   end, self._get_entrances(end_cluster), reverse=True)
+
+        heuristic = self._graph.heuristic
+        G = {start: 0}
+        closed_vertices = set()
+        open_heap = [(heuristic(start, end), start)]
+        came_from: Dict[Point, Point] = {}
+
+        while open_heap:
+            current_fscore, current = heapq.heappop(open_heap)
+            if current in closed_vertices:
+                continue
+            if current == end:
+                path = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    path.append(current)
+                path.reverse()
+                return path
+            closed_vertices.add(current)
+
+            edges = []
+            if current == start:
+                edges.extend(start_edges.items())
+            intra_edges = self._get_intra_edges(self._get_cluster(current)).get(current)
+            if intra_edges:
+                edges.extend(intra_edges.items())
+            inter_edges = self._inter_edges.get(current)
+            if inter_edges:
+                edges.extend(inter_edges.items())
+            if current in end_edges:
+                edges.append((end, end_edges[current]))
+
+            current_g = G[current]
+            for neighbour, cost in edges:
+                if neighbour in closed_vertices:
+                    continue
+                candidate_g = current_g + cost
+                if neighbour in G and candidate_g >= G[neighbour]:
+                    continue
+                came_from[neighbour] = current
+                G[neighbour] = candidate_g
+                heapq.heappush(open_heap, (candidate_g + heuristic(neighbour, end), neighbour))
 
-    if result is None:
         return None
 
-    # Currently 'result' is in grid locations. We need to convert them to pixel
-    # locations.
-    revised_result = [_expand(p, grid_size) for p in result]
-    return revised_result
+    def calculate_path(self, start_point: Point, end_point: Point) -> Optional[List[Point]]:
+        """
+        Calculate a path.
+
+        :param Point start_point: Where to start the path
+        :param Point end_point: Where to end the path
+
+        :returns: List of pixel locations, or ``None`` if there is no path
+        """
+        if self._grid is not self.astar_barrier_list.grid:
+            self.recalculate()
+
+        grid_size = self.astar_barrier_list.grid_size
+        start = _collapse(start_point, grid_size)
+        end = _collapse(end_point, grid_size)
+        graph = self._graph
+        for pos in start, end:
+            if pos[0] < graph.left or pos[0] > graph.right or pos[1] < graph.bottom or pos[1] > graph.top:
+                return None
+
+        # Short paths inside a single cluster
+        result = None
+        if self._get_cluster(start) == self._get_cluster(end):
+            result = _AStarSearch(start, end, self._get_cluster_graph(self._get_cluster(start)),
+                                  max_iterations=None)
+
+        if result is None:
+            abstract_path = self._find_abstract_path(start, end)
+            if abstract_path is None:
+                return None
+
+            # Refine the path inside each cluster
+            result = [start]
+            for pos_a, pos_b in zip(abstract_path, abstract_path[1:]):
+                cluster = self._get_cluster(pos_a)
+                if cluster != self._get_cluster(pos_b):
+                    result.append(pos_b)
+                    continue
+                local_path = _AStarSearch(pos_a, pos_b, self._get_cluster_graph(cluster),
+                                          max_iterations=None)
+                if local_path is None:
+                    return None
+                result.extend(local_path[1:])
+
+        return [_expand(p, grid_size) for p in result]
+
+
+class FlowField:
+    """
+    Flow field for many agents heading to the same goal.
+
+    A single Dijkstra search from the goal over the :py:class:`AStarBarrierList`
+    grid stores the cost to reach the goal and the direction to move in for
+    every grid location. Agents can then look up their next move in constant
+    time instead of calculating their own path.
+
+    Use :py:meth:`add_blocker` and :py:meth:`remove_blocker` to change the
+    barriers. Only the locations whose path to the goal changed are updated.
+    """
+    def __init__(self,
+                 astar_barrier_list: AStarBarrierList,
+                 goal_point: Point,
+                 diagonal_movement=True):
+        """
+        :param AStarBarrierList astar_barrier_list: Barriers to path around
+        :param Point goal_point: Where all the agents are heading
+        :param bool diagonal_movement: Allow diagonal moves
+        """
+        self.astar_barrier_list = astar_barrier_list
+        self.goal_point = goal_point
+        self.diagonal_movement = diagonal_movement
+
+        self._grid = astar_barrier_list.grid
+        self._graph = _create_graph(astar_barrier_list, diagonal_movement)
+        self._goal: Point = (0, 0)
+        #: Cost to reach the goal from each grid location. ``inf`` if it can't be reached.
+        self.costs = array("f")
+        #: Direction (dx, dy) to move in from each grid location
+        self.directions = array("b")
+
+        self.refresh()
+
+    def refresh(self):
+        """
+        Recalculate the whole flow field. This is done automatically if
+        ``recalculate`` is called on the barrier list.
+        """
+        barrier_list = self.astar_barrier_list
+        self._grid = barrier_list.grid
+        self._graph = _create_graph(barrier_list, self.diagonal_movement)
+        self._goal = _collapse(self.goal_point, barrier_list.grid_size)
+        if self._goal not in self:
+            raise ValueError("The goal is outside the playing field")
+
+        size = self._grid.width * self._grid.height
+        self.costs = array("f", [math.inf]) * size
+        self.directions = array("b", bytes(2 * size))
+
+        goal_index = self._grid.index(self._goal)
+        self.costs[goal_index] = 0
+        self._propagate([(0, self._goal)])
+
+    def __contains__(self, pos) -> bool:
+        graph = self._graph
+        return graph.left <= pos[0] <= graph.right and graph.bottom <= pos[1] <= graph.top
+
+    def _propagate(self, open_heap):
+        """Dijkstra search outwards from the locations in the heap"""
+        heapq.heapify(open_heap)
+        graph = self._graph
+        grid = self._grid
+        costs = self.costs
+        directions = self.directions
+        while open_heap:
+            current_cost, current = heapq.heappop(open_heap)
+            if current_cost > costs[grid.index(current)]:
+                continue  # Outdated heap entry
+
+            for neighbour in graph.get_vertex_neighbours(current):
+                # Cost of moving from the neighbour to the current location
+                candidate = current_cost + graph.move_cost(neighbour, current)
+                index = grid.index(neighbour)
+                if candidate < costs[index]:
+                    costs[index] = candidate
+                    directions[index * 2] = current[0] - neighbour[0]
+                    directions[index * 2 + 1] = current[1] - neighbour[1]
+                    # Store the rounded cost so outdated entries are detected
+                    heapq.heappush(open_heap, (costs[index], neighbour))
+
+    def _update_locations(self, changed):
+        """
+        Update the flow field after the barriers changed at some locations.
+        """
+        graph = self._graph
+        grid = self._grid
+        costs = self.costs
+        directions = self.directions
+
+        # Find all locations with a path to the goal through a changed location
+        affected = set(pos for pos in changed if pos != self._goal)
+        pending = list(affected)
+        while pending:
+            current = pending.pop()
+            for neighbour in graph.get_vertex_neighbours(current):
+                if neighbour in affected or neighbour == self._goal:
+                    continue
+                index = grid.index(neighbour)
+                if neighbour[0] + directions[index * 2] == current[0] \
+                        and neighbour[1] + directions[index * 2 + 1] == current[1] \
+                        and costs[index] != math.inf:
+                    affected.add(neighbour)
+                    pending.append(neighbour)
+
+        for pos in affected:
+            index = grid.index(pos)
+            costs[index] = math.inf
+            directions[index * 2] = 0
+            directions[index * 2 + 1] = 0
+
+        # Start again from the best unaffected neighbours
+        open_heap = []
+        for pos in affected:
+            index = grid.index(pos)
+            for neighbour in graph.get_vertex_neighbours(pos):
+                if neighbour in affected:
+                    continue
+                candidate = costs[grid.index(neighbour)] + graph.move_cost(pos, neighbour)
+                if candidate < costs[index]:
+                    costs[index] = candidate
+                    directions[index * 2] = neighbour[0] - pos[0]
+                    directions[index * 2 + 1] = neighbour[1] - pos[1]
+            if costs[index] != math.inf:
+                open_heap.append((costs[index], pos))
+
+        self._propagate(open_heap)
+
+    def _update_indices(self, indices):
+        grid = self._grid
+        self._update_locations({grid.position(index) for index in indices})
+
+    def add_blocker(self, sprite: Sprite):
+        """
+        Add a blocking sprite to the barrier list and update the flow field.
+
+        :param Sprite sprite: Sprite that blocks movement
+        """
+        if self._grid is not self.astar_barrier_list.grid:
+            self.refresh()
+        # noinspection PyProtectedMember
+        blocked_by = self.astar_barrier_list._blocked_by
+        old_indices = blocked_by.get(sprite, [])
+        self.astar_barrier_list.add_blocker(sprite)
+        self._update_indices(old_indices + blocked_by[sprite])
+
+    def remove_blocker(self, sprite: Sprite):
+        """
+        Remove a blocking sprite from the barrier list and update the flow field.
+
+        :param Sprite sprite: Sprite added with :py:meth:`add_blocker` or
+                              part of the barrier list's ``blocking_sprites``
+        """
+        if self._grid is not self.astar_barrier_list.grid:
+            self.refresh()
+        # noinspection PyProtectedMember
+        old_indices = self.astar_barrier_list._blocked_by[sprite]
+        self.astar_barrier_list.remove_blocker(sprite)
+        self._update_indices(old_indices)
+
+    def get_direction(self, point: Point) -> Optional[Tuple[int, int]]:
+        """
+        Get the direction to move in from a pixel location.
+
+        :param Point point: Pixel location of the agent
+
+        :returns: (dx, dy) in grid locations, (0, 0) at the goal, or ``None``
+                  if the goal can't be reached from here
+        """
+        if self._grid is not self.astar_barrier_list.grid:
+            self.refresh()
+        pos = _collapse(point, self.astar_barrier_list.grid_size)
+        if pos not in self:
+            return None
+        index = self._grid.index(pos)
+        if self.costs[index] == math.inf:
+            return None
+        return self.directions[index * 2], self.directions[index * 2 + 1]
+
+    def get_next_point(self, point: Point) -> Optional[Point]:
+        """
+        Get the pixel location of the next grid location on the way to the goal.
+
+        :param Point point: Pixel location of the agent
+
+        :returns: Pixel location or ``None`` if the goal can't be reached from here
+        """
+        direction = self.get_direction(point)
+        if direction is None:
+            return None
+        pos = _collapse(point, self.astar_barrier_list.grid_size)
+        return _expand((pos[0] + direction[0], pos[1] + direction[1]), self.astar_barrier_list.grid_size)
+
+    def get_cost(self, point: Point) -> float:
+        """
+        Get the cost to reach the goal from a pixel location.
+
+        :param Point point: Pixel location of the agent
+
+        :returns: The cost, or ``inf`` if the goal can't be reached from here
+        """
+        if self._grid is not self.astar_barrier_list.grid:
+            self.refresh()
+        pos = _collapse(point, self.astar_barrier_list.grid_size)
+        if pos not in self:
+            return math.inf
+        return self.costs[self._grid.index(pos)]
+
+    def to_numpy(self):
+        """
+        Get the flow field as NumPy arrays. Requires NumPy to be installed.
+
+        :returns: Tuple with a float32 array of costs with the shape (width, height)
+                  and an int8 array of directions with the shape (width, height, 2).
+                  Both are indexed by grid location relative to the bottom left
+                  of the playing field.
+        """
+        import numpy
+
+        width = self._grid.width
+        height = self._grid.height
+        costs = numpy.frombuffer(self.costs, dtype=numpy.float32).reshape(width, height).copy()
+        directions = numpy.frombuffer(self.directions, dtype=numpy.int8).reshape(width, height, 2).copy()
+        return costs, directions
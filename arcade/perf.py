@@ -0,0 +1,349 @@
+"""
+Opt-in frame profiler.
+
+Arcade's hot paths such as the window update and draw events, sprite list
+drawing, buffer uploads, texture atlas changes and collision checks are wrapped
+in named scopes. The profiler is disabled by default and a disabled scope only
+costs a flag check. Functions decorated with :py:func:`timed` cost nothing at
+all while the profiler is disabled. When enabled, every scope keeps a ring buffer with the last
+measurements in milliseconds that can be summarized, drawn on screen or dumped
+to a JSON or CSV file.
+
+Example usage::
+
+    arcade.perf.enable()
+    arcade.run()
+    arcade.perf.dump_json("profile.json")
+
+Custom code can be timed the same way::
+
+    with arcade.perf.scope("enemies.update"):
+        self.update_enemies()
+"""
+import csv
+import json
+import sys
+from collections import deque
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+#: Statistics reported by :py:func:`get_stats` for every scope
+STAT_NAMES = ("count", "mean", "p50", "p95", "p99", "max")
+
+# How many frames GPU queries are kept in flight before reading the result.
+# Reading a query result right away would stall the CPU until the GPU is done.
+_GPU_QUERY_LATENCY = 2
+
+_enabled = False
+_gpu = False
+_history_size = 240
+_histories: Dict[str, Deque[float]] = {}
+_gpu_pending: Deque[Tuple[str, object]] = deque()
+_gpu_free: List[object] = []
+# The undecorated function and the timing wrapper of every timed function
+_timed_functions: List[Tuple[Callable, Callable]] = []
+
+
+def enable(history_size: int = 240, gpu: bool = False) -> None:
+    """
+    Start collecting timings.
+
+    :param int history_size: How many measurements are kept for every scope
+    :param bool gpu: Also measure the GPU time of the window draw event using
+                     a ``time_elapsed`` query. Requires OpenGL 3.3.
+    """
+    global _enabled, _gpu, _history_size
+    if history_size < 1:
+        raise ValueError("history_size must be at least 1")
+
+    if history_size != _history_size:
+        for name, history in _histories.items():
+            _histories[name] = deque(history, maxlen=history_size)
+
+    _history_size = history_size
+    _gpu = gpu
+    if not _enabled:
+        _enabled = True
+        _swap_timed_functions({id(func): wrapper for func, wrapper in _timed_functions})
+
+
+def disable() -> None:
+    """
+    Stop collecting timings. The collected histories are kept.
+    """
+    global _enabled, _gpu
+    if _enabled:
+        _swap_timed_functions({id(wrapper): func for func, wrapper in _timed_functions})
+    _enabled = False
+    _gpu = False
+    while _gpu_pending:
+        _gpu_free.append(_gpu_pending.popleft()[1])
+
+
+def is_enabled() -> bool:
+    """
+    Check if the profiler is collecting timings.
+
+    :rtype: bool
+    """
+    return _enabled
+
+
+def reset() -> None:
+    """
+    Forget all collected timings.
+    """
+    _histories.clear()
+
+
+def record(name: str, milliseconds: float) -> None:
+    """
+    Add a measurement to a scope. This is normally done by
+    :py:class:`scope` and :py:func:`timed`, but can be used to
+    add timings measured elsewhere.
+
+    :param str name: Name of the scope
+    :param float milliseconds: The measured time
+    """
+    history = _histories.get(name)
+    if history is None:
+        history = _histories[name] = deque(maxlen=_history_size)
+    history.append(milliseconds)
+
+
+class scope:
+    """
+    Context manager timing the wrapped block when the profiler is enabled.
+
+    Scopes can be nested. The time of a scope includes the time
+    of all scopes inside it.
+
+    :param str name: Name of the scope
+    """
+
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start: Optional[float] = None
+
+    def __enter__(self):
+        if _enabled:
+            self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        start = self._start
+        if start is not None:
+            self._start = None
+            if _enabled:
+                record(self.name, (perf_counter() - start) * 1000)
+
+
+class gpu_scope:
+    """
+    Context manager measuring the GPU time of the rendering calls
+    in the wrapped block using :py:class:`arcade.gl.Query`.
+
+    This only does anything when the profiler is enabled with ``gpu=True``.
+    The results are read a couple of frames later to avoid stalling
+    the pipeline. OpenGL doesn't allow nested time queries, so
+    GPU scopes can't be nested.
+
+    :param str name: Name of the scope
+    """
+
+    __slots__ = ("name", "_query")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._query = None
+
+    def __enter__(self):
+        if _enabled and _gpu:
+            query = _get_query()
+            if query is not None:
+                query.__enter__()
+                self._query = query
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        query = self._query
+        if query is None:
+            return
+
+        self._query = None
+        query.__exit__(exc_type, exc_val, exc_tb)
+        _gpu_pending.append((self.name, query))
+        while len(_gpu_pending) > _GPU_QUERY_LATENCY:
+            name, query = _gpu_pending.popleft()
+            record(name, query.time_elapsed / 1_000_000)  # type: ignore
+            _gpu_free.append(query)
+
+
+def _get_query():
+    """Get a free query object or None if timer queries are not supported"""
+    if _gpu_free:
+        return _gpu_free.pop()
+
+    from arcade import get_window
+    ctx = get_window().ctx
+    if ctx.gl_version < (3, 3):
+        return None
+    return ctx.query()
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """
+    Decorator timing every call to a function when the profiler is enabled.
+
+    The function is returned undecorated while the profiler is disabled.
+    :py:func:`enable` replaces it with a timing wrapper in the modules and
+    classes referring to it and :py:func:`disable` puts it back. References
+    stored elsewhere, like bound methods, keep the version they were created with.
+
+    :param str name: Name of the scope
+    """
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if _enabled:
+                    record(name, (perf_counter() - start) * 1000)
+
+        _timed_functions.append((func, wrapper))
+        return wrapper if _enabled else func  # type: ignore
+
+    return decorator
+
+
+def _swap_timed_functions(replacements: Dict[int, Callable]) -> None:
+    """Replace functions in the loaded modules and their classes by id"""
+    if not replacements:
+        return
+
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", None)
+        if not isinstance(namespace, dict):
+            continue
+        module_name = getattr(module, "__name__", None)
+        for key, value in list(namespace.items()):
+            if id(value) in replacements:
+                setattr(module, key, replacements[id(value)])
+            elif isinstance(value, type) and value.__module__ == module_name:
+                for attr, member in list(vars(value).items()):
+                    if id(member) in replacements:
+                        setattr(value, attr, replacements[id(member)])
+
+
+def get_history(name: str) -> List[float]:
+    """
+    Get the measurements in milliseconds kept for a scope, oldest first.
+
+    :param str name: Name of the scope
+    :rtype: List[float]
+    """
+    return list(_histories.get(name, ()))
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    index = max(0, -(-len(sorted_values) * percent // 100) - 1)
+    return sorted_values[int(index)]
+
+
+def get_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Summarize the measurements of every scope in milliseconds.
+
+    Returns a dict with the scope name as key and a dict with the
+    ``count``, ``mean``, ``p50``, ``p95``, ``p99`` and ``max`` as value.
+
+    :rtype: Dict[str, Dict[str, float]]
+    """
+    stats = {}
+    for name, history in sorted(_histories.items()):
+        if not history:
+            continue
+        values = sorted(history)
+        stats[name] = {
+            "count": len(values),
+            "mean": sum(values) / len(values),
+            "p50": _percentile(values, 50),
+            "p95": _percentile(values, 95),
+            "p99": _percentile(values, 99),
+            "max": values[-1],
+        }
+    return stats
+
+
+def dump_json(path: str, history: bool = False) -> None:
+    """
+    Write the statistics of all scopes to a JSON file.
+
+    :param str path: The file to write
+    :param bool history: Also include the kept measurements for every scope
+    """
+    data: Dict[str, Dict] = get_stats()
+    if history:
+        for name, stats in data.items():
+            stats["history"] = get_history(name)
+
+    with open(path, "w") as fd:
+        json.dump(data, fd, indent=2)
+
+
+def dump_csv(path: str) -> None:
+    """
+    Write the statistics of all scopes to a CSV file
+    with one row per scope.
+
+    :param str path: The file to write
+    """
+    with open(path, "w", newline="") as fd:
+        writer = csv.writer(fd)
+        writer.writerow(("scope",) + STAT_NAMES)
+        for name, stats in get_stats().items():
+            writer.writerow([name] + [stats[stat] for stat in STAT_NAMES])
+
+
+def draw_overlay(start_x: float = 10, start_y: Optional[float] = None,
+                 color=(255, 255, 255, 255), font_size: float = 10) -> None:
+    """
+    Draw the statistics of all scopes on the screen.
+    Call this at the end of ``on_draw``.
+
+    :param float start_x: Left edge of the overlay
+    :param float start_y: Top edge of the overlay. Defaults to the top of the viewport.
+    :param Color color: Color of the text
+    :param float font_size: Size of the text
+    """
+    import arcade
+
+    if start_y is None:
+        start_y = arcade.get_viewport()[3] - 10
+
+    lines = [f"{'scope':<36}{'p50':>8}{'p95':>8}{'p99':>8}  (ms)"]
+    for name, stats in get_stats().items():
+        lines.append(f"{name:<36}{stats['p50']:>8.2f}{stats['p95']:>8.2f}{stats['p99']:>8.2f}")
+
+    arcade.draw_text(
+        "\n".join(lines),
+        start_x,
+        start_y,
+        color,
+        font_size=font_size,
+        width=int(font_size * 60),
+        font_name=("Courier New", "monospace"),
+        anchor_y="top",
+        multiline=True,
+    )
@@ -6,6 +6,11 @@ in vec2 in_size;
 in int in_texture;
 in vec4 in_color;
 
+// Transform applied to the whole sprite list
+uniform vec2 list_offset;
+uniform float list_scale;
+uniform float list_angle;
+
 out float v_angle;
 out vec4 v_color;
 out vec2 v_size;
@@ -13,10 +18,15 @@ out int v_texture;
 out int vertex_id;
 
 void main() {
-    gl_Position = vec4(in_pos, 0.0, 1.0);
-    v_angle = in_angle;
+    float angle = radians(list_angle);
+    mat2 rot = mat2(
+        cos(angle), sin(angle),
+        -sin(angle), cos(angle)
+    );
+    gl_Position = vec4(rot * (in_pos * list_scale) + list_offset, 0.0, 1.0);
+    v_angle = in_angle + list_angle;
     v_color = in_color;
-    v_size = in_size;
+    v_size = in_size * list_scale;
     v_texture = in_texture;
     vertex_id = gl_VertexID;
 }
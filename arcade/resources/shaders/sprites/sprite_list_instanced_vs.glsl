@@ -3,36 +3,49 @@
 uniform Projection {
     uniform mat4 matrix;
 } proj;
+
+uniform sampler2D uv_texture;
 uniform mat3 TextureTransform;
 
-// per vertex
+// Transform applied to the whole sprite list
+uniform vec2 list_offset;
+uniform float list_scale;
+uniform float list_angle;
+
+// per vertex: quad corner from -1.0 to 1.0
 in vec2 in_vert;
-in vec2 in_texture;
 
 // per instance
 in vec2 in_pos;
 in float in_angle;
 in vec2 in_size;
-in vec4 in_sub_tex_coords;
+in int in_texture;
 in vec4 in_color;
 
 out vec2 v_texture;
 out vec4 v_color;
 
 void main() {
-    mat2 rotate = mat2(
-                cos(in_angle), sin(in_angle),
-                -sin(in_angle), cos(in_angle)
-            );
-    vec2 pos;
-    pos = in_pos + vec2(rotate * (in_vert * (in_size / 2)));
-    gl_Position = proj.matrix * vec4(pos, 0.0, 1.0);
+    float angle = radians(list_angle);
+    mat2 list_rot = mat2(
+        cos(angle), sin(angle),
+        -sin(angle), cos(angle)
+    );
+    vec2 center = list_rot * (in_pos * list_scale) + list_offset;
 
-    vec2 tex_offset = in_sub_tex_coords.xy;
-    vec2 tex_size = in_sub_tex_coords.zw;
+    angle = radians(in_angle + list_angle);
+    mat2 rot = mat2(
+        cos(angle), sin(angle),
+        -sin(angle), cos(angle)
+    );
+    vec2 pos = center + rot * (in_vert * in_size * list_scale / 2.0);
+    gl_Position = proj.matrix * vec4(pos, 0.0, 1.0);
 
-    v_texture = (in_texture * tex_size + tex_offset) * vec2(1, -1);
-    vec3 temp = TextureTransform * vec3(v_texture, 1.0);
-    v_texture = temp.xy / temp.z;
+    // Read texture coordinates from UV texture
+    vec4 uv_data = texelFetch(uv_texture, ivec2(in_texture, 0), 0);
+    vec2 tex_offset = uv_data.xy;
+    vec2 tex_size = uv_data.zw;
+    vec3 tex = TextureTransform * vec3(((in_vert * 0.5 + 0.5) * tex_size + tex_offset) * vec2(1, -1), 1.0);
+    v_texture = tex.xy / tex.z;
     v_color = in_color;
 }
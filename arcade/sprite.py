@@ -290,10 +290,8 @@ def _set_position(self, new_value: Point):
         :param Point new_value: New position.
         """
         if new_value[0] != self._position[0] or new_value[1] != self._position[1]:
-            self.clear_spatial_hashes()
             self._point_list_cache = None
             self._position = new_value
-            self.add_spatial_hashes()
 
             for sprite_list in self.sprite_lists:
                 sprite_list.update_location(self)
@@ -543,7 +541,6 @@ def _get_width(self) -> float:
     def _set_width(self, new_value: float):
         """Set the width in pixels of the sprite."""
         if new_value != self._width:
-            self.clear_spatial_hashes()
             self._point_list_cache = None
 
             # If there is a hit box, rescale it to the new width
@@ -553,7 +550,6 @@ def _set_width(self, new_value: float):
                 self._points = [(point[0] * scale, point[1]) for point in old_points]
 
             self._width = new_value
-            self.add_spatial_hashes()
 
             for sprite_list in self.sprite_lists:
                 sprite_list.update_size(self)
@@ -567,7 +563,6 @@ def _get_height(self) -> float:
     def _set_height(self, new_value: float):
         """Set the center x coordinate of the sprite."""
         if new_value != self._height:
-            self.clear_spatial_hashes()
             self._point_list_cache = None
 
             # If there is a hit box, rescale it to the new width
@@ -577,7 +572,6 @@ def _set_height(self, new_value: float):
                 self._points = [(point[0], point[1] * scale) for point in old_points]
 
             self._height = new_value
-            self.add_spatial_hashes()
 
             for sprite_list in self.sprite_lists:
                 sprite_list.update_height(self)
@@ -591,13 +585,11 @@ def _get_scale(self) -> float:
     def _set_scale(self, new_value: float):
         """Set the center x coordinate of the sprite."""
         if new_value != self._scale:
-            self.clear_spatial_hashes()
             self._point_list_cache = None
             self._scale = new_value
             if self._texture:
                 self._width = self._texture.width * self._scale
                 self._height = self._texture.height * self._scale
-            self.add_spatial_hashes()
 
             for sprite_list in self.sprite_lists:
                 sprite_list.update_size(self)
@@ -617,10 +609,8 @@ def _get_center_x(self) -> float:
     def _set_center_x(self, new_value: float):
         """Set the center x coordinate of the sprite."""
         if new_value != self._position[0]:
-            self.clear_spatial_hashes()
             self._point_list_cache = None
             self._position = (new_value, self._position[1])
-            self.add_spatial_hashes()
 
             for sprite_list in self.sprite_lists:
                 sprite_list.update_location(self)
@@ -634,10 +624,8 @@ def _get_center_y(self) -> float:
     def _set_center_y(self, new_value: float):
         """Set the center y coordinate of the sprite."""
         if new_value != self._position[1]:
-            self.clear_spatial_hashes()
             self._point_list_cache = None
             self._position = (self._position[0], new_value)
-            self.add_spatial_hashes()
 
             for sprite_list in self.sprite_lists:
                 sprite_list.update_location(self)
@@ -671,15 +659,12 @@ def _get_angle(self) -> float:
     def _set_angle(self, new_value: float):
         """Set the angle of the sprite's rotation."""
         if new_value != self._angle:
-            self.clear_spatial_hashes()
             self._angle = new_value
             self._point_list_cache = None
 
             for sprite_list in self.sprite_lists:
                 sprite_list.update_angle(self)
 
-            self.add_spatial_hashes()
-
     angle = property(_get_angle, _set_angle)
 
     def _to_radians(self) -> float:
@@ -752,12 +737,10 @@ def set_texture(self, texture_no: int):
             return
 
         texture = self.textures[texture_no]
-        self.clear_spatial_hashes()
         self._point_list_cache = None
         self._texture = texture
         self._width = texture.width * self.scale
         self._height = texture.height * self.scale
-        self.add_spatial_hashes()
         for sprite_list in self.sprite_lists:
             sprite_list.update_texture(self)
 
@@ -772,12 +755,10 @@ def _set_texture2(self, texture: Texture):
                              f"It is an instance of '{type(texture)}'.")
         assert isinstance(texture, Texture)
 
-        self.clear_spatial_hashes()
         self._point_list_cache = None
         self._texture = texture
         self._width = texture.width * self.scale
         self._height = texture.height * self.scale
-        self.add_spatial_hashes()
         for sprite_list in self.sprite_lists:
             sprite_list.update_texture(self)
 
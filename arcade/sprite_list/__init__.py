@@ -2,6 +2,7 @@
 from .spatial_hash import (
     get_closest_sprite,
     check_for_collision,
+    check_for_collision_between_lists,
     check_for_collision_with_list,
     check_for_collision_with_lists,
     get_sprites_at_point,
@@ -1,6 +1,9 @@
+import heapq
 import logging
+import math
 
 from typing import (
+    Dict,
     Iterable,
     List,
     Optional,
@@ -11,10 +14,12 @@
 
 from arcade import Sprite
 from arcade import Point
+from arcade import PointList
 from arcade import rotate_point
 from arcade import are_polygons_intersecting
 from arcade import get_distance_between_sprites
 from arcade import is_point_in_polygon
+from arcade import perf
 from .sprite_list import SpriteList
 
 LOG = logging.getLogger(__name__)
@@ -24,68 +29,146 @@ class _SpatialHash:
     """
     Structure for fast collision checking.
 
+    Every sprite remembers the range of cells it was inserted into,
+    so moving a sprite within the same cells doesn't touch the buckets.
+    Sprites can also be marked as dirty with :py:meth:`mark_dirty`.
+    They are then re-hashed once on the next query.
+
     See: https://www.gamedev.net/articles/programming/general-and-gameplay-programming/spatial-hashing-r2697/
     """
 
     def __init__(self, cell_size):
         self.cell_size = cell_size
-        self.contents = {}
-        self.buckets_for_sprite = {}
+        # Cell position -> sprites in that cell
+        self.contents: Dict[Tuple[int, int], Set[Sprite]] = {}
+        # Sprite -> (min_x, min_y, max_x, max_y) cell range the sprite is inserted into
+        self.cells_for_sprite: Dict[Sprite, Tuple[int, int, int, int]] = {}
+        # Sprites that moved since the last query
+        self.dirty: Set[Sprite] = set()
 
     def _hash(self, point):
         return int(point[0] / self.cell_size), int(point[1] / self.cell_size)
 
+    def _get_cell_range(self, sprite: Sprite) -> Tuple[int, int, int, int]:
+        """
+        Get the range of cells the hit box of a sprite is covering.
+
+        :returns: (min_x, min_y, max_x, max_y) cell range
+        """
+        points = sprite.get_adjusted_hit_box()
+        if len(points) == 0:
+            points = [sprite.position]
+        return self._get_cell_range_for_points(points)
+
+    def _get_cell_range_for_points(self, points: PointList) -> Tuple[int, int, int, int]:
+        """
+        Get the range of cells the bounding box of some points is covering.
+
+        :returns: (min_x, min_y, max_x, max_y) cell range
+        """
+        x_points = [point[0] for point in points]
+        y_points = [point[1] for point in points]
+        min_x, max_x = min(x_points), max(x_points)
+        min_y, max_y = min(y_points), max(y_points)
+
+        min_point = self._hash((min_x, min_y))
+        max_point = self._hash((max_x, max_y))
+        return min_point[0], min_point[1], max_point[0], max_point[1]
+
     def reset(self):
         """
         Clear the spatial hash
         """
         self.contents = {}
+        self.cells_for_sprite = {}
+        self.dirty = set()
+
+    def _add_to_cells(self, sprite: Sprite, cell_range: Tuple[int, int, int, int]):
+        """Add a sprite to all the cells in a range"""
+        min_x, min_y, max_x, max_y = cell_range
+        for i in range(min_x, max_x + 1):
+            for j in range(min_y, max_y + 1):
+                bucket = self.contents.get((i, j))
+                if bucket is None:
+                    self.contents[(i, j)] = {sprite}
+                else:
+                    bucket.add(sprite)
+
+    def _remove_from_cells(self, sprite: Sprite, cell_range: Tuple[int, int, int, int]):
+        """Remove a sprite from all the cells in a range"""
+        min_x, min_y, max_x, max_y = cell_range
+        for i in range(min_x, max_x + 1):
+            for j in range(min_y, max_y + 1):
+                bucket = self.contents[(i, j)]
+                bucket.discard(sprite)
+                # Don't keep empty buckets around
+                if not bucket:
+                    del self.contents[(i, j)]
 
     def insert_object_for_box(self, new_object: Sprite):
         """
         Insert a sprite.
         """
-        # Get the corners
-        min_x = new_object.left
-        max_x = new_object.right
-        min_y = new_object.bottom
-        max_y = new_object.top
+        old_range = self.cells_for_sprite.get(new_object)
+        if old_range is not None:
+            self._remove_from_cells(new_object, old_range)
 
-        # print(f"New - Center: ({new_object.center_x}, {new_object.center_y}), Angle: {new_object.angle}, "
-        #       f"Left: {new_object.left}, Right {new_object.right}")
+        self.dirty.discard(new_object)
+        cell_range = self._get_cell_range(new_object)
+        self.cells_for_sprite[new_object] = cell_range
+        self._add_to_cells(new_object, cell_range)
 
-        min_point = (min_x, min_y)
-        max_point = (max_x, max_y)
-
-        # print(f"Add 1: {min_point} {max_point}")
-
-        # hash the minimum and maximum points
-        min_point, max_point = self._hash(min_point), self._hash(max_point)
+    def remove_object(self, sprite_to_delete: Sprite):
+        """
+        Remove a Sprite.
 
-        # print(f"Add 2: {min_point} {max_point}")
-        # print("Add: ", min_point, max_point)
+        :param Sprite sprite_to_delete: Pointer to sprite to be removed.
+        """
+        try:
+            cell_range = self.cells_for_sprite.pop(sprite_to_delete)
+        except KeyError:
+            raise ValueError("Sprite is not in the spatial hash")
+        self.dirty.discard(sprite_to_delete)
+        self._remove_from_cells(sprite_to_delete, cell_range)
+
+    def move_object(self, sprite: Sprite):
+        """
+        Update the cells for a sprite after it has moved or changed size.
+        Nothing is done if the sprite still covers the same cells.
 
-        buckets = []
+        :param Sprite sprite: The sprite to update
+        """
+        self.dirty.discard(sprite)
+        old_range = self.cells_for_sprite.get(sprite)
+        if old_range is None:
+            return
 
-        # iterate over the rectangular region
-        for i in range(min_point[0], max_point[0] + 1):
-            for j in range(min_point[1], max_point[1] + 1):
-                # append to each intersecting cell
-                bucket = self.contents.setdefault((i, j), [])
-                buckets.append(bucket)
-                bucket.append(new_object)
+        new_range = self._get_cell_range(sprite)
+        if new_range == old_range:
+            return
 
-        self.buckets_for_sprite[new_object] = buckets
+        self._remove_from_cells(sprite, old_range)
+        self._add_to_cells(sprite, new_range)
+        self.cells_for_sprite[sprite] = new_range
 
-    def remove_object(self, sprite_to_delete: Sprite):
+    def mark_dirty(self, sprite: Sprite):
         """
-        Remove a Sprite.
+        Mark a sprite as moved without updating the cells right away.
+        All dirty sprites are re-hashed on the next query.
 
-        :param Sprite sprite_to_delete: Pointer to sprite to be removed.
+        :param Sprite sprite: The sprite to mark
         """
+        if sprite in self.cells_for_sprite:
+            self.dirty.add(sprite)
 
-        for bucket in self.buckets_for_sprite[sprite_to_delete]:
-            bucket.remove(sprite_to_delete)
+    def update(self):
+        """
+        Re-hash all the sprites marked as dirty.
+        """
+        dirty = self.dirty
+        self.dirty = set()
+        for sprite in dirty:
+            self.move_object(sprite)
 
     def get_objects_for_box(self, check_object: Sprite) -> Set[Sprite]:
         """
@@ -97,30 +180,92 @@ def get_objects_for_box(self, check_object: Sprite) -> Set[Sprite]:
         :return: List of close-by sprites
         :rtype: List
         """
-        # Get the corners
-        min_x = check_object.left
-        max_x = check_object.right
-        min_y = check_object.bottom
-        max_y = check_object.top
+        if self.dirty:
+            self.update()
+
+        return self._get_objects_for_cell_range(self._get_cell_range(check_object))
+
+    def get_objects_for_polygon(self, points: PointList) -> Set[Sprite]:
+        """
+        Returns Sprites in the cells covered by the bounding box of a polygon.
+
+        :param PointList points: Points of the polygon
+
+        :return: Set of close-by sprites
+        :rtype: Set
+        """
+        if self.dirty:
+            self.update()
 
-        min_point = (min_x, min_y)
-        max_point = (max_x, max_y)
+        return self._get_objects_for_cell_range(self._get_cell_range_for_points(points))
 
-        # hash the minimum and maximum points
-        min_point, max_point = self._hash(min_point), self._hash(max_point)
+    def _get_objects_for_cell_range(self, cell_range: Tuple[int, int, int, int]) -> Set[Sprite]:
+        """Get all the sprites in a range of cells"""
+        min_x, min_y, max_x, max_y = cell_range
 
-        close_by_sprites: List[Sprite] = []
+        close_by_sprites: Set[Sprite] = set()
         # iterate over the rectangular region
-        for i in range(min_point[0], max_point[0] + 1):
-            for j in range(min_point[1], max_point[1] + 1):
-                # print(f"Checking {i}, {j}")
-                # append to each intersecting cell
-                new_items = self.contents.setdefault((i, j), [])
-                # for item in new_items:
-                #     print(f"Found {item.guid} in {i}, {j}")
-                close_by_sprites.extend(new_items)
+        for i in range(min_x, max_x + 1):
+            for j in range(min_y, max_y + 1):
+                bucket = self.contents.get((i, j))
+                if bucket:
+                    close_by_sprites.update(bucket)
 
-        return set(close_by_sprites)
+        return close_by_sprites
+
+    def get_objects_for_line(self, point_1: Point, point_2: Point) -> Set[Sprite]:
+        """
+        Returns Sprites in the cells a line segment passes through.
+        The cells are visited with a grid traversal (DDA) along the line.
+
+        :param Point point_1: Start of the line
+        :param Point point_2: End of the line
+
+        :return: Set of close-by sprites
+        """
+        if self.dirty:
+            self.update()
+
+        cell_size = self.cell_size
+        x1, y1 = point_1
+        x2, y2 = point_2
+        dx = x2 - x1
+        dy = y2 - y1
+
+        # Walk the cells using floor division, then map them to the cells
+        # used by _hash which rounds towards zero.
+        cell_x = math.floor(x1 / cell_size)
+        cell_y = math.floor(y1 / cell_size)
+        end_x = math.floor(x2 / cell_size)
+        end_y = math.floor(y2 / cell_size)
+        steps = abs(end_x - cell_x) + abs(end_y - cell_y)
+
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        t_delta_x = cell_size / abs(dx) if dx else math.inf
+        t_delta_y = cell_size / abs(dy) if dy else math.inf
+        t_max_x = ((cell_x + (dx > 0)) * cell_size - x1) / dx if dx else math.inf
+        t_max_y = ((cell_y + (dy > 0)) * cell_size - y1) / dy if dy else math.inf
+
+        close_by_sprites: Set[Sprite] = set()
+        contents = self.contents
+        for _ in range(steps + 1):
+            # Negative cells can overlap two of the hash cells
+            for i in (cell_x, cell_x + 1) if cell_x < 0 else (cell_x,):
+                for j in (cell_y, cell_y + 1) if cell_y < 0 else (cell_y,):
+                    bucket = contents.get((i, j))
+                    if bucket:
+                        close_by_sprites.update(bucket)
+
+            # Never step past the last cell because of rounding errors
+            if cell_y == end_y or (cell_x != end_x and t_max_x < t_max_y):
+                cell_x += step_x
+                t_max_x += t_delta_x
+            else:
+                cell_y += step_y
+                t_max_y += t_delta_y
+
+        return close_by_sprites
 
     def get_objects_for_point(self, check_point: Point) -> List[Sprite]:
         """
@@ -134,14 +279,11 @@ def get_objects_for_point(self, check_point: Point) -> List[Sprite]:
 
 
         """
+        if self.dirty:
+            self.update()
 
         hash_point = self._hash(check_point)
-
-        close_by_sprites: List[Sprite] = []
-        new_items = self.contents.setdefault(hash_point, [])
-        close_by_sprites.extend(new_items)
-
-        return close_by_sprites
+        return list(self.contents.get(hash_point, ()))
 
 
 def _create_rects(rect_list: Iterable[Sprite]) -> List[float]:
@@ -172,6 +314,7 @@ def _create_rects(rect_list: Iterable[Sprite]) -> List[float]:
     return v2f
 
 
+@perf.timed("collision.get_closest_sprite")
 def get_closest_sprite(
     sprite: Sprite, sprite_list: "SpriteList"
 ) -> Optional[Tuple[Sprite, float]]:
@@ -187,6 +330,14 @@ def get_closest_sprite(
     if len(sprite_list) == 0:
         return None
 
+    if sprite_list._has_transform():
+        positions = sprite_list._to_world_points([sprite2.position for sprite2 in sprite_list])
+        distances = [
+            math.hypot(sprite.center_x - x, sprite.center_y - y) for x, y in positions
+        ]
+        min_pos = min(range(len(distances)), key=distances.__getitem__)
+        return sprite_list[min_pos], distances[min_pos]
+
     min_pos = 0
     min_distance = get_distance_between_sprites(sprite, sprite_list[min_pos])
     for i in range(1, len(sprite_list)):
@@ -252,6 +403,7 @@ def _check_for_collision(sprite1: Sprite, sprite2: Sprite) -> bool:
     )
 
 
+@perf.timed("collision.check_for_collision_with_list")
 def check_for_collision_with_list(
     sprite: Sprite, sprite_list: SpriteList
 ) -> List[Sprite]:
@@ -285,6 +437,9 @@ def check_for_collision_with_list(
         )
         sprite_list.enable_spatial_hashing()
 
+    if sprite_list._has_transform():
+        return _check_for_collision_with_transformed_list(sprite, sprite_list)
+
     if sprite_list.spatial_hash:
         sprite_list_to_check = sprite_list.spatial_hash.get_objects_for_box(sprite)
         # checks_saved = len(sprite_list) - len(sprite_list_to_check)
@@ -305,6 +460,7 @@ def check_for_collision_with_list(
     #             collision_list.append(sprite2)
 
 
+@perf.timed("collision.check_for_collision_with_lists")
 def check_for_collision_with_lists(sprite: Sprite,
                                    sprite_lists: List[SpriteList]) -> List[Sprite]:
     """
@@ -328,6 +484,10 @@ def check_for_collision_with_lists(sprite: Sprite,
                       f"{sprite_list._percent_sprites_moved * 100}.")
             sprite_list.enable_spatial_hashing()
 
+        if sprite_list._has_transform():
+            sprites.extend(_check_for_collision_with_transformed_list(sprite, sprite_list))
+            continue
+
         if sprite_list.use_spatial_hash:
             sprite_list_to_check = sprite_list.spatial_hash.get_objects_for_box(sprite)
             # checks_saved = len(sprite_list) - len(sprite_list_to_check)
@@ -341,6 +501,153 @@ def check_for_collision_with_lists(sprite: Sprite,
     return sprites
 
 
+def _check_for_collision_with_transformed_list(sprite: Sprite, sprite_list: SpriteList) -> List[Sprite]:
+    """
+    Check for collisions between a sprite and a sprite list with an offset, scale or angle.
+    The hit box of the sprite is moved into the coordinate space of the sprite list
+    instead of moving every sprite in the list.
+
+    :param Sprite sprite: Sprite to check
+    :param SpriteList sprite_list: SpriteList to check against
+
+    :returns: List of sprites colliding, or an empty list.
+    :rtype: list
+    """
+    hit_box = sprite_list._to_local_points(sprite.get_adjusted_hit_box())
+    center_x, center_y = sprite_list._to_local_points([sprite.position])[0]
+    radius = sprite.collision_radius / abs(sprite_list.scale)
+
+    sprite_list_to_check: Iterable[Sprite]
+    if sprite_list.spatial_hash and hit_box:
+        sprite_list_to_check = sprite_list.spatial_hash.get_objects_for_polygon(hit_box)
+    else:
+        sprite_list_to_check = sprite_list
+
+    sprites = []
+    for sprite2 in sprite_list_to_check:
+        if sprite is sprite2:
+            continue
+        radius_sum = radius + sprite2.collision_radius
+        diff_x = center_x - sprite2.position[0]
+        diff_y = center_y - sprite2.position[1]
+        if diff_x * diff_x + diff_y * diff_y > radius_sum * radius_sum:
+            continue
+        if are_polygons_intersecting(hit_box, sprite2.get_adjusted_hit_box()):
+            sprites.append(sprite2)
+
+    return sprites
+
+
+def _get_broad_phase_boxes(sprite_list: SpriteList) -> List[Tuple[float, float, float, float, int]]:
+    """
+    Build collision radius boxes for every sprite in a list
+    reading the positions from the packed position buffer.
+    The boxes are in world space if the list has a transform.
+
+    :returns: List of (min_x, max_x, min_y, max_y, index) tuples sorted by min_x
+    """
+    pos_data = sprite_list._sprite_pos_data
+    sprite_slot = sprite_list.sprite_slot
+    sprites = sprite_list.sprite_list
+    positions: List[Point] = [
+        (pos_data[slot * 2], pos_data[slot * 2 + 1])
+        for slot in (sprite_slot[sprite] for sprite in sprites)
+    ]
+    scale = 1.0
+    if sprite_list._has_transform():
+        positions = sprite_list._to_world_points(positions)
+        scale = abs(sprite_list.scale)
+
+    boxes = []
+    for index, (sprite, (x, y)) in enumerate(zip(sprites, positions)):
+        radius = sprite.collision_radius * scale
+        boxes.append((x - radius, x + radius, y - radius, y + radius, index))
+
+    boxes.sort()
+    return boxes
+
+
+@perf.timed("collision.check_for_collision_between_lists")
+def check_for_collision_between_lists(
+    sprite_list_1: SpriteList, sprite_list_2: SpriteList
+) -> List[Tuple[int, int]]:
+    """
+    Check for collisions between every sprite in one list and every sprite
+    in another list.
+
+    This does a single sort-and-sweep pass over the sprite list position
+    buffers to find sprites that are close to each other and only does the
+    more expensive hit box check for those pairs.
+
+    :param SpriteList sprite_list_1: First SpriteList
+    :param SpriteList sprite_list_2: Second SpriteList
+
+    :returns: Sorted list of ``(i, j)`` index pairs where ``sprite_list_1[i]``
+              collides with ``sprite_list_2[j]``, or an empty list.
+    :rtype: list
+    """
+    if not isinstance(sprite_list_1, SpriteList):
+        raise TypeError(
+            f"Parameter 1 is a {type(sprite_list_1)} instead of expected SpriteList."
+        )
+    if not isinstance(sprite_list_2, SpriteList):
+        raise TypeError(
+            f"Parameter 2 is a {type(sprite_list_2)} instead of expected SpriteList."
+        )
+
+    if len(sprite_list_1) == 0 or len(sprite_list_2) == 0:
+        return []
+
+    # Merge the boxes from both lists into one sweep ordered by min_x.
+    # The second tuple item tags what list the box came from.
+    events = [(box[0], 0, box) for box in _get_broad_phase_boxes(sprite_list_1)]
+    events.extend((box[0], 1, box) for box in _get_broad_phase_boxes(sprite_list_2))
+    events.sort(key=lambda event: event[0])
+
+    sprites_1 = sprite_list_1.sprite_list
+    sprites_2 = sprite_list_2.sprite_list
+    # Hit boxes have to be compared in world space if one of the lists has a transform
+    transformed = sprite_list_1._has_transform() or sprite_list_2._has_transform()
+    # Active boxes of each list in a heap ordered by max_x: (max_x, index, box)
+    active: Tuple[List[tuple], List[tuple]] = ([], [])
+    pairs = []
+    for min_x, tag, box in events:
+        # Drop boxes we have swept past from the list this box is tested against.
+        # Boxes further down the heap are skipped below until they reach the top.
+        others = active[1 - tag]
+        while others and others[0][0] < min_x:
+            heapq.heappop(others)
+
+        # Only test against boxes from the other list overlapping on the y axis
+        for max_x, _, other in others:
+            if max_x < min_x or other[3] < box[2] or other[2] > box[3]:
+                continue
+
+            if tag == 0:
+                i, j = box[4], other[4]
+            else:
+                i, j = other[4], box[4]
+
+            sprite_1 = sprites_1[i]
+            sprite_2 = sprites_2[j]
+            if sprite_1 is sprite_2:
+                continue
+            if transformed:
+                if are_polygons_intersecting(
+                    sprite_list_1._to_world_points(sprite_1.get_adjusted_hit_box()),
+                    sprite_list_2._to_world_points(sprite_2.get_adjusted_hit_box()),
+                ):
+                    pairs.append((i, j))
+            elif _check_for_collision(sprite_1, sprite_2):
+                pairs.append((i, j))
+
+        heapq.heappush(active[tag], (box[1], box[4], box))
+
+    pairs.sort()
+    return pairs
+
+
+@perf.timed("collision.get_sprites_at_point")
 def get_sprites_at_point(point: Point, sprite_list: SpriteList) -> List[Sprite]:
     """
     Get a list of sprites at a particular point. This function sees if any sprite overlaps
@@ -358,6 +665,9 @@ def get_sprites_at_point(point: Point, sprite_list: SpriteList) -> List[Sprite]:
             f"Parameter 2 is a {type(sprite_list)} instead of expected SpriteList."
         )
 
+    if sprite_list._has_transform():
+        point = sprite_list._to_local_points([point])[0]
+
     if sprite_list.spatial_hash:
         sprite_list_to_check = sprite_list.spatial_hash.get_objects_for_point(point)
         # checks_saved = len(sprite_list) - len(sprite_list_to_check)
@@ -372,6 +682,7 @@ def get_sprites_at_point(point: Point, sprite_list: SpriteList) -> List[Sprite]:
     ]
 
 
+@perf.timed("collision.get_sprites_at_exact_point")
 def get_sprites_at_exact_point(point: Point, sprite_list: SpriteList) -> List[Sprite]:
     """
     Get a list of sprites whose center_x, center_y match the given point.
@@ -388,6 +699,9 @@ def get_sprites_at_exact_point(point: Point, sprite_list: SpriteList) -> List[Sp
             f"Parameter 2 is a {type(sprite_list)} instead of expected SpriteList."
         )
 
+    if sprite_list._has_transform():
+        point = sprite_list._to_local_points([point])[0]
+
     if sprite_list.spatial_hash:
         sprite_list_to_check = sprite_list.spatial_hash.get_objects_for_point(point)
         # checks_saved = len(sprite_list) - len(sprite_list_to_check)
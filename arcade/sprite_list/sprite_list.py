@@ -6,12 +6,13 @@
 """
 
 import logging
+import math
 from array import array
 from collections import deque
-from typing import (TYPE_CHECKING, Deque, Dict, Iterator, List, Optional, Set,
-                    Tuple, TypeVar, Union)
+from typing import (TYPE_CHECKING, Deque, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Set, Tuple, TypeVar, Union)
 
-from arcade import Color, Sprite, get_window, gl
+from arcade import Color, Point, Sprite, get_window, gl, perf
 from arcade.context import ArcadeContext
 
 from arcade.math import Mat3
@@ -28,6 +29,29 @@
 # NOTE: Possibly we want to use slot 0 for this?
 _SPRITE_SLOT_INVISIBLE = 2 ** 32 - 2
 
+# Used as the initial minimum of an empty dirty range
+_NO_SLOT = 2 ** 32
+# Upload the whole buffer when more than this part of the used slots changed
+_FULL_UPLOAD_RATIO = 0.5
+
+
+# (sprite class, property names) -> True if the class overrides any of the properties
+_overridden_properties: Dict[Tuple[type, Tuple[str, ...]], bool] = {}
+
+
+def _overrides_properties(sprite_class: type, names: Tuple[str, ...]) -> bool:
+    """
+    Check if a Sprite subclass overrides any of the given properties.
+    Bulk operations only write the private attributes of sprites
+    using the properties of :py:class:`Sprite`.
+    """
+    key = (sprite_class, names)
+    overrides = _overridden_properties.get(key)
+    if overrides is None:
+        overrides = any(getattr(sprite_class, name) is not getattr(Sprite, name) for name in names)
+        _overridden_properties[key] = overrides
+    return overrides
+
 
 class SpriteList:
     """
@@ -43,6 +67,9 @@ def __init__(
             is_static=False,
             atlas: "TextureAtlas" = None,
             capacity: int = 100,
+            spatial_hash_mode: str = "immediate",
+            sort_by: Optional[str] = None,
+            render_mode: str = "geometry",
     ):
         """
         Initialize the sprite list
@@ -60,6 +87,18 @@ def __init__(
         :param int capacity: The initial capacity of the internal buffer.
                It's a suggestion for the maximum amount of sprites this list
                can hold. Can normally be left with default value.
+        :param str spatial_hash_mode: ``"immediate"`` re-hashes a sprite every time
+               it moves or rotates. ``"deferred"`` only marks the sprite as moved
+               and re-hashes it once on the next collision query. This is faster
+               when sprites are moved several times per frame.
+        :param str sort_by: Set to ``"y"`` to draw the sprites ordered by their
+               y position. Sprites higher up on the screen are drawn first.
+               This only changes the draw order, not the order of the list.
+        :param str render_mode: ``"geometry"`` expands every sprite into a quad in a
+               geometry shader. ``"instanced"`` draws an instanced quad per buffer
+               slot instead, which can be faster on drivers with slow geometry
+               shaders. Instanced lists have no viewport culling and draw
+               the sprites in the order of their buffer slots.
         """
         self.ctx = None
         self.program = None
@@ -68,14 +107,22 @@ def __init__(
         self._initialized = False
         self.extra = None
 
+        # The capacity the buffers are created with. Used when clearing the list.
+        self._initial_capacity = abs(capacity) or 100
         # The initial capacity of the spritelist buffers (internal)
-        self._buf_capacity = abs(capacity) or 100
+        self._buf_capacity = self._initial_capacity
         # The initial capacity of the index buffer (internal)
-        self._idx_capacity = abs(capacity) or 100
+        self._idx_capacity = self._initial_capacity
         # The number of slots used in the sprite buffer
         self._sprite_buffer_slots = 0
         # Number of slots used in the index buffer
         self._sprite_index_slots = 0
+        # Number of removed sprites still occupying a slot in the index buffer
+        self._sprite_index_tombstones = 0
+        # Position in the index buffer for each buffer slot
+        self._sprite_index_positions: Dict[int, int] = dict()
+        # Fenwick tree counting the removed sprites before a position in the index buffer
+        self._sprite_index_tombstone_tree = array("I", [0] * (self._idx_capacity + 1))
         # List of free slots in the sprite buffers. These are filled when sprites are removed.
         self._sprite_buffer_free_slots: Deque[int] = deque()
 
@@ -83,7 +130,9 @@ def __init__(
         self._deferred_sprites: Set[Sprite] = set()
 
         # List of sprites in the sprite list
-        self.sprite_list: List[Sprite] = []
+        self._sprite_list: List[Sprite] = []
+        # Textures for sprites created with from_arrays that don't have a sprite object yet
+        self._lazy_textures: Optional[List["Texture"]] = None
         # Buffer slots for the sprites (exclusing index buffer)
         # This has nothing to do with the index in the spritelist itself
         self.sprite_slot: Dict[Sprite, int] = dict()
@@ -107,6 +156,17 @@ def __init__(
         self._sprite_texture_changed = False
         self._sprite_index_changed = False
 
+        # Range of slots changed in each buffer since the last upload
+        self._reset_dirty_ranges()
+
+        # Number of bytes written to the GPU in the last draw
+        self._bytes_uploaded = 0
+
+        # Transform applied to the whole list when drawing
+        self._offset: Tuple[float, float] = (0.0, 0.0)
+        self._scale = 1.0
+        self._angle = 0.0
+
         # Info for spatial hash
         self._sprites_moved = 0
         self._percent_sprites_moved = 0
@@ -114,6 +174,22 @@ def __init__(
         # Used in collision detection optimization
         from .spatial_hash import _SpatialHash
 
+        if spatial_hash_mode not in ("immediate", "deferred"):
+            raise ValueError(
+                f"spatial_hash_mode must be 'immediate' or 'deferred', not {spatial_hash_mode!r}"
+            )
+        self._spatial_hash_mode = spatial_hash_mode
+
+        if sort_by not in (None, "y"):
+            raise ValueError(f"sort_by must be None or 'y', not {sort_by!r}")
+        if render_mode not in ("geometry", "instanced"):
+            raise ValueError(
+                f"render_mode must be 'geometry' or 'instanced', not {render_mode!r}"
+            )
+        if sort_by is not None and render_mode == "instanced":
+            raise ValueError("sort_by is only supported with render_mode 'geometry'")
+        self._sort_by = sort_by
+        self._render_mode = render_mode
         self.spatial_hash: Optional[_SpatialHash] = None
         self._use_spatial_hash = use_spatial_hash
         if use_spatial_hash is True:
@@ -136,7 +212,10 @@ def __init__(
     def _init_deferred(self):
         """Since spritelist can be created before the window we need to defer initialization"""
         self.ctx: ArcadeContext = get_window().ctx
-        self.program = self.ctx.sprite_list_program_cull
+        if self._render_mode == "instanced":
+            self.program = self.ctx.sprite_list_program_instanced
+        else:
+            self.program = self.ctx.sprite_list_program_cull
         self._atlas: TextureAtlas = (
                 getattr(self, "_atlas", None) or self.ctx.default_atlas
         )
@@ -150,24 +229,36 @@ def _init_deferred(self):
         # Index buffer
         self._sprite_index_buf = self.ctx.buffer(reserve=self._idx_capacity * 4)
 
+        instanced = self._render_mode == "instanced"
         contents = [
-            gl.BufferDescription(self._sprite_pos_buf, "2f", ["in_pos"]),
-            gl.BufferDescription(self._sprite_size_buf, "2f", ["in_size"]),
-            gl.BufferDescription(self._sprite_angle_buf, "1f", ["in_angle"]),
-            gl.BufferDescription(self._sprite_texture_buf, "u4", ["in_texture"]),
+            gl.BufferDescription(self._sprite_pos_buf, "2f", ["in_pos"], instanced=instanced),
+            gl.BufferDescription(self._sprite_size_buf, "2f", ["in_size"], instanced=instanced),
+            gl.BufferDescription(self._sprite_angle_buf, "1f", ["in_angle"], instanced=instanced),
+            gl.BufferDescription(self._sprite_texture_buf, "u4", ["in_texture"], instanced=instanced),
             gl.BufferDescription(
-                self._sprite_color_buf, "4f1", ["in_color"], normalized=["in_color"]
+                self._sprite_color_buf, "4f1", ["in_color"], normalized=["in_color"], instanced=instanced
             ),
         ]
-        self._geometry = self.ctx.geometry(
-            contents,
-            index_buffer=self._sprite_index_buf,
-            index_element_size=4,  # 32 bit integers
-        )
+        if instanced:
+            # A quad as a triangle strip drawn once for every buffer slot.
+            # The index buffer is not used.
+            self._sprite_quad_buf = self.ctx.buffer(
+                data=array("f", [-1.0, 1.0, -1.0, -1.0, 1.0, 1.0, 1.0, -1.0])
+            )
+            contents.insert(0, gl.BufferDescription(self._sprite_quad_buf, "2f", ["in_vert"]))
+            self._geometry = self.ctx.geometry(contents)
+        else:
+            self._geometry = self.ctx.geometry(
+                contents,
+                index_buffer=self._sprite_index_buf,
+                index_element_size=4,  # 32 bit integers
+            )
 
         self._initialized = True
 
         # Load all the textures and write texture coordinates into buffers
+        if self._lazy_textures is not None:
+            self._write_texture_slots(0, self._lazy_textures)
         for sprite in self._deferred_sprites:
             # noinspection PyProtectedMember
             if sprite._texture is None:
@@ -179,16 +270,14 @@ def _init_deferred(self):
 
         self._deferred_sprites = None
 
-        self._sprite_pos_changed = True
-        self._sprite_size_changed = True
-        self._sprite_angle_changed = True
-        self._sprite_color_changed = True
-        self._sprite_texture_changed = True
+        self._mark_sprite_buffers_dirty()
         self._sprite_index_changed = True
 
     def __len__(self) -> int:
         """Return the length of the sprite list."""
-        return len(self.sprite_list)
+        if self._lazy_textures is not None:
+            return len(self._lazy_textures)
+        return len(self._sprite_list)
 
     def __iter__(self) -> Iterator[Sprite]:
         """Return an iterable object of sprites."""
@@ -231,6 +320,204 @@ def atlas(self) -> "TextureAtlas":
         """Get the texture atlas for this sprite list"""
         return self._atlas
 
+    @property
+    def sprite_list(self) -> List[Sprite]:
+        """
+        The list of sprites in this sprite list.
+
+        Sprites for lists created with :py:meth:`from_arrays` are
+        created the first time this is accessed.
+        """
+        if self._lazy_textures is not None:
+            self._create_lazy_sprites()
+        return self._sprite_list
+
+    @sprite_list.setter
+    def sprite_list(self, sprites: List[Sprite]):
+        if self._lazy_textures is not None:
+            self._create_lazy_sprites()
+        self._sprite_list = sprites
+
+    @property
+    def offset(self) -> Tuple[float, float]:
+        """
+        Get or set the offset of the whole sprite list.
+
+        The offset, :py:attr:`scale` and :py:attr:`angle` are applied
+        to the sprites on the GPU when the list is drawn. This is a
+        lot cheaper than moving every sprite, for example when scrolling
+        a large background layer. The positions of the sprites don't change.
+        Collision functions take the transform into account.
+
+        :rtype: (float, float)
+        """
+        return self._offset
+
+    @offset.setter
+    def offset(self, offset: Tuple[float, float]):
+        self._offset = float(offset[0]), float(offset[1])
+
+    @property
+    def scale(self) -> float:
+        """
+        Get or set the scale of the whole sprite list.
+        Sprite positions and sizes are scaled around the origin.
+
+        :rtype: float
+        """
+        return self._scale
+
+    @scale.setter
+    def scale(self, scale: float):
+        if scale == 0:
+            raise ValueError("The scale of a SpriteList can't be zero")
+        self._scale = float(scale)
+
+    @property
+    def angle(self) -> float:
+        """
+        Get or set the rotation of the whole sprite list in degrees.
+        Sprites are rotated around the origin.
+
+        :rtype: float
+        """
+        return self._angle
+
+    @angle.setter
+    def angle(self, angle: float):
+        self._angle = float(angle)
+
+    def _has_transform(self) -> bool:
+        """Check if the list has an offset, scale or angle"""
+        return self._offset != (0.0, 0.0) or self._scale != 1.0 or self._angle != 0.0
+
+    def _to_local_points(self, points: Iterable[Point]) -> List[Point]:
+        """Map points in world space to the coordinate space of the sprites"""
+        offset_x, offset_y = self._offset
+        angle = math.radians(-self._angle)
+        cos_angle = math.cos(angle) / self._scale
+        sin_angle = math.sin(angle) / self._scale
+        return [
+            (
+                (x - offset_x) * cos_angle - (y - offset_y) * sin_angle,
+                (x - offset_x) * sin_angle + (y - offset_y) * cos_angle,
+            )
+            for x, y in points
+        ]
+
+    def _to_world_points(self, points: Iterable[Point]) -> List[Point]:
+        """Map points in the coordinate space of the sprites to world space"""
+        offset_x, offset_y = self._offset
+        angle = math.radians(self._angle)
+        cos_angle = math.cos(angle) * self._scale
+        sin_angle = math.sin(angle) * self._scale
+        return [
+            (x * cos_angle - y * sin_angle + offset_x, x * sin_angle + y * cos_angle + offset_y)
+            for x, y in points
+        ]
+
+    @classmethod
+    def from_arrays(
+        cls,
+        positions: Sequence[Tuple[float, float]],
+        sizes: Sequence[Tuple[float, float]],
+        angles: Sequence[float],
+        colors: Sequence[Tuple[int, int, int, int]],
+        textures: Sequence["Texture"],
+        **kwargs,
+    ) -> "SpriteList":
+        """
+        Create a sprite list from per sprite attribute sequences.
+        This is meant for procedurally generated content like large tile maps.
+
+        The attributes are written directly into the sprite buffers.
+        Sprite objects are only created the first time the sprites
+        in the list are accessed, so a list that is only drawn never
+        creates them. Lists using a spatial hash need the sprite objects
+        and create them right away.
+
+        :param positions: ``(x, y)`` center of each sprite
+        :param sizes: ``(width, height)`` of each sprite
+        :param angles: Angle of each sprite in degrees
+        :param colors: ``(r, g, b, a)`` color of each sprite
+        :param textures: Texture of each sprite
+        :param kwargs: Arguments passed to the :py:class:`SpriteList` constructor
+        :rtype: SpriteList
+        """
+        textures = list(textures)
+        count = len(textures)
+        if not (len(positions) == len(sizes) == len(angles) == len(colors) == count):
+            raise ValueError("positions, sizes, angles, colors and textures must have the same length")
+
+        # One spare slot so the buffers are not doubled right away
+        kwargs.setdefault("capacity", count + 1)
+        sprite_list = cls(**kwargs)
+        if count == 0:
+            return sprite_list
+
+        sprite_list._sprite_buffer_slots = count
+        sprite_list._grow_sprite_buffers()
+        sprite_list._sprite_pos_data[:count * 2] = array("f", [v for position in positions for v in position])
+        sprite_list._sprite_size_data[:count * 2] = array("f", [v for size in sizes for v in size])
+        sprite_list._sprite_angle_data[:count] = array("f", angles)
+        sprite_list._sprite_color_data[:count * 4] = array("B", [v for color in colors for v in color])
+        sprite_list._expand_dirty_ranges(0, count - 1)
+
+        sprite_list._sprite_index_slots = count
+        sprite_list._grow_index_buffer()
+        sprite_list._sprite_index_data[:count] = array("I", range(count))
+        sprite_list._update_index_positions()
+        sprite_list._sprite_index_changed = True
+
+        sprite_list._lazy_textures = textures
+        if sprite_list._initialized:
+            sprite_list._write_texture_slots(0, textures)
+
+        if sprite_list.spatial_hash is not None:
+            for sprite in sprite_list.sprite_list:
+                sprite_list.spatial_hash.insert_object_for_box(sprite)
+
+        return sprite_list
+
+    def _create_lazy_sprites(self):
+        """Create the sprite objects for a list created with from_arrays"""
+        textures = self._lazy_textures
+        self._lazy_textures = None
+
+        pos_data = self._sprite_pos_data
+        size_data = self._sprite_size_data
+        angle_data = self._sprite_angle_data
+        color_data = self._sprite_color_data
+        sprites = []
+        for slot, texture in enumerate(textures):
+            width = size_data[slot * 2]
+            height = size_data[slot * 2 + 1]
+            sprite = Sprite(
+                texture=texture,
+                center_x=pos_data[slot * 2],
+                center_y=pos_data[slot * 2 + 1],
+                angle=angle_data[slot],
+            )
+            if texture.width:
+                sprite._scale = width / texture.width
+            sprite._width = width
+            sprite._height = texture.height * sprite._scale
+            # Stretch the hit box vertically the same way setting
+            # Sprite.height does when the size is not proportional
+            if sprite._height:
+                sprite.height = height
+            else:
+                sprite._height = height
+            sprite._color = tuple(color_data[slot * 4:slot * 4 + 3])
+            sprite._alpha = color_data[slot * 4 + 3]
+            sprite.register_sprite_list(self)
+            self.sprite_slot[sprite] = slot
+            sprites.append(sprite)
+
+        self._sprite_list[:0] = sprites
+        if not self._initialized:
+            self._deferred_sprites.update(sprites)
+
     def _next_slot(self) -> int:
         """
         Get the next available slot in sprite buffers
@@ -258,14 +545,45 @@ def index(self, sprite: Sprite) -> int:
         """
         return self.sprite_list.index(sprite)
 
-    def clear(self):
-        """Clears the spritelist"""
-        # Reset buffers
-        # Reset SpatialHash
-        # Manually remove the spritelist from all sprites
-        #    We don't want lingering references in sprites
-        # Clear the slot_idx and slot info
-        raise NotImplemented
+    def clear(self, keep_capacity: bool = True):
+        """
+        Remove all the sprites from the list.
+
+        The sprite list can be reused afterwards. This is a lot cheaper
+        than creating a new sprite list, for example when reloading a level,
+        because the OpenGL buffers are kept.
+
+        :param bool keep_capacity: Keep the current size of the internal buffers.
+               If ``False`` the buffers are shrunk back to the initial capacity.
+        """
+        # Manually remove the spritelist from all sprites.
+        # We don't want lingering references in sprites.
+        # Sprites for lists created with from_arrays that were never accessed don't exist.
+        self._lazy_textures = None
+        for sprite in self._sprite_list:
+            sprite.sprite_lists.remove(self)
+
+        self._sprite_list = []
+        self.sprite_slot = dict()
+        if self._deferred_sprites is not None:
+            self._deferred_sprites.clear()
+        if self.spatial_hash is not None:
+            self.spatial_hash.reset()
+        self._sprites_moved = 0
+
+        # Reset the slot info. The old buffer data is overwritten when slots are reused.
+        self._sprite_buffer_slots = 0
+        self._sprite_buffer_free_slots.clear()
+        self._sprite_index_slots = 0
+        self._sprite_index_tombstones = 0
+        self._sprite_index_positions = dict()
+
+        if not keep_capacity:
+            self._shrink_buffers(self._initial_capacity)
+
+        self._sprite_index_tombstone_tree = array("I", [0] * (self._idx_capacity + 1))
+        self._reset_dirty_ranges()
+        self._sprite_index_changed = True
 
     def pop(self, index: int = -1) -> Sprite:
         """
@@ -297,11 +615,16 @@ def append(self, sprite: _SpriteType):
 
         self._update_all(sprite)
 
+        # Reclaim removed sprites before growing the index buffer
+        if self._sprite_index_tombstones and self._sprite_index_slots + 1 >= self._idx_capacity:
+            self._normalize_index_buffer()
+
         # Add sprite to the end of the index buffer
         idx_slot = self._sprite_index_slots
         self._sprite_index_slots += 1
         self._grow_index_buffer()
         self._sprite_index_data[idx_slot] = slot
+        self._sprite_index_positions[slot] = idx_slot
         self._sprite_index_changed = True
 
         if self.spatial_hash:
@@ -327,10 +650,13 @@ def swap(self, index_1: int, index_2: int):
         # Swap order in index buffer
         slot_1 = self.sprite_slot[sprite_1]
         slot_2 = self.sprite_slot[sprite_2]
-        i1 = self._sprite_index_data.index(slot_1)
-        i2 = self._sprite_index_data.index(slot_2)
+        i1 = self._sprite_index_positions[slot_1]
+        i2 = self._sprite_index_positions[slot_2]
         self._sprite_index_data[i1] = slot_2
         self._sprite_index_data[i2] = slot_1
+        self._sprite_index_positions[slot_1] = i2
+        self._sprite_index_positions[slot_2] = i1
+        self._sprite_index_changed = True
 
     def remove(self, sprite: _SpriteType):
         """
@@ -343,35 +669,125 @@ def remove(self, sprite: _SpriteType):
         except KeyError:
             raise ValueError("Sprite is not in the SpriteList")
 
-        self.sprite_list.remove(sprite)
+        # The position in the sprite list is the position in the index buffer
+        # minus the removed sprites still occupying the index buffer before it
+        idx_slot = self._sprite_index_positions.pop(slot)
+        position = idx_slot - self._count_tombstones_before(idx_slot)
+        if position < len(self.sprite_list) and self.sprite_list[position] is sprite:
+            del self.sprite_list[position]
+        else:
+            self.sprite_list.remove(sprite)
         sprite.sprite_lists.remove(self)
         del self.sprite_slot[sprite]
 
         self._sprite_buffer_free_slots.append(slot)
 
-        # NOTE: Optimize this by deferring removal?
-        #       Defer removal
-        # Set the sprite as invisible in the index buffer
-        # idx_slot = self._sprite_index_data.index(slot)
-        # self._sprite_index_data[idx_slot] = _SPRITE_SLOT_INVISIBLE
-
-        # Brutal resize for now. Optimize later
-        self._sprite_index_data.remove(slot)
-        self._sprite_index_data.append(0)
-        self._sprite_index_slots -= 1
+        if self._render_mode == "instanced":
+            # Every buffer slot is drawn. Hide the free slot with an empty size.
+            self._sprite_size_data[slot * 2] = 0
+            self._sprite_size_data[slot * 2 + 1] = 0
+            self._sprite_size_changed = True
+            self._mark_dirty(self._sprite_size_dirty, slot)
+
+        # Set the sprite as invisible in the index buffer.
+        # The index buffer is compacted in _normalize_index_buffer before drawing.
+        self._sprite_index_data[idx_slot] = _SPRITE_SLOT_INVISIBLE
+        self._add_tombstone(idx_slot)
         self._sprite_index_changed = True
 
         if self.spatial_hash:
             self.spatial_hash.remove_object(sprite)
 
-    def extend(self, sprites: Union[list, "SpriteList"]):
+    def extend(self, sprites: Union[Iterable[Sprite], "SpriteList"]):
         """
-        Extends the current list with the given list
+        Extends the current list with the given list.
+
+        The buffers are resized once and the sprite data for the new
+        slots is written in bulk, so this is a lot faster than calling
+        :py:meth:`append` for each sprite.
 
         :param list sprites: list of Sprites to add to the list
         """
+        sprites = list(sprites)
+        if not sprites:
+            return
+
+        if not self.sprite_slot.keys().isdisjoint(sprites):
+            raise ValueError("Sprite already in SpriteList")
+        if len(set(sprites)) != len(sprites):
+            raise ValueError("Sprite added to the SpriteList more than once")
+
+        sprite_list = self.sprite_list
+        count = len(sprites)
+
+        # Reuse old slots from deleted sprites first and add the rest to the end
+        reused = min(count, len(self._sprite_buffer_free_slots))
+        slots = [self._sprite_buffer_free_slots.popleft() for _ in range(reused)]
+        start = self._sprite_buffer_slots
+        self._sprite_buffer_slots += count - reused
+        self._grow_sprite_buffers()
+        end = self._sprite_buffer_slots
+        slots.extend(range(start, end))
+
+        self.sprite_slot.update(zip(sprites, slots))
+        sprite_list.extend(sprites)
         for sprite in sprites:
-            self.append(sprite)
+            sprite.register_sprite_list(self)
+
+        for sprite in sprites[:reused]:
+            self._update_all(sprite)
+
+        new_sprites = sprites[reused:]
+        if new_sprites:
+            # noinspection PyProtectedMember
+            self._sprite_pos_data[start * 2:end * 2] = array(
+                "f", [v for sprite in new_sprites for v in sprite._position]
+            )
+            # noinspection PyProtectedMember
+            self._sprite_size_data[start * 2:end * 2] = array(
+                "f", [v for sprite in new_sprites for v in (sprite._width, sprite._height)]
+            )
+            # noinspection PyProtectedMember
+            self._sprite_angle_data[start:end] = array("f", [sprite._angle for sprite in new_sprites])
+            # noinspection PyProtectedMember
+            self._sprite_color_data[start * 4:end * 4] = array(
+                "B",
+                [
+                    v
+                    for sprite in new_sprites
+                    for v in (sprite._color[0], sprite._color[1], sprite._color[2], sprite._alpha)
+                ],
+            )
+            self._expand_dirty_ranges(start, end - 1)
+
+            if self._initialized:
+                # noinspection PyProtectedMember
+                self._write_texture_slots(start, [sprite._texture for sprite in new_sprites])
+            else:
+                self._deferred_sprites.update(new_sprites)
+
+        # Reclaim removed sprites before growing the index buffer
+        if self._sprite_index_tombstones and self._sprite_index_slots + count >= self._idx_capacity:
+            self._normalize_index_buffer()
+
+        # Add the sprites to the end of the index buffer
+        idx_start = self._sprite_index_slots
+        self._sprite_index_slots += count
+        self._grow_index_buffer()
+        self._sprite_index_data[idx_start:self._sprite_index_slots] = array("I", slots)
+        self._sprite_index_positions.update(zip(slots, range(idx_start, self._sprite_index_slots)))
+        self._sprite_index_changed = True
+
+        if self.spatial_hash:
+            for sprite in sprites:
+                self.spatial_hash.insert_object_for_box(sprite)
+
+        # Load additional textures attached to the sprites
+        if self._initialized:
+            for sprite in sprites:
+                if hasattr(sprite, "textures"):
+                    for texture in sprite.textures or []:
+                        self._atlas.add(texture)
 
     def insert(self, index: int, sprite: _SpriteType):
         """
@@ -383,6 +799,11 @@ def insert(self, index: int, sprite: _SpriteType):
         if sprite in self.sprite_list:
             raise ValueError("Sprite is already in list")
 
+        # Resolve the index the same way list.insert does
+        if index < 0:
+            index = max(len(self.sprite_list) + index, 0)
+        index = min(index, len(self.sprite_list))
+
         self.sprite_list.insert(index, sprite)
         sprite.register_sprite_list(self)
 
@@ -398,6 +819,8 @@ def insert(self, index: int, sprite: _SpriteType):
         self._grow_index_buffer()
         self._sprite_index_data.insert(index, slot)
         self._sprite_index_data.pop()
+        self._update_index_positions()
+        self._sprite_index_changed = True
 
         if self.spatial_hash:
             self.spatial_hash.insert_object_for_box(sprite)
@@ -407,6 +830,7 @@ def reverse(self):
         Reverses the current list in-place
         """
         self.sprite_list.reverse()
+        self._normalize_index_buffer()
         # Reverse the index buffer
         # Only revers the part of the array we use
         self._sprite_index_data = self._sprite_index_data[: self._sprite_index_slots]
@@ -416,6 +840,7 @@ def reverse(self):
             extend_by = self._idx_capacity - len(self._sprite_index_data)
             self._sprite_index_data.extend([0] * extend_by)
 
+        self._update_index_positions()
         self._sprite_index_changed = True
 
     def shuffle(self):
@@ -435,6 +860,30 @@ def shuffle(self):
             extend_by = self._idx_capacity - len(self._sprite_index_data)
             self._sprite_index_data.extend([0] * extend_by)
 
+        self._update_index_positions()
+        self._sprite_index_changed = True
+
+    def sort(self, *, key=None, reverse: bool = False):
+        """
+        Sort the spritelist in place.
+
+        Only the index buffer is rewritten. The sprite data
+        stays in the same slots and is not uploaded again.
+
+        :param key: A function taking a sprite and returning the value to sort by.
+                    Without a key the sprites are sorted by texture.
+        :param bool reverse: Sort in descending order
+        """
+        self._normalize_index_buffer()
+        self.sprite_list.sort(key=key, reverse=reverse)
+
+        sprite_slot = self.sprite_slot
+        self._sprite_index_data[:self._sprite_index_slots] = array(
+            "I", [sprite_slot[sprite] for sprite in self.sprite_list]
+        )
+        self._update_index_positions()
+        self._sprite_index_changed = True
+
     @property
     def percent_sprites_moved(self):
         """
@@ -513,22 +962,264 @@ def _get_center(self) -> Tuple[float, float]:
     center = property(_get_center)
 
     def rescale(self, factor: float) -> None:
-        """Rescale all sprites in the list relative to the spritelists center."""
+        """
+        Rescale all sprites in the list relative to the spritelists center.
+        Sprites overriding the ``scale`` or ``position`` properties
+        are changed through their setters.
+
+        :param float factor: Multiplier for the scale and the distance to the center
+        """
+        if len(self) == 0:
+            return
+
+        center_x, center_y = self.center
+        pos_data = self._sprite_pos_data
+        size_data = self._sprite_size_data
+        sprite_slot = self.sprite_slot
         for sprite in self.sprite_list:
-            sprite.rescale_relative_to_point(self.center, factor)
+            if _overrides_properties(type(sprite), ("scale", "position")):
+                sprite.scale *= factor
+                x, y = sprite.position
+                sprite.position = (x - center_x) * factor + center_x, (y - center_y) * factor + center_y
+                continue
+
+            slot = sprite_slot[sprite]
+            # noinspection PyProtectedMember
+            sprite._scale *= factor
+            # noinspection PyProtectedMember
+            texture = sprite._texture
+            if texture:
+                sprite._width = texture.width * sprite._scale
+                sprite._height = texture.height * sprite._scale
+            # noinspection PyProtectedMember
+            x, y = sprite._position
+            x = (x - center_x) * factor + center_x
+            y = (y - center_y) * factor + center_y
+            sprite._position = x, y
+            sprite._point_list_cache = None
+
+            pos_data[slot * 2] = x
+            pos_data[slot * 2 + 1] = y
+            size_data[slot * 2] = sprite._width
+            size_data[slot * 2 + 1] = sprite._height
+
+            if len(sprite.sprite_lists) > 1:
+                for sprite_list in sprite.sprite_lists:
+                    if sprite_list is not self:
+                        sprite_list.update_size(sprite)
+                        sprite_list.update_location(sprite)
+
+        self._sprites_moved += len(self)
+        self._sprite_pos_changed = True
+        self._sprite_pos_dirty[:] = [0, _NO_SLOT]
+        self._sprite_size_changed = True
+        self._sprite_size_dirty[:] = [0, _NO_SLOT]
+        self._rehash_all_sprites()
+
+    def rotate_about(self, point: Point, degrees: float) -> None:
+        """
+        Rotate all sprites in the list around a point.
+        The angle of every sprite changes by the same amount.
+        Sprites overriding the ``position`` or ``angle`` properties
+        are changed through their setters.
+
+        :param Point point: Point to rotate around
+        :param float degrees: Angle to rotate counter-clockwise
+        """
+        if len(self) == 0:
+            return
+
+        center_x, center_y = point
+        angle = math.radians(degrees)
+        cos_angle = math.cos(angle)
+        sin_angle = math.sin(angle)
+        pos_data = self._sprite_pos_data
+        angle_data = self._sprite_angle_data
+        sprite_slot = self.sprite_slot
+        for sprite in self.sprite_list:
+            overridden = _overrides_properties(type(sprite), ("position", "angle"))
+            x, y = sprite.position if overridden else sprite._position
+            x -= center_x
+            y -= center_y
+            x, y = x * cos_angle - y * sin_angle + center_x, x * sin_angle + y * cos_angle + center_y
+            if overridden:
+                sprite.position = x, y
+                sprite.angle += degrees
+                continue
+
+            slot = sprite_slot[sprite]
+            sprite._position = x, y
+            # noinspection PyProtectedMember
+            sprite._angle += degrees
+            sprite._point_list_cache = None
+
+            pos_data[slot * 2] = x
+            pos_data[slot * 2 + 1] = y
+            angle_data[slot] = sprite._angle
+
+            if len(sprite.sprite_lists) > 1:
+                for sprite_list in sprite.sprite_lists:
+                    if sprite_list is not self:
+                        sprite_list.update_angle(sprite)
+                        sprite_list.update_location(sprite)
+
+        self._sprites_moved += len(self)
+        self._sprite_pos_changed = True
+        self._sprite_pos_dirty[:] = [0, _NO_SLOT]
+        self._sprite_angle_changed = True
+        self._sprite_angle_dirty[:] = [0, _NO_SLOT]
+        self._rehash_all_sprites()
 
     def move(self, change_x: float, change_y: float) -> None:
         """
         Moves all Sprites in the list by the same amount.
         This can be a very expensive operation depending on the
-        size of the sprite list.
+        size of the sprite list. Use :py:attr:`offset` to move
+        the whole list when drawing instead.
+        Sprites overriding the ``position`` property are moved
+        through its setter.
 
         :param float change_x: Amount to change all x values by
         :param float change_y: Amount to change all y values by
         """
+        if len(self) == 0:
+            return
+
+        pos_data = self._sprite_pos_data
+        sprite_slot = self.sprite_slot
+        for sprite in self.sprite_list:
+            if _overrides_properties(type(sprite), ("position",)):
+                x, y = sprite.position
+                sprite.position = x + change_x, y + change_y
+                continue
+
+            slot = sprite_slot[sprite]
+            # noinspection PyProtectedMember
+            x, y = sprite._position
+            x += change_x
+            y += change_y
+            sprite._position = x, y
+            sprite._point_list_cache = None
+
+            pos_data[slot * 2] = x
+            pos_data[slot * 2 + 1] = y
+
+            if len(sprite.sprite_lists) > 1:
+                for sprite_list in sprite.sprite_lists:
+                    if sprite_list is not self:
+                        sprite_list.update_location(sprite)
+
+        self._sprites_moved += len(self)
+        self._sprite_pos_changed = True
+        self._sprite_pos_dirty[:] = [0, _NO_SLOT]
+        self._rehash_all_sprites()
+
+    def set_alpha(self, alpha: int) -> None:
+        """
+        Set the alpha of all sprites in the list.
+        Sprites overriding the ``alpha`` property are changed through its setter.
+
+        :param int alpha: Transparency. 0 is invisible, 255 is opaque.
+        """
+        if alpha < 0 or alpha > 255:
+            raise ValueError(
+                f"Invalid value for alpha. Must be 0 to 255, received {alpha}"
+            )
+
+        self._write_alpha(int(alpha))
+        self._update_other_sprite_lists_color()
+
+    def _write_alpha(self, alpha: int):
+        """Set the alpha of all sprites and write it into the color buffer"""
+        overridden = []
         for sprite in self.sprite_list:
-            sprite.center_x += change_x
-            sprite.center_y += change_y
+            if _overrides_properties(type(sprite), ("alpha",)):
+                overridden.append(sprite)
+            else:
+                sprite._alpha = alpha
+
+        # The alpha is the fourth component of each color
+        slots = self._sprite_buffer_slots
+        self._sprite_color_data[3:slots * 4:4] = array("B", [alpha]) * slots
+
+        # The setters write the value they actually set into the buffers
+        for sprite in overridden:
+            sprite.alpha = alpha
+
+    def set_color(self, color: Color) -> None:
+        """
+        Set the color of all sprites in the list.
+        Sprites overriding the ``color`` or ``alpha`` properties are
+        changed through their setters.
+
+        :param Color color: RGB or RGBA color. Alpha is only changed for RGBA colors.
+        """
+        if color is None or len(color) not in (3, 4):
+            raise ValueError("Color must be three or four ints from 0-255")
+        if len(color) == 4:
+            if color[3] < 0 or color[3] > 255:
+                raise ValueError(
+                    f"Invalid value for alpha. Must be 0 to 255, received {color[3]}"
+                )
+            self._write_alpha(int(color[3]))
+
+        rgb = int(color[0]), int(color[1]), int(color[2])
+        overridden = []
+        for sprite in self.sprite_list:
+            if _overrides_properties(type(sprite), ("color",)):
+                overridden.append(sprite)
+            else:
+                sprite._color = rgb
+
+        slots = self._sprite_buffer_slots
+        color_data = self._sprite_color_data
+        for component in range(3):
+            color_data[component:slots * 4:4] = array("B", [rgb[component]]) * slots
+
+        # The setters write the value they actually set into the buffers
+        for sprite in overridden:
+            sprite.color = rgb
+        self._update_other_sprite_lists_color()
+
+    def _update_other_sprite_lists_color(self):
+        """Mark the color buffer as changed and update other lists containing the sprites"""
+        self._sprite_color_changed = True
+        self._sprite_color_dirty[:] = [0, _NO_SLOT]
+
+        for sprite in self.sprite_list:
+            if len(sprite.sprite_lists) > 1:
+                for sprite_list in sprite.sprite_lists:
+                    if sprite_list is not self:
+                        sprite_list.update_color(sprite)
+
+    def _rehash_all_sprites(self):
+        """Update the spatial hash after all the sprites moved"""
+        if self.spatial_hash is None:
+            return
+
+        if self._spatial_hash_mode == "deferred":
+            for sprite in self.sprite_list:
+                self.spatial_hash.mark_dirty(sprite)
+        else:
+            for sprite in self.sprite_list:
+                self.spatial_hash.move_object(sprite)
+
+    def collide_with_list(self, other: "SpriteList") -> List[Tuple[int, int]]:
+        """
+        Check for collisions between every sprite in this list and
+        every sprite in another list.
+
+        This is a lot faster than calling ``check_for_collision_with_list``
+        for each sprite in this list.
+
+        :param SpriteList other: SpriteList to check against
+        :returns: Sorted list of ``(i, j)`` index pairs where ``self[i]``
+                  collides with ``other[j]``
+        :rtype: list
+        """
+        from .spatial_hash import check_for_collision_between_lists
+
+        return check_for_collision_between_lists(self, other)
 
     def preload_textures(self, texture_list: List["Texture"]) -> None:
         """
@@ -555,16 +1246,19 @@ def _update_all(self, sprite: Sprite):
         # noinspection PyProtectedMember
         self._sprite_pos_data[slot * 2 + 1] = sprite._position[1]
         self._sprite_pos_changed = True
+        self._mark_dirty(self._sprite_pos_dirty, slot)
         # size
         # noinspection PyProtectedMember
         self._sprite_size_data[slot * 2] = sprite._width
         # noinspection PyProtectedMember
         self._sprite_size_data[slot * 2 + 1] = sprite._height
         self._sprite_size_changed = True
+        self._mark_dirty(self._sprite_size_dirty, slot)
         # angle
         # noinspection PyProtectedMember
         self._sprite_angle_data[slot] = sprite._angle
         self._sprite_angle_changed = True
+        self._mark_dirty(self._sprite_angle_dirty, slot)
         # color
         # noinspection PyProtectedMember
         self._sprite_color_data[slot * 4] = sprite._color[0]
@@ -575,6 +1269,7 @@ def _update_all(self, sprite: Sprite):
         # noinspection PyProtectedMember
         self._sprite_color_data[slot * 4 + 3] = sprite._alpha
         self._sprite_color_changed = True
+        self._mark_dirty(self._sprite_color_dirty, slot)
 
         # texture
         if not self._initialized:
@@ -591,10 +1286,37 @@ def _update_all(self, sprite: Sprite):
 
         self._sprite_texture_data[slot] = tex_slot
         self._sprite_texture_changed = True
+        self._mark_dirty(self._sprite_texture_dirty, slot)
+
+    def _write_texture_slots(self, start: int, textures: Sequence[Optional["Texture"]]):
+        """
+        Write the atlas slots for a range of sprite buffer slots.
+        Sprites without a texture are skipped.
+        """
+        tex_slots: Dict[int, int] = dict()
+        texture_data = self._sprite_texture_data
+        for slot, texture in enumerate(textures, start):
+            if texture is None:
+                continue
+            try:
+                tex_slot = tex_slots[id(texture)]
+            except KeyError:
+                tex_slot, _ = self._atlas.add(texture)
+                tex_slots[id(texture)] = tex_slot
+            texture_data[slot] = tex_slot
+
+        if textures:
+            self._sprite_texture_changed = True
+            self._mark_dirty(self._sprite_texture_dirty, start)
+            self._mark_dirty(self._sprite_texture_dirty, start + len(textures) - 1)
 
     def update_texture(self, sprite) -> None:
         """Make sure we update the texture for this sprite for the next batch
         drawing"""
+        # The texture can change the hit box of the sprite
+        if self.spatial_hash is not None:
+            self.spatial_hash.move_object(sprite)
+
         # We cannot interact with texture atlases unless the context
         # is created. We defer all texture initialization for later
         if not self._initialized:
@@ -611,6 +1333,7 @@ def update_texture(self, sprite) -> None:
 
         self._sprite_texture_data[slot] = tex_slot
         self._sprite_texture_changed = True
+        self._mark_dirty(self._sprite_texture_dirty, slot)
 
         # Update size in cas the sprite was initialized without size
         # NOTE: There should be a better way to do this
@@ -619,6 +1342,7 @@ def update_texture(self, sprite) -> None:
         # noinspection PyProtectedMember
         self._sprite_size_data[slot * 2 + 1] = sprite._height
         self._sprite_size_changed = True
+        self._mark_dirty(self._sprite_size_dirty, slot)
 
     def update_position(self, sprite: Sprite) -> None:
         """
@@ -636,6 +1360,7 @@ def update_position(self, sprite: Sprite) -> None:
         # noinspection PyProtectedMember
         self._sprite_pos_data[slot * 2 + 1] = sprite._position[1]
         self._sprite_pos_changed = True
+        self._mark_dirty(self._sprite_pos_dirty, slot)
 
     def update_color(self, sprite: Sprite) -> None:
         """
@@ -655,6 +1380,7 @@ def update_color(self, sprite: Sprite) -> None:
         # noinspection PyProtectedMember
         self._sprite_color_data[slot * 4 + 3] = int(sprite._alpha)
         self._sprite_color_changed = True
+        self._mark_dirty(self._sprite_color_dirty, slot)
 
     def update_size(self, sprite: Sprite) -> None:
         """
@@ -667,6 +1393,9 @@ def update_size(self, sprite: Sprite) -> None:
         self._sprite_size_data[slot * 2] = sprite._width
         self._sprite_size_data[slot * 2 + 1] = sprite._height
         self._sprite_size_changed = True
+        self._mark_dirty(self._sprite_size_dirty, slot)
+        if self.spatial_hash is not None:
+            self.spatial_hash.move_object(sprite)
 
     def update_height(self, sprite: Sprite):
         """
@@ -678,6 +1407,9 @@ def update_height(self, sprite: Sprite):
         slot = self.sprite_slot[sprite]
         self._sprite_size_data[slot * 2 + 1] = sprite._height
         self._sprite_size_changed = True
+        self._mark_dirty(self._sprite_size_dirty, slot)
+        if self.spatial_hash is not None:
+            self.spatial_hash.move_object(sprite)
 
     def update_width(self, sprite: Sprite):
         """
@@ -690,6 +1422,9 @@ def update_width(self, sprite: Sprite):
         # noinspection PyProtectedMember
         self._sprite_size_data[slot * 2] = sprite._width
         self._sprite_size_changed = True
+        self._mark_dirty(self._sprite_size_dirty, slot)
+        if self.spatial_hash is not None:
+            self.spatial_hash.move_object(sprite)
 
     def update_location(self, sprite: Sprite):
         """
@@ -708,7 +1443,13 @@ def update_location(self, sprite: Sprite):
         # noinspection PyProtectedMember
         self._sprite_pos_data[slot * 2 + 1] = sprite._position[1]
         self._sprite_pos_changed = True
+        self._mark_dirty(self._sprite_pos_dirty, slot)
         self._sprites_moved += 1
+        if self.spatial_hash is not None:
+            if self._spatial_hash_mode == "deferred":
+                self.spatial_hash.mark_dirty(sprite)
+            else:
+                self.spatial_hash.move_object(sprite)
 
     def update_angle(self, sprite: Sprite):
         """
@@ -720,7 +1461,14 @@ def update_angle(self, sprite: Sprite):
         slot = self.sprite_slot[sprite]
         self._sprite_angle_data[slot] = sprite._angle
         self._sprite_angle_changed = True
-
+        self._mark_dirty(self._sprite_angle_dirty, slot)
+        if self.spatial_hash is not None:
+            if self._spatial_hash_mode == "deferred":
+                self.spatial_hash.mark_dirty(sprite)
+            else:
+                self.spatial_hash.move_object(sprite)
+
+    @perf.timed("sprite_list.write_buffers")
     def _write_sprite_buffers_to_gpu(self):
         """Create or resize buffers"""
         LOG.debug(
@@ -734,30 +1482,124 @@ def _write_sprite_buffers_to_gpu(self):
             self._sprite_index_changed,
         )
 
+        # The draw order depends on the positions when sorting by y
+        resort = self._sort_by is not None and self._sprite_pos_changed
+
         if self._sprite_pos_changed:
-            self._sprite_pos_buf.write(self._sprite_pos_data)
+            self._write_buffer_range(self._sprite_pos_buf, self._sprite_pos_data, 2,
+                                     *self._sprite_pos_dirty)
             self._sprite_pos_changed = False
 
         if self._sprite_size_changed:
-            self._sprite_size_buf.write(self._sprite_size_data)
+            self._write_buffer_range(self._sprite_size_buf, self._sprite_size_data, 2,
+                                     *self._sprite_size_dirty)
             self._sprite_size_changed = False
 
         if self._sprite_angle_changed:
-            self._sprite_angle_buf.write(self._sprite_angle_data)
+            self._write_buffer_range(self._sprite_angle_buf, self._sprite_angle_data, 1,
+                                     *self._sprite_angle_dirty)
             self._sprite_angle_changed = False
 
         if self._sprite_color_changed:
-            self._sprite_color_buf.write(self._sprite_color_data)
+            self._write_buffer_range(self._sprite_color_buf, self._sprite_color_data, 4,
+                                     *self._sprite_color_dirty)
             self._sprite_color_changed = False
 
         if self._sprite_texture_changed:
-            self._sprite_texture_buf.write(self._sprite_texture_data)
+            self._write_buffer_range(self._sprite_texture_buf, self._sprite_texture_data, 1,
+                                     *self._sprite_texture_dirty)
             self._sprite_texture_changed = False
 
-        if self._sprite_index_changed:
-            self._sprite_index_buf.write(self._sprite_index_data)
+        self._reset_dirty_ranges()
+
+        if self._sprite_index_changed or resort:
+            # Only the used part of the index buffer
+            if self._sort_by == "y":
+                data = memoryview(self._get_y_sorted_index_data())
+            else:
+                data = memoryview(self._sprite_index_data)[:self._sprite_index_slots]
+            self._sprite_index_buf.write(data)
+            self._bytes_uploaded += data.nbytes
             self._sprite_index_changed = False
 
+    def _get_y_sorted_index_data(self) -> array:
+        """
+        Get the used part of the index buffer ordered by the y position of the sprites.
+        The sort is stable so sprites with the same y position keep their list order.
+        """
+        pos_data = self._sprite_pos_data
+        return array("I", sorted(
+            self._sprite_index_data[:self._sprite_index_slots],
+            key=lambda slot: pos_data[slot * 2 + 1],
+            reverse=True,
+        ))
+
+    def _write_buffer_range(self, buffer: gl.Buffer, data: array, components: int, dirty_min: int, dirty_max: int):
+        """
+        Write the changed slots of a sprite buffer to the GPU.
+        The whole used part of the buffer is written if most of it changed.
+        """
+        slots = self._sprite_buffer_slots
+        dirty_max = min(dirty_max, slots - 1)
+        if dirty_max < dirty_min:
+            return
+
+        if dirty_max - dirty_min + 1 > slots * _FULL_UPLOAD_RATIO:
+            dirty_min, dirty_max = 0, slots - 1
+
+        start = dirty_min * components
+        end = (dirty_max + 1) * components
+        buffer.write(memoryview(data)[start:end], offset=start * data.itemsize)
+        self._bytes_uploaded += (end - start) * data.itemsize
+
+    def _reset_dirty_ranges(self):
+        """Mark all the sprite buffers as uploaded"""
+        # The changed slots of each buffer as a [min, max] list
+        self._sprite_pos_dirty = [_NO_SLOT, -1]
+        self._sprite_size_dirty = [_NO_SLOT, -1]
+        self._sprite_angle_dirty = [_NO_SLOT, -1]
+        self._sprite_color_dirty = [_NO_SLOT, -1]
+        self._sprite_texture_dirty = [_NO_SLOT, -1]
+
+    @staticmethod
+    def _mark_dirty(dirty_range: List[int], slot: int):
+        """Add a slot to the dirty range of a buffer"""
+        if slot < dirty_range[0]:
+            dirty_range[0] = slot
+        if slot > dirty_range[1]:
+            dirty_range[1] = slot
+
+    def _expand_dirty_ranges(self, slot_min: int, slot_max: int):
+        """Add a range of slots to the dirty position, size, angle and color ranges"""
+        self._sprite_pos_changed = True
+        self._sprite_size_changed = True
+        self._sprite_angle_changed = True
+        self._sprite_color_changed = True
+        for dirty_range in (self._sprite_pos_dirty, self._sprite_size_dirty,
+                            self._sprite_angle_dirty, self._sprite_color_dirty):
+            self._mark_dirty(dirty_range, slot_min)
+            self._mark_dirty(dirty_range, slot_max)
+
+    def _mark_sprite_buffers_dirty(self):
+        """Upload the whole sprite buffers on the next draw"""
+        self._sprite_pos_changed = True
+        self._sprite_size_changed = True
+        self._sprite_angle_changed = True
+        self._sprite_color_changed = True
+        self._sprite_texture_changed = True
+        for dirty_range in (self._sprite_pos_dirty, self._sprite_size_dirty, self._sprite_angle_dirty,
+                            self._sprite_color_dirty, self._sprite_texture_dirty):
+            dirty_range[:] = [0, _NO_SLOT]
+
+    @property
+    def bytes_uploaded(self) -> int:
+        """
+        Number of bytes written to the GPU buffers in the last draw.
+        Useful to see how much data changes every frame.
+        """
+        return self._bytes_uploaded
+
+    @perf.timed("sprite_list.draw")
     def draw(self, **kwargs):
         """
         Draw this list of sprites.
@@ -776,13 +1618,15 @@ def draw(self, **kwargs):
             )
             self._init_deferred()
 
-        if len(self.sprite_list) == 0:
+        self._bytes_uploaded = 0
+        if len(self) == 0:
             return
 
         # What percent of this sprite list moved? Used in guessing spatial hashing
-        self._percent_sprites_moved = self._sprites_moved / len(self.sprite_list) * 100
+        self._percent_sprites_moved = self._sprites_moved / len(self) * 100
         self._sprites_moved = 0
 
+        self._normalize_index_buffer()
         if any(
                 (
                         self._sprite_pos_changed,
@@ -816,14 +1660,25 @@ def draw(self, **kwargs):
         # self.program['TextureTransform'] = texture_transform
 
         self.program["TextureTransform"] = Mat3()
+        self.program["list_offset"] = self._offset
+        self.program["list_scale"] = self._scale
+        self.program["list_angle"] = self._angle
 
         self._atlas.texture.use(0)
         self._atlas.use_uv_texture(1)
-        self._geometry.render(
-            self.program,
-            mode=self.ctx.POINTS,
-            vertices=self._sprite_index_slots,
-        )
+        if self._render_mode == "instanced":
+            self._geometry.render(
+                self.program,
+                mode=self.ctx.TRIANGLE_STRIP,
+                vertices=4,
+                instances=self._sprite_buffer_slots,
+            )
+        else:
+            self._geometry.render(
+                self.program,
+                mode=self.ctx.POINTS,
+                vertices=self._sprite_index_slots,
+            )
 
     def draw_hit_boxes(self, color: Color = (0, 0, 0, 255), line_thickness: float = 1):
         """Draw all the hit boxes in this list"""
@@ -836,16 +1691,70 @@ def _normalize_index_buffer(self):
         Removes unused slots in the index buffer.
         The other buffers don't need this because they re-use slots.
         New sprites on the other hand always needs to be added
-        to the end of the index buffer to preserve order
+        to the end of the index buffer to preserve order.
+
+        Removed sprites are only marked as invisible in the index buffer,
+        so this compacts all of them in a single pass.
         """
-        # Need counter for how many slots are used in index buffer.
-        # 1) Sort the deleted indices (descending) and pop() them in a loop
-        # 2) Create a new array.array and manually copy every
-        #    item in the list except the deleted index slots
-        # 3) Use a transform (gpu) to trim the index buffer and
-        #    read this buffer back into a new array using array.from_bytes
-        # NOTE: Right now the index buffer is always normalized
-        pass
+        if not self._sprite_index_tombstones:
+            return
+
+        self._sprite_index_data = array(
+            "I",
+            [
+                slot
+                for slot in self._sprite_index_data[:self._sprite_index_slots]
+                if slot != _SPRITE_SLOT_INVISIBLE
+            ],
+        )
+        self._sprite_index_slots = len(self._sprite_index_data)
+        self._sprite_index_data.extend([0] * (self._idx_capacity - self._sprite_index_slots))
+        self._sprite_index_tombstones = 0
+        self._sprite_index_tombstone_tree = array("I", [0] * (self._idx_capacity + 1))
+        self._update_index_positions()
+        self._sprite_index_changed = True
+
+    def _update_index_positions(self):
+        """Rebuild the buffer slot to index buffer position mapping"""
+        self._sprite_index_positions = {
+            slot: position
+            for position, slot in enumerate(self._sprite_index_data[:self._sprite_index_slots])
+        }
+
+    def _rebuild_tombstone_tree(self):
+        """Rebuild the tombstone tree from the removed sprites in the index buffer"""
+        tree = array("I", [0] * (self._idx_capacity + 1))
+        if self._sprite_index_tombstones:
+            for position, slot in enumerate(self._sprite_index_data[:self._sprite_index_slots], 1):
+                if slot == _SPRITE_SLOT_INVISIBLE:
+                    tree[position] = 1
+            # Build the tree in place by adding every node to its parent
+            for position in range(1, len(tree)):
+                parent = position + (position & -position)
+                if parent < len(tree):
+                    tree[parent] += tree[position]
+        self._sprite_index_tombstone_tree = tree
+
+    def _add_tombstone(self, position: int):
+        """Register a removed sprite at a position in the index buffer"""
+        self._sprite_index_tombstones += 1
+        tree = self._sprite_index_tombstone_tree
+        position += 1
+        while position < len(tree):
+            tree[position] += 1
+            position += position & -position
+
+    def _count_tombstones_before(self, position: int) -> int:
+        """Number of removed sprites in the index buffer before a position"""
+        if not self._sprite_index_tombstones:
+            return 0
+
+        tree = self._sprite_index_tombstone_tree
+        count = 0
+        while position > 0:
+            count += tree[position]
+            position -= position & -position
+        return count
 
     def _grow_sprite_buffers(self):
         """Double the internal buffer sizes"""
@@ -853,23 +1762,25 @@ def _grow_sprite_buffers(self):
         if self._sprite_buffer_slots < self._buf_capacity:
             return
 
-        # double the capacity
-        extend_by = self._buf_capacity
-        self._buf_capacity = self._buf_capacity * 2
+        # double the capacity until all the slots fit
+        old_capacity = self._buf_capacity
+        while self._buf_capacity <= self._sprite_buffer_slots:
+            self._buf_capacity = self._buf_capacity * 2
+        extend_by = self._buf_capacity - old_capacity
 
         LOG.debug(
             f"(%s) Increasing buffer capacity from %s to %s",
             self._sprite_buffer_slots,
-            extend_by,
+            old_capacity,
             self._buf_capacity,
         )
 
         # Extend the buffers so we don't lose the old data
-        self._sprite_pos_data.extend([0] * extend_by * 2)
-        self._sprite_size_data.extend([0] * extend_by * 2)
-        self._sprite_angle_data.extend([0] * extend_by)
-        self._sprite_color_data.extend([0] * extend_by * 4)
-        self._sprite_texture_data.extend([0] * extend_by)
+        self._sprite_pos_data.frombytes(bytes(extend_by * 4 * 2))
+        self._sprite_size_data.frombytes(bytes(extend_by * 4 * 2))
+        self._sprite_angle_data.frombytes(bytes(extend_by * 4))
+        self._sprite_color_data.frombytes(bytes(extend_by * 4))
+        self._sprite_texture_data.frombytes(bytes(extend_by * 4))
 
         if self._initialized:
             self._sprite_pos_buf.orphan(size=self._buf_capacity * 4 * 2)
@@ -878,19 +1789,40 @@ def _grow_sprite_buffers(self):
             self._sprite_color_buf.orphan(size=self._buf_capacity * 4 * 4)
             self._sprite_texture_buf.orphan(size=self._buf_capacity * 4)
 
-        self._sprite_pos_changed = True
-        self._sprite_size_changed = True
-        self._sprite_angle_changed = True
-        self._sprite_color_changed = True
-        self._sprite_texture_changed = True
+        self._mark_sprite_buffers_dirty()
+
+    def _shrink_buffers(self, capacity: int):
+        """Shrink the internal buffers of an empty sprite list to the given capacity"""
+        if self._buf_capacity > capacity:
+            self._buf_capacity = capacity
+            del self._sprite_pos_data[capacity * 2:]
+            del self._sprite_size_data[capacity * 2:]
+            del self._sprite_angle_data[capacity:]
+            del self._sprite_color_data[capacity * 4:]
+            del self._sprite_texture_data[capacity:]
+
+            if self._initialized:
+                self._sprite_pos_buf.orphan(size=self._buf_capacity * 4 * 2)
+                self._sprite_size_buf.orphan(size=self._buf_capacity * 4 * 2)
+                self._sprite_angle_buf.orphan(size=self._buf_capacity * 4)
+                self._sprite_color_buf.orphan(size=self._buf_capacity * 4 * 4)
+                self._sprite_texture_buf.orphan(size=self._buf_capacity * 4)
+
+        if self._idx_capacity > capacity:
+            self._idx_capacity = capacity
+            del self._sprite_index_data[capacity:]
+            if self._initialized:
+                self._sprite_index_buf.orphan(size=self._idx_capacity * 4)
 
     def _grow_index_buffer(self):
         # Extend the index buffer capacity if needed
         if self._sprite_index_slots < self._idx_capacity:
             return
 
-        extend_by = self._idx_capacity
-        self._idx_capacity = self._idx_capacity * 2
+        old_capacity = self._idx_capacity
+        while self._idx_capacity <= self._sprite_index_slots:
+            self._idx_capacity = self._idx_capacity * 2
+        extend_by = self._idx_capacity - old_capacity
 
         LOG.debug(
             "Buffers: index_slots=%s sprite_slots=%s over-allocation-ratio=%s",
@@ -902,11 +1834,12 @@ def _grow_index_buffer(self):
         LOG.debug(
             f"(%s) Increasing index capacity from %s to %s",
             self._sprite_index_slots,
-            extend_by,
+            old_capacity,
             self._idx_capacity,
         )
 
-        self._sprite_index_data.extend([0] * extend_by)
+        self._sprite_index_data.frombytes(bytes(extend_by * 4))
+        self._rebuild_tombstone_tree()
         if self._initialized:
             self._sprite_index_buf.orphan(size=self._idx_capacity * 4)
 
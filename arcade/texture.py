@@ -2,24 +2,30 @@
 Code related to working with textures.
 """
 
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
+import pyglet
 import PIL.Image
 import PIL.ImageOps
 import PIL.ImageDraw
 
-from typing import Optional, Tuple
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, Tuple
 from typing import List
 from typing import Union
 
 from arcade import lerp
 from arcade import RectList
 from arcade import Color
-from arcade import calculate_hit_box_points_simple
-from arcade import calculate_hit_box_points_detailed
+from arcade.hitbox import get_hit_box_points
 from arcade.math import Mat3
 from arcade.resources import resolve_resource_path
 
+if TYPE_CHECKING:
+    from arcade import TextureAtlas
+
 
 def _lerp_color(start_color: Color, end_color: Color, u: float) -> Color:
     return (
@@ -184,10 +190,8 @@ def hit_box_points(self):
             if not self.image:
                 raise ValueError(f"Texture '{self.name}' doesn't have an image")
 
-            if self._hit_box_algorithm == "Simple":
-                self._hit_box_points = calculate_hit_box_points_simple(self.image)
-            elif self._hit_box_algorithm == "Detailed":
-                self._hit_box_points = calculate_hit_box_points_detailed(self.image, self._hit_box_detail)
+            if self._hit_box_algorithm in ("Simple", "Detailed"):
+                self._hit_box_points = get_hit_box_points(self.image, self._hit_box_algorithm, self._hit_box_detail)
             else:
                 p1 = (-self.image.width / 2, -self.image.height / 2)
                 p2 = (self.image.width / 2, -self.image.height / 2)
@@ -272,6 +276,286 @@ def draw_scaled(self, center_x: float, center_y: float,
             self._sprite_list.draw()
 
 
+class TextureCache:
+    """
+    Cache for the textures created by :py:func:`load_texture`,
+    :py:func:`load_textures` and :py:func:`load_spritesheet`.
+
+    Decoded source images are cached as well, so loading many textures
+    from the same file only decodes the file once.
+
+    The cache can be limited to a number of bytes of image data.
+    When the limit is exceeded the least recently used textures are
+    evicted. Evicted images are decoded again from their file the next time
+    they are loaded. Textures that are still in a texture atlas or that are
+    pinned with :py:meth:`pin` are never evicted.
+
+    The cache can be used like a dict with the texture names as keys.
+    It's safe to use from multiple threads.
+
+    :param int max_bytes: Maximum bytes of image data to keep. ``None`` for no limit.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Texture]" = OrderedDict()
+        # Textures can share an image. Only count the bytes of an image once.
+        # id(image) -> [number of entries using it, bytes]
+        self._images: Dict[int, List[int]] = {}
+        self._pinned: Dict[str, int] = {}
+        self._bytes_used = 0
+        self._lock = threading.RLock()
+        # Per name locks for textures being loaded: name -> [lock, number of threads using it]
+        self._loading: Dict[str, list] = {}
+        #: Number of lookups that found a texture
+        self.hits = 0
+        #: Number of lookups that didn't find a texture
+        self.misses = 0
+        #: Number of textures evicted because of the byte limit
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> Optional[int]:
+        """
+        Maximum bytes of image data to keep. ``None`` for no limit.
+        Setting a lower limit evicts textures right away.
+
+        :type: int
+        """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: Optional[int]):
+        with self._lock:
+            self._max_bytes = value
+            self._evict()
+
+    @property
+    def bytes_used(self) -> int:
+        """
+        Bytes of image data in the cache.
+
+        :type: int
+        """
+        return self._bytes_used
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Dict with the current ``size``, ``bytes_used``, ``hits``,
+        ``misses`` and ``evictions``.
+
+        :type: Dict[str, int]
+        """
+        return {
+            "size": len(self._entries),
+            "bytes_used": self._bytes_used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get(self, name: str) -> Optional["Texture"]:
+        """
+        Get a texture and mark it as recently used.
+
+        :param str name: Name of the texture
+        :returns: The texture or None if it's not in the cache
+        """
+        with self._lock:
+            texture = self._entries.get(name)
+            if texture is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(name)
+            return texture
+
+    def put(self, name: str, texture: "Texture") -> None:
+        """
+        Add a texture to the cache. Evicts the least recently used
+        textures if the byte limit is exceeded.
+
+        :param str name: Name of the texture
+        :param Texture texture: The texture
+        """
+        with self._lock:
+            if name in self._entries:
+                self._remove(name)
+
+            self._entries[name] = texture
+            image = texture.image
+            if image is not None:
+                users = self._images.get(id(image))
+                if users is None:
+                    size = image.width * image.height * len(image.getbands())
+                    self._images[id(image)] = [1, size]
+                    self._bytes_used += size
+                else:
+                    users[0] += 1
+
+            self._evict()
+
+    def _get_or_load(self, name: str, load: Callable[[], "Texture"]) -> "Texture":
+        """
+        Get a texture or load and add it if it's missing.
+        Threads loading the same name wait for the first one,
+        so a texture is only loaded once.
+
+        :param str name: Name of the texture
+        :param load: Function creating the texture
+        """
+        with self._lock:
+            texture = self.get(name)
+            if texture is not None:
+                return texture
+            loading = self._loading.get(name)
+            if loading is None:
+                loading = self._loading[name] = [threading.Lock(), 0]
+            loading[1] += 1
+
+        try:
+            with loading[0]:
+                # Another thread might have loaded it while we waited
+                with self._lock:
+                    texture = self._entries.get(name)
+                if texture is None:
+                    texture = load()
+                    self.put(name, texture)
+                return texture
+        finally:
+            with self._lock:
+                loading[1] -= 1
+                if loading[1] == 0:
+                    del self._loading[name]
+
+    def pin(self, name: str) -> None:
+        """
+        Never evict a texture until it's unpinned again.
+        A texture must be unpinned as many times as it was pinned.
+
+        :param str name: Name of the texture
+        """
+        with self._lock:
+            self._pinned[name] = self._pinned.get(name, 0) + 1
+
+    def unpin(self, name: str) -> None:
+        """
+        Allow evicting a pinned texture again.
+
+        :param str name: Name of the texture
+        """
+        with self._lock:
+            count = self._pinned.get(name, 0) - 1
+            if count > 0:
+                self._pinned[name] = count
+            else:
+                self._pinned.pop(name, None)
+            self._evict()
+
+    def is_pinned(self, name: str) -> bool:
+        """
+        Check if a texture can't be evicted because it's pinned
+        or still in a texture atlas.
+
+        :param str name: Name of the texture
+        """
+        if name in self._pinned:
+            return True
+
+        from arcade.texture_atlas import is_texture_in_atlas
+        texture = self._entries.get(name)
+        return texture is not None and is_texture_in_atlas(texture)
+
+    def clear(self) -> None:
+        """
+        Remove all textures and pins and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._images.clear()
+            self._pinned.clear()
+            self._bytes_used = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def _remove(self, name: str) -> None:
+        """Remove a texture and stop counting the bytes of its image if unused"""
+        texture = self._entries.pop(name)
+        if texture.image is None:
+            return
+
+        users = self._images[id(texture.image)]
+        users[0] -= 1
+        if users[0] == 0:
+            del self._images[id(texture.image)]
+            self._bytes_used -= users[1]
+
+    def _evict(self) -> None:
+        """Evict the least recently used textures until the byte limit is met"""
+        if self._max_bytes is None or self._bytes_used <= self._max_bytes:
+            return
+
+        from arcade.texture_atlas import is_texture_in_atlas
+
+        # Each texture is looked at once at most. Pinned textures are moved
+        # to the end so later evictions don't have to skip them again.
+        for _ in range(len(self._entries)):
+            name, texture = next(iter(self._entries.items()))
+            if name in self._pinned or is_texture_in_atlas(texture):
+                self._entries.move_to_end(name)
+                continue
+            self._remove(name)
+            self.evictions += 1
+            if self._bytes_used <= self._max_bytes:
+                break
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __getitem__(self, name: str) -> "Texture":
+        texture = self.get(name)
+        if texture is None:
+            raise KeyError(name)
+        return texture
+
+    def __setitem__(self, name: str, texture: "Texture"):
+        self.put(name, texture)
+
+    def __delitem__(self, name: str):
+        with self._lock:
+            self._remove(name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _load_source_image(file_name: Union[str, Path]) -> PIL.Image.Image:
+    """
+    Get the decoded image of a file through the texture cache.
+    Images are always converted to RGBA.
+    """
+    cache_file_name = f"{file_name}"
+
+    def load() -> Texture:
+        image = PIL.Image.open(resolve_resource_path(file_name)).convert('RGBA')
+        return Texture(cache_file_name, image)
+
+    return texture_cache._get_or_load(cache_file_name, load).image
+
+
+def get_texture_cache() -> TextureCache:
+    """
+    Get the cache used by :py:func:`load_texture`, :py:func:`load_textures`
+    and :py:func:`load_spritesheet`.
+
+    :rtype: TextureCache
+    """
+    return texture_cache
+
+
 def load_textures(file_name: Union[str, Path],
                   image_location_list: RectList,
                   mirrored: bool = False,
@@ -299,16 +583,8 @@ def load_textures(file_name: Union[str, Path],
     :raises: ValueError
     """
     # See if we already loaded this texture file, and we can just use a cached version.
-    cache_file_name = "{}".format(file_name)
-    if cache_file_name in load_texture.texture_cache:  # type: ignore # dynamic attribute on function obj
-        texture = load_texture.texture_cache[cache_file_name]  # type: ignore # dynamic attribute on function obj
-        source_image = texture.image
-    else:
-        file_name = resolve_resource_path(file_name)
-
-        source_image = PIL.Image.open(file_name)
-        result = Texture(cache_file_name, source_image)
-        load_texture.texture_cache[cache_file_name] = result  # type: ignore # dynamic attribute on function obj
+    source_image = _load_source_image(file_name)
+    file_name = resolve_resource_path(file_name)
 
     source_image_width, source_image_height = source_image.size
     texture_info_list = []
@@ -337,9 +613,8 @@ def load_textures(file_name: Union[str, Path],
 
         # See if we already loaded this texture, and we can just use a cached version.
         cache_name = "{}{}{}{}{}{}{}".format(file_name, x, y, width, height, flipped, mirrored)
-        if cache_name in load_texture.texture_cache:  # type: ignore # dynamic attribute on function obj
-            result = load_texture.texture_cache[cache_name]  # type: ignore # dynamic attribute on function obj
-        else:
+        result = texture_cache.get(cache_name)
+        if result is None:
             image = source_image.crop((x, y, x + width, y + height))
             # image = _trim_image(image)
 
@@ -349,7 +624,7 @@ def load_textures(file_name: Union[str, Path],
             if flipped:
                 image = PIL.ImageOps.flip(image)
             result = Texture(cache_name, image)
-            load_texture.texture_cache[cache_name] = result  # type: ignore # dynamic attribute on function obj
+            texture_cache.put(cache_name, result)
         texture_info_list.append(result)
 
     return texture_info_list
@@ -433,23 +708,33 @@ def load_texture(file_name: Union[str, Path],
                                                      flipped_vertically,
                                                      flipped_diagonally,
                                                      hit_box_algorithm)
-    if can_cache and cache_name in load_texture.texture_cache:  # type: ignore # dynamic attribute on function obj
-        return load_texture.texture_cache[cache_name]  # type: ignore # dynamic attribute on function obj
+    def load() -> Texture:
+        return _create_texture(cache_name, file_name, x, y, width, height,
+                               flipped_horizontally, flipped_vertically, flipped_diagonally,
+                               hit_box_algorithm, hit_box_detail)
 
-    # See if we already loaded this texture file, and we can just use a cached version.
-    cache_file_name = f"{file_name}"
-    if cache_file_name in load_texture.texture_cache:  # type: ignore # dynamic attribute on function obj
-        texture = load_texture.texture_cache[cache_file_name]  # type: ignore # dynamic attribute on function obj
-        source_image = texture.image
-    else:
-        # If we should pull from local resources, replace with proper path
-        file_name = resolve_resource_path(file_name)
+    if can_cache:
+        return texture_cache._get_or_load(cache_name, load)
+
+    result = load()
+    texture_cache.put(cache_name, result)
+    return result
 
-        source_image = PIL.Image.open(file_name).convert('RGBA')
-        result = Texture(cache_file_name, source_image,
-                         hit_box_algorithm=hit_box_algorithm,
-                         hit_box_detail=hit_box_detail)
-        load_texture.texture_cache[cache_file_name] = result  # type: ignore # dynamic attribute on function obj
+
+def _create_texture(cache_name: str,
+                    file_name: Union[str, Path],
+                    x: float,
+                    y: float,
+                    width: float,
+                    height: float,
+                    flipped_horizontally: bool,
+                    flipped_vertically: bool,
+                    flipped_diagonally: bool,
+                    hit_box_algorithm: str,
+                    hit_box_detail: float) -> Texture:
+    """Crop and flip the source image for :py:func:`load_texture`"""
+    # See if we already loaded this texture file, and we can just use a cached version.
+    source_image = _load_source_image(file_name)
 
     source_image_width, source_image_height = source_image.size
 
@@ -485,14 +770,14 @@ def load_texture(file_name: Union[str, Path],
     if flipped_vertically:
         image = image.transpose(PIL.Image.FLIP_TOP_BOTTOM)
 
-    result = Texture(cache_name, image,
-                     hit_box_algorithm=hit_box_algorithm,
-                     hit_box_detail=hit_box_detail)
-    load_texture.texture_cache[cache_name] = result  # type: ignore # dynamic attribute on function obj
-    return result
+    return Texture(cache_name, image,
+                   hit_box_algorithm=hit_box_algorithm,
+                   hit_box_detail=hit_box_detail)
 
 
-load_texture.texture_cache = dict()  # type: ignore
+texture_cache = TextureCache()
+# Kept for code still using the old cache dict
+load_texture.texture_cache = texture_cache  # type: ignore # dynamic attribute on function obj
 
 
 def cleanup_texture_cache():
@@ -500,11 +785,194 @@ def cleanup_texture_cache():
     This cleans up the cache of textures. Useful when running unit tests so that
     the next test starts clean.
     """
-    load_texture.texture_cache = dict()
+    texture_cache.clear()
     import gc
     gc.collect()
 
 
+class TexturePreload:
+    """
+    Progress of textures being loaded by :py:func:`preload_textures`.
+
+    The textures are decoded in background threads. Adding them to
+    a texture atlas has to happen on the main thread. This is done with
+    :py:meth:`upload`, a limited number of textures at a time so it
+    can be spread over multiple frames.
+    """
+
+    def __init__(self, futures: List[Future], atlas: Optional["TextureAtlas"] = None,
+                 textures_per_frame: int = 8):
+        self._futures = futures
+        self._atlas = atlas
+        self._textures_per_frame = textures_per_frame
+        # Indices of textures not added to an atlas yet
+        self._not_uploaded = list(range(len(futures)))
+
+        if atlas is not None:
+            pyglet.clock.schedule(self._upload_frame)
+
+    @property
+    def total(self) -> int:
+        """
+        Number of textures to load.
+
+        :type: int
+        """
+        return len(self._futures)
+
+    @property
+    def completed(self) -> int:
+        """
+        Number of textures that are decoded.
+
+        :type: int
+        """
+        return sum(1 for future in self._futures if future.done())
+
+    @property
+    def progress(self) -> float:
+        """
+        Fraction of the textures that are decoded, between 0.0 and 1.0.
+
+        :type: float
+        """
+        if not self._futures:
+            return 1.0
+        return self.completed / self.total
+
+    @property
+    def done(self) -> bool:
+        """
+        True when all textures are decoded.
+
+        :type: bool
+        """
+        return all(future.done() for future in self._futures)
+
+    @property
+    def uploaded(self) -> bool:
+        """
+        True when all textures were added to an atlas with :py:meth:`upload`.
+        Textures that failed to load are skipped.
+
+        :type: bool
+        """
+        return not self._not_uploaded
+
+    def result(self, timeout: Optional[float] = None) -> List["Texture"]:
+        """
+        Wait until all textures are decoded.
+        Exceptions raised while loading a texture are raised here.
+
+        :param float timeout: Maximum seconds to wait
+        :returns: The textures in the same order as they were requested
+        """
+        return [future.result(timeout) for future in self._futures]
+
+    def upload(self, atlas: Optional["TextureAtlas"] = None, max_textures: Optional[int] = None) -> bool:
+        """
+        Add decoded textures to a texture atlas.
+        This must be called from the main thread.
+        Textures that failed to load or were cancelled are skipped.
+        Their errors are raised by :py:meth:`result`.
+
+        :param TextureAtlas atlas: The atlas. Defaults to the default atlas of the window.
+        :param int max_textures: Maximum number of textures to add in this call.
+        :returns: True when all textures are in the atlas
+        """
+        if atlas is None:
+            from arcade import get_window
+            atlas = get_window().ctx.default_atlas
+
+        uploaded = 0
+        not_uploaded = []
+        for index in self._not_uploaded:
+            future = self._futures[index]
+            if not future.done() or (max_textures is not None and uploaded >= max_textures):
+                not_uploaded.append(index)
+                continue
+
+            if future.cancelled() or future.exception() is not None:
+                continue
+
+            atlas.add(future.result())
+            uploaded += 1
+
+        self._not_uploaded = not_uploaded
+        return self.uploaded
+
+    def cancel(self) -> None:
+        """
+        Stop loading the textures that haven't started loading yet.
+        """
+        for future in self._futures:
+            future.cancel()
+        pyglet.clock.unschedule(self._upload_frame)
+
+    def _upload_frame(self, delta_time: float):
+        """Upload some of the textures every frame"""
+        if self.upload(self._atlas, self._textures_per_frame):
+            pyglet.clock.unschedule(self._upload_frame)
+
+
+def _preload_texture(spec: Union[str, Path, Dict]) -> Texture:
+    """Load a texture and calculate the hit box"""
+    if isinstance(spec, dict):
+        texture = load_texture(**spec)
+    else:
+        texture = load_texture(spec)
+
+    # Calculate the hit box in this thread. It's cached in the texture.
+    if texture._hit_box_algorithm != "None":
+        texture.hit_box_points
+    return texture
+
+
+def preload_textures(
+    specs: Iterable[Union[str, Path, Dict]],
+    max_workers: Optional[int] = None,
+    atlas: Optional["TextureAtlas"] = None,
+    textures_per_frame: int = 8,
+) -> TexturePreload:
+    """
+    Load textures in background threads. Decoding the images, cropping,
+    flipping and calculating the hit boxes is done in a thread pool.
+    The loaded textures are added to the texture cache, so later calls to
+    :py:func:`load_texture` with the same arguments return them right away.
+
+    Every spec is either a file name or a dict with the arguments for
+    :py:func:`load_texture`::
+
+        loading = arcade.preload_textures(
+            [
+                ":resources:images/enemies/bee.png",
+                {"file_name": ":resources:images/enemies/bee.png", "flipped_horizontally": True},
+                {"file_name": "tiles.png", "x": 0, "y": 0, "width": 64, "height": 64},
+            ],
+            atlas=self.scene_sprites.atlas,
+        )
+
+        def on_update(self, delta_time):
+            if loading.uploaded:
+                self.start_level()
+
+    When an atlas is given the loaded textures are added to it on the main
+    thread, ``textures_per_frame`` textures every frame. Otherwise use
+    :py:meth:`TexturePreload.upload`.
+
+    :param specs: The textures to load
+    :param int max_workers: Number of threads. Defaults to the ThreadPoolExecutor default.
+    :param TextureAtlas atlas: Atlas to add the loaded textures to
+    :param int textures_per_frame: How many textures are added to the atlas every frame
+    :rtype: TexturePreload
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="arcade-texture")
+    futures = [executor.submit(_preload_texture, spec) for spec in specs]
+    # The threads exit when all textures are loaded
+    executor.shutdown(wait=False)
+    return TexturePreload(futures, atlas, textures_per_frame)
+
+
 def load_texture_pair(filename, hit_box_algorithm: str = "Simple"):
     """
     Load a texture pair, with the second being a mirror image of the first.
@@ -539,17 +1007,22 @@ def load_spritesheet(file_name: Union[str, Path],
 
     texture_list = []
 
+    source_image = _load_source_image(file_name)
+
     # If we should pull from local resources, replace with proper path
     file_name = resolve_resource_path(file_name)
 
-    source_image = PIL.Image.open(file_name).convert('RGBA')
     for sprite_no in range(count):
         row = sprite_no // columns
         column = sprite_no % columns
         start_x = (sprite_width + margin) * column
         start_y = (sprite_height + margin) * row
-        image = source_image.crop((start_x, start_y, start_x + sprite_width, start_y + sprite_height))
-        texture = Texture(f"{file_name}-{sprite_no}", image)
+        cache_name = f"{file_name}-{sprite_no}-{sprite_width}-{sprite_height}-{columns}-{margin}"
+        texture = texture_cache.get(cache_name)
+        if texture is None:
+            image = source_image.crop((start_x, start_y, start_x + sprite_width, start_y + sprite_height))
+            texture = Texture(f"{file_name}-{sprite_no}", image)
+            texture_cache.put(cache_name, texture)
         texture_list.append(texture)
 
     return texture_list
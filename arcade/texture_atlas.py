@@ -5,7 +5,9 @@
 it's still unclear what features we need supported in arcade
 so need to prototype something to get started.
 
-We're still building on pyglet's allocator.
+The space in the atlas is managed by an allocator. The default
+:py:class:`SkylineAllocator` reuses the space of removed textures.
+:py:class:`StripAllocator` wraps pyglet's strip allocator.
 
 Pyglet atlases are located here:
 https://github.com/einarf/pyglet/blob/master/pyglet/image/atlas.py
@@ -14,7 +16,8 @@
 import math
 import time
 import logging
-from typing import Dict, List, Tuple, Sequence, TYPE_CHECKING
+import weakref
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Sequence, Type, TYPE_CHECKING
 from array import array
 
 import PIL
@@ -25,6 +28,7 @@
 from PIL import Image
 
 import arcade
+from arcade import perf
 
 from pyglet.image.atlas import (
     Allocator,
@@ -42,6 +46,13 @@
 RESIZE_STEP = 128
 LOG = logging.getLogger(__name__)
 
+# Number of live atlases containing each texture name.
+# Used to check if a texture is still in use without asking every atlas.
+_texture_atlas_counts: Dict[str, int] = {}
+
+# A free or used rectangle in the atlas: x, y, width, height
+Rect = Tuple[int, int, int, int]
+
 # TODO:
 # Detect texture changes
 # Resize?
@@ -110,14 +121,268 @@ def verify_image_size(self):
                 "It's not possible to fit this into the old allocated area in the atlas. "
             ))
 
+
+class AtlasAllocator:
+    """
+    Base class for the allocators managing the space in a texture atlas.
+
+    An allocator hands out rectangles in an area of a fixed size.
+    Positions are in pixels with ``0, 0`` being the first pixel
+    in the atlas texture. Custom allocators can be passed to
+    :py:class:`TextureAtlas` by subclassing this class.
+
+    :param int width: The width of the area
+    :param int height: The height of the area
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+    def alloc(self, width: int, height: int) -> Tuple[int, int]:
+        """
+        Allocate a rectangle.
+
+        :param int width: The width of the rectangle
+        :param int height: The height of the rectangle
+        :return: The x, y position of the rectangle
+        :raises AllocatorException: If there is no room for the rectangle
+        """
+        raise NotImplementedError()
+
+    def free(self, x: int, y: int, width: int, height: int) -> None:
+        """
+        Return an allocated rectangle to the allocator.
+        Allocators not able to reuse space can ignore this.
+
+        :param int x: The x position of the rectangle
+        :param int y: The y position of the rectangle
+        :param int width: The width of the rectangle
+        :param int height: The height of the rectangle
+        """
+        pass
+
+    def relocate(self, x: int, y: int, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """
+        Try to move an allocated rectangle closer to the origin.
+        Used by :py:meth:`TextureAtlas.defragment`.
+
+        :param int x: The x position of the rectangle
+        :param int y: The y position of the rectangle
+        :param int width: The width of the rectangle
+        :param int height: The height of the rectangle
+        :return: The new x, y position or ``None`` if the rectangle can't be moved
+        """
+        return None
+
+
+class StripAllocator(AtlasAllocator):
+    """
+    Wraps pyglet's allocator placing rectangles in horizontal strips.
+
+    This allocator is fast, but can't reuse the space of removed
+    textures. The atlas must be rebuilt to reclaim it.
+    """
+
+    def __init__(self, width: int, height: int):
+        super().__init__(width, height)
+        self._allocator = Allocator(width, height)
+
+    def alloc(self, width: int, height: int) -> Tuple[int, int]:
+        return self._allocator.alloc(width, height)
+
+
+class SkylineAllocator(AtlasAllocator):
+    """
+    Allocator placing rectangles at the lowest possible position
+    on top of the already allocated rectangles (bottom-left skyline).
+
+    Freed rectangles are kept in a list of free rectangles and merged
+    with their neighbours like in a MaxRects packer. New rectangles are
+    placed in the free rectangle leaving the shortest side over before
+    falling back to the skyline, so the space of removed textures is reused.
+    """
+
+    def __init__(self, width: int, height: int):
+        super().__init__(width, height)
+        # Segments of the skyline as [x, y, width] sorted by x
+        self._skyline: List[List[int]] = [[0, 0, width]]
+        self._free_rects: List[Rect] = []
+
+    @property
+    def free_rects(self) -> List[Rect]:
+        """
+        The free rectangles left by freed rectangles as a list of
+        (x, y, width, height) tuples. The rectangles can overlap.
+
+        :rtype: List[Tuple[int, int, int, int]]
+        """
+        return list(self._free_rects)
+
+    def alloc(self, width: int, height: int) -> Tuple[int, int]:
+        best = None
+        best_score = None
+        for free_x, free_y, free_width, free_height in self._free_rects:
+            if free_width < width or free_height < height:
+                continue
+            left_x, left_y = free_width - width, free_height - height
+            # Prefer the lowest position when the fit is equal
+            score = min(left_x, left_y), max(left_x, left_y), free_y, free_x
+            if best_score is None or score < best_score:
+                best, best_score = (free_x, free_y), score
+
+        if best is not None:
+            self._place_free((best[0], best[1], width, height))
+            return best
+
+        position = self._find_skyline(width, height)
+        if position is None:
+            raise AllocatorException(f"No room for a rectangle of size {width}x{height}")
+
+        self._place_skyline((position[0], position[1], width, height))
+        return position
+
+    def free(self, x: int, y: int, width: int, height: int) -> None:
+        rects = [(x, y, width, height)]
+        right, top = x + width, y + height
+        for free_x, free_y, free_width, free_height in self._free_rects:
+            free_right, free_top = free_x + free_width, free_y + free_height
+            if free_x > right or x > free_right or free_y > top or y > free_top:
+                continue
+            # Free rectangles touching the freed one can be extended through it
+            start, end = max(x, free_x), min(right, free_right)
+            if end > start:
+                bottom = min(y, free_y)
+                rects.append((start, bottom, end - start, max(top, free_top) - bottom))
+            start, end = max(y, free_y), min(top, free_top)
+            if end > start:
+                left = min(x, free_x)
+                rects.append((left, start, max(right, free_right) - left, end - start))
+        self._add_free_rects(self._free_rects, rects)
+
+    def relocate(self, x: int, y: int, width: int, height: int) -> Optional[Tuple[int, int]]:
+        best_y, best_x = y, x
+        for free_x, free_y, free_width, free_height in self._free_rects:
+            if free_y > best_y or free_width < width or free_height < height:
+                continue
+            if free_y < best_y or free_x < best_x:
+                best_y, best_x = free_y, free_x
+        best = best_y, best_x
+
+        position = self._find_skyline(width, height)
+        if position is not None and (position[1], position[0]) < best:
+            self._place_skyline((position[0], position[1], width, height))
+        elif best != (y, x):
+            position = best[1], best[0]
+            self._place_free((position[0], position[1], width, height))
+        else:
+            return None
+
+        self.free(x, y, width, height)
+        return position
+
+    def _find_skyline(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """Find the lowest position on the skyline a rectangle fits"""
+        best = None
+        skyline = self._skyline
+        for i, (x, _, _) in enumerate(skyline):
+            if x + width > self.width:
+                break
+            # The rectangle rests on the highest segment below it
+            y = 0
+            for segment_x, segment_y, _ in skyline[i:]:
+                if segment_x >= x + width:
+                    break
+                y = max(y, segment_y)
+            if y + height <= self.height and (best is None or (y, x) < (best[1], best[0])):
+                best = x, y
+        return best
+
+    def _place_skyline(self, rect: Rect) -> None:
+        """Raise the skyline under a rectangle to its top"""
+        x, y, width, height = rect
+        right = x + width
+        skyline = []
+        for segment in self._skyline:
+            segment_x, segment_y, segment_width = segment
+            segment_right = segment_x + segment_width
+            if segment_right <= x or segment_x >= right:
+                skyline.append(segment)
+                continue
+            # Keep the parts of the segment sticking out on each side
+            if segment_x < x:
+                skyline.append([segment_x, segment_y, x - segment_x])
+            if not skyline or skyline[-1][0] + skyline[-1][2] <= x:
+                skyline.append([x, y + height, width])
+            if segment_right > right:
+                skyline.append([right, segment_y, segment_right - right])
+
+        # Merge neighbouring segments with the same height
+        self._skyline = [skyline[0]]
+        for segment in skyline[1:]:
+            if segment[1] == self._skyline[-1][1]:
+                self._skyline[-1][2] += segment[2]
+            else:
+                self._skyline.append(segment)
+
+    def _place_free(self, rect: Rect) -> None:
+        """Remove a rectangle from the free rectangles"""
+        x, y, width, height = rect
+        right, top = x + width, y + height
+        kept = []
+        rects = []
+        for free_rect in self._free_rects:
+            free_x, free_y, free_width, free_height = free_rect
+            free_right, free_top = free_x + free_width, free_y + free_height
+            if x >= free_right or right <= free_x or y >= free_top or top <= free_y:
+                kept.append(free_rect)
+                continue
+            # Split into the parts on each side of the rectangle
+            if x > free_x:
+                rects.append((free_x, free_y, x - free_x, free_height))
+            if right < free_right:
+                rects.append((right, free_y, free_right - right, free_height))
+            if y > free_y:
+                rects.append((free_x, free_y, free_width, y - free_y))
+            if top < free_top:
+                rects.append((free_x, top, free_width, free_top - top))
+        self._add_free_rects(kept, rects)
+
+    def _add_free_rects(self, free_rects: List[Rect], new_rects: List[Rect]) -> None:
+        """
+        Add new free rectangles to a list of free rectangles not containing
+        each other. Rectangles contained in other rectangles are dropped.
+        """
+        # Larger rectangles first so contained ones are dropped right away
+        for x, y, width, height in sorted(set(new_rects), key=lambda r: r[2] * r[3], reverse=True):
+            right, top = x + width, y + height
+            for other_x, other_y, other_width, other_height in free_rects:
+                if (
+                    other_x <= x
+                    and other_y <= y
+                    and right <= other_x + other_width
+                    and top <= other_y + other_height
+                ):
+                    break
+            else:
+                free_rects = [
+                    rect for rect in free_rects
+                    if not (x <= rect[0] and y <= rect[1] and rect[0] + rect[2] <= right and rect[1] + rect[3] <= top)
+                ]
+                free_rects.append((x, y, width, height))
+        self._free_rects = free_rects
+
+
 class TextureAtlas:
     """
     A texture atlas is a large texture containing several textures
     so OpenGL can easily batch draw thousands or hundreds of thousands
     of sprites on one draw operation.
 
-    This is a fairly simple atlas that stores horizontal strips were
-    the height of the strip is the texture/image with the larges height.
+    The space in the atlas is managed by an allocator. The default
+    :py:class:`SkylineAllocator` reuses the space of removed textures
+    and :py:meth:`defragment` can compact the atlas a few textures at a
+    time, for example once per frame.
 
     Adding a texture to this atlas generates a texture id.
     This id is used the sprite list vertex data to reference what
@@ -133,6 +398,7 @@ def __init__(
         border: int = 1,
         textures: Sequence["Texture"] = None,
         auto_resize: bool = True,
+        allocator: Type[AtlasAllocator] = SkylineAllocator,
         ctx: "ArcadeContext" = None,
     ):
         """
@@ -145,19 +411,30 @@ def __init__(
         :param int border: Border in pixels around every texture in the atlas
         :param Sequence[arcade.Texture] textures: The texture for this atlas
         :param bool auto_resize: Automatically resize the atlas when full
+        :param Type[AtlasAllocator] allocator: The allocator class managing the space in the atlas
         :param Context ctx: The context for this atlas (will use window context if left empty)
         """
         self._ctx = ctx or arcade.get_window().ctx
         self._max_size = self._ctx.limits.MAX_VIEWPORT_DIMS
         self._size: Tuple[int, int] = size
         self._border: int = border
-        self._allocator = Allocator(*self._size)
+        self._allocator_class = allocator
+        self._allocator = allocator(*self._size)
         self._auto_resize = auto_resize
         self._check_size(self._size)
 
         self._texture = self._ctx.texture(size, components=4)
         # Creating an fbo makes us able to clear the texture
         self._fbo = self._ctx.framebuffer(color_attachments=[self._texture])
+        # Scratch framebuffer textures are copied through when defragmenting
+        self._scratch_fbo: Optional[Framebuffer] = None
+        # Set when textures are removed and the atlas might benefit from defragmenting
+        self._fragmented = False
+        # Defragment passes over the texture names sorted by distance from the origin.
+        # A pass is spread over several calls. It's repeated while it makes progress.
+        self._defrag_order: List[str] = []
+        self._defrag_cursor = 0
+        self._defrag_progress = False
 
         # A dictionary of all the allocated regions
         # The key is the cache name for a texture
@@ -165,6 +442,9 @@ def __init__(
 
         # A set of textures this atlas contains for fast lookups + set operations
         self._textures: List["Texture"] = []
+        # Names counted in _texture_atlas_counts. Released when the atlas is collected.
+        self._counted_names: Set[str] = set()
+        weakref.finalize(self, _uncount_textures, self._counted_names)
 
         # Texture containing texture coordinates
         self._uv_texture = self._ctx.texture(
@@ -178,6 +458,7 @@ def __init__(
         self._uv_slots: Dict[str, int] = dict()
         self._uv_data_changed = True
 
+
         # Add all the textures
         for tex in textures or []:
             self.add(tex)
@@ -250,6 +531,15 @@ def auto_resize(self) -> bool:
     def auto_resize(self, value: bool):
         self._auto_resize = value
 
+    @property
+    def fragmented(self) -> bool:
+        """
+        True while :py:meth:`defragment` might still be able to move textures.
+
+        :rtype: bool
+        """
+        return self._fragmented
+
     @property
     def border(self) -> int:
         """
@@ -296,21 +586,23 @@ def add(self, texture: "Texture") -> Tuple[int, AtlasRegion]:
 
         LOG.info("Attempting to add texture: %s", texture.name)
 
-        try:
-            x, y, slot, region = self.allocate(texture)
-        except AllocatorException:
-            LOG.info("[%s] No room for %s size %s", id(self), texture.name, texture.image.size)
-            if self._auto_resize:
-                width = min(self.width * 2, self.max_width)
-                height = min(self.height * 2, self.max_height)
-                if self._size == (width, height):
+        # Only new textures are profiled. Looking up existing ones is too cheap to time.
+        with perf.scope("atlas.add"):
+            try:
+                x, y, slot, region = self.allocate(texture)
+            except AllocatorException:
+                LOG.info("[%s] No room for %s size %s", id(self), texture.name, texture.image.size)
+                if self._auto_resize:
+                    width = min(self.width * 2, self.max_width)
+                    height = min(self.height * 2, self.max_height)
+                    if self._size == (width, height):
+                        raise
+                    self.resize((width, height))
+                    return self.add(texture)
+                else:
                     raise
-                self.resize((width, height))
-                return self.add(texture)
-            else:
-                raise
 
-        self.write_texture(texture, x, y)
+            self.write_texture(texture, x, y)
         return slot, region
 
     def allocate(self, texture: "Texture") -> Tuple[int, int, int, AtlasRegion]:
@@ -344,6 +636,9 @@ def allocate(self, texture: "Texture") -> Tuple[int, int, int, AtlasRegion]:
             texture.image.height,
         )
         self._atlas_regions[texture.name] = region
+        if texture.name not in self._counted_names:
+            self._counted_names.add(texture.name)
+            _count_textures([texture.name])
         # Get the existing slot for this texture or grab a new one.
         # Existing slots for textures will only happen when re-bulding
         # the atlas since we want to keep the same slots to avoid
@@ -391,18 +686,39 @@ def remove(self, texture: "Texture") -> None:
         """
         Remove a texture from the atlas.
 
-        This doesn't remove the image from the underlying texture.
-        To physically remove the data you need to ``rebuild()``.
+        The space is returned to the allocator and cleared so
+        it can be reused by new textures if the allocator supports it.
 
         :param Texture texture: The texture to remove
         """
         self._textures.remove(texture)
-        del self._atlas_regions[texture.name]
+        rect = self._region_rect(self._atlas_regions.pop(texture.name))
+        self._counted_names.discard(texture.name)
+        _uncount_textures([texture.name])
+        self._allocator.free(*rect)
+        self._clear_rect(rect)
+        self._fragmented = True
+        # Textures already checked in this pass might fit in the new space
+        self._defrag_progress = True
         # Reclaim the uv slot
         slot = self._uv_slots[texture.name]
         del self._uv_slots[texture.name]
         self._uv_slots_free.appendleft(slot)
 
+    def _region_rect(self, region: AtlasRegion) -> Rect:
+        """The allocated space of a region including the border"""
+        return (
+            region.x - self._border,
+            region.y - self._border,
+            region.width + self._border * 2,
+            region.height + self._border * 2,
+        )
+
+    def _clear_rect(self, rect: Rect) -> None:
+        """Clear an area in the atlas texture"""
+        # Stale pixels would otherwise show up in the border of textures reusing the space
+        self._texture.write(bytes(rect[2] * rect[3] * 4), 0, viewport=rect)
+
     def update_texture_image(self, texture: "Texture"):
         """
         Updates the internal image of a texture in the atlas texture.
@@ -467,6 +783,7 @@ def has_texture(self, texture: "Texture") -> bool:
     #     self._fbo = self._ctx.framebuffer(color_attachments=[self._texture])
     #     self.rebuild()
 
+    @perf.timed("atlas.resize")
     def resize(self, size: Tuple[int, int]) -> None:
         """
         Resize the atlas on the gpu.
@@ -509,21 +826,132 @@ def resize(self, size: Tuple[int, int]) -> None:
         self._uv_texture.write(self._uv_data, 0)
         self._uv_data_changed = False
 
-        # Bind textures for atlas copy shader
-        texture_old.use(0)
-        self._texture.use(1)
-        uv_texture_old.use(2)
-        self._uv_texture.use(3)
-        self._ctx.atlas_resize_program["projection"] = arcade.create_orthogonal_projection(0, self.width, self.height, 0)
+        self._copy_regions(texture_old, uv_texture_old, self._fbo, self._uv_texture, TEXCOORD_BUFFER_SIZE)
+        LOG.info("[%s] Atlas resize took %s seconds", id(self), time.perf_counter() - resize_start)
 
-        with self._fbo.activate() as fbo:
+    def _copy_regions(
+        self,
+        source: "GLTexture",
+        source_uv: "GLTexture",
+        target: Framebuffer,
+        target_uv: "GLTexture",
+        count: int,
+    ) -> None:
+        """
+        Copy regions from a texture into a framebuffer on the gpu
+        using the atlas resize program.
+
+        :param GLTexture source: The texture to copy from
+        :param GLTexture source_uv: Texture coordinates of the regions in the source
+        :param Framebuffer target: The framebuffer to copy into
+        :param GLTexture target_uv: Texture coordinates of the regions in the target
+        :param int count: The number of regions to copy
+        """
+        source.use(0)
+        target.color_attachments[0].use(1)
+        source_uv.use(2)
+        target_uv.use(3)
+        width, height = target.size
+        self._ctx.atlas_resize_program["projection"] = arcade.create_orthogonal_projection(0, width, height, 0)
+
+        with target.activate():
             self._ctx.disable(self._ctx.BLEND)
             self._ctx.atlas_geometry.render(
                 self._ctx.atlas_resize_program,
                 mode=self._ctx.POINTS,
-                vertices=TEXCOORD_BUFFER_SIZE,
+                vertices=count,
             )
-        LOG.info("[%s] Atlas resize took %s seconds", id(self), time.perf_counter() - resize_start)
+
+    @perf.timed("atlas.defragment")
+    def defragment(self, budget: int = 8, max_regions: int = 32) -> int:
+        """
+        Move textures closer to the origin of the atlas to merge the
+        free space left by removed textures.
+
+        At most ``budget`` textures are moved and ``max_regions`` textures
+        are looked at per call, so this can be called every frame without
+        long stalls. Each call continues where the previous one stopped.
+        The pixels are copied on the gpu and the texture ids stay the same,
+        so sprite lists using the atlas don't need to be rebuilt.
+        The call is cheap when the atlas has no removed textures left
+        to fill. This does nothing with allocators not able to move
+        textures like the :py:class:`StripAllocator`.
+
+        :param int budget: The maximum number of textures to move
+        :param int max_regions: The maximum number of textures to look at
+        :return: The number of textures moved. Check :py:attr:`fragmented`
+                 to see if there is anything left to do.
+        """
+        if not self._fragmented:
+            return 0
+
+        if self._defrag_cursor >= len(self._defrag_order):
+            # Start a new pass with the textures furthest from the origin
+            regions = sorted(self._atlas_regions.values(), key=lambda r: (r.y + r.height, r.x), reverse=True)
+            self._defrag_order = [region.texture.name for region in regions]
+            self._defrag_cursor = 0
+            self._defrag_progress = False
+
+        border = self._border
+        order = self._defrag_order
+        moves: List[Tuple[AtlasRegion, Tuple[int, int]]] = []
+        examined = 0
+        while self._defrag_cursor < len(order) and examined < max_regions and len(moves) < budget:
+            region = self._atlas_regions.get(order[self._defrag_cursor])
+            self._defrag_cursor += 1
+            # Removed after the pass started
+            if region is None:
+                continue
+            examined += 1
+            position = self._allocator.relocate(*self._region_rect(region))
+            if position is not None:
+                moves.append((region, position))
+
+        if not moves:
+            # A whole pass without moving anything. The atlas is defragmented.
+            if self._defrag_cursor >= len(order) and not self._defrag_progress:
+                self._fragmented = False
+                self._defrag_order = []
+                # Release the scratch texture until textures are removed again
+                self._scratch_fbo = None
+            return 0
+        self._defrag_progress = True
+
+        new_regions = [
+            AtlasRegion(self, region.texture, x + border, y + border, region.width, region.height)
+            for region, (x, y) in moves
+        ]
+        uv_old = self._ctx.texture(
+            (len(moves), 1), components=4, dtype="f4",
+            data=array("f", (value for region, _ in moves for value in region.texture_coordinates)),
+        )
+        uv_new = self._ctx.texture(
+            (len(moves), 1), components=4, dtype="f4",
+            data=array("f", (value for region in new_regions for value in region.texture_coordinates)),
+        )
+
+        # Reading and writing the same texture is undefined in OpenGL 3.3
+        # and the new location can overlap the old one. The regions are
+        # copied to their new location in a scratch texture first.
+        if self._scratch_fbo is None or self._scratch_fbo.size != self._size:
+            self._scratch_fbo = self._ctx.framebuffer(
+                color_attachments=[self._ctx.texture(self._size, components=4)]
+            )
+        self._copy_regions(self._texture, uv_old, self._scratch_fbo, uv_new, len(moves))
+        # The allocator already moved the space. Only the old pixels are left.
+        for region, _ in moves:
+            self._clear_rect(self._region_rect(region))
+        self._copy_regions(self._scratch_fbo.color_attachments[0], uv_new, self._fbo, uv_new, len(moves))
+
+        for region in new_regions:
+            name = region.texture.name
+            self._atlas_regions[name] = region
+            slot = self._uv_slots[name]
+            self._uv_data[slot * 4:slot * 4 + 4] = array("f", region.texture_coordinates)
+        self._uv_data_changed = True
+
+        LOG.debug("[%s] Defragment moved %s textures", id(self), len(moves))
+        return len(moves)
 
     def rebuild(self) -> None:
         """Rebuild the underlying atlas texture.
@@ -555,7 +983,12 @@ def clear(self, texture_ids: bool = True, texture = True) -> None:
             self._fbo.clear()
         self._textures = []
         self._atlas_regions = dict()
-        self._allocator = Allocator(*self._size)
+        _uncount_textures(self._counted_names)
+        self._counted_names.clear()
+        self._allocator = self._allocator_class(*self._size)
+        self._fragmented = False
+        self._defrag_order = []
+        self._defrag_cursor = 0
         if texture_ids:
             self._uv_slots_free = deque(i for i in range(TEXCOORD_BUFFER_SIZE))
             self._uv_slots = dict()
@@ -622,24 +1055,37 @@ def render_into(
         self._ctx.projection_2d = proj_prev
 
     @classmethod
-    def create_from_texture_sequence(cls, textures: Sequence["Texture"], border: int = 1) -> "TextureAtlas":
+    def create_from_texture_sequence(
+        cls,
+        textures: Sequence["Texture"],
+        border: int = 1,
+        allocator: Type[AtlasAllocator] = SkylineAllocator,
+    ) -> "TextureAtlas":
         """
         Create a texture atlas of a reasonable size from a sequence of textures.
 
         :param Sequence[Texture] textures: A sequence of textures (list, set, tuple, generator etc.)
         :param int border: The border for the atlas in pixels (space between each texture)
+        :param Type[AtlasAllocator] allocator: The allocator class managing the space in the atlas
         """
         textures = sorted(set(textures), key=lambda x: x.image.size[1])
-        size = TextureAtlas.calculate_minimum_size(textures)
-        return TextureAtlas(size, textures=textures, border=border)
+        size = TextureAtlas.calculate_minimum_size(textures, allocator=allocator)
+        return TextureAtlas(size, textures=textures, border=border, allocator=allocator)
 
     @classmethod
-    def calculate_minimum_size(self, textures: Sequence["Texture"], border: int = 1):
+    def calculate_minimum_size(
+        self,
+        textures: Sequence["Texture"],
+        border: int = 1,
+        allocator: Type[AtlasAllocator] = SkylineAllocator,
+    ):
         """
         Calculate the minimum atlas size needed to store the
         the provided sequence of textures
 
         :param Sequence[Texture] textures: Sequence of textures
+        :param int border: The border around every texture in pixels
+        :param Type[AtlasAllocator] allocator: The allocator class used to pack the textures
         :return: An estimated minimum size as a (width, height) tuple
         """
         # Try to guess some sane minimum size to reduce the brute force iterations
@@ -652,10 +1098,10 @@ def calculate_minimum_size(self, textures: Sequence["Texture"], border: int = 1)
         # For now we just brute force a solution by gradually
         # increasing the atlas size using the allocator as a guide.
         for size in range(start_size, 16385, RESIZE_STEP):
-            allocator = Allocator(size, size)
+            packer = allocator(size, size)
             try:
                 for texture in textures:
-                    allocator.alloc(
+                    packer.alloc(
                         texture.image.width + border * 2,
                         texture.image.height + border * 2,
                     )
@@ -694,3 +1140,28 @@ def _check_size(self, size: Tuple[int, int]) -> None:
                 "Attempting to create or resize an atlas to "
                 f"{size} past its maximum size of {self._max_size}"
             )
+
+
+def is_texture_in_atlas(texture: "Texture") -> bool:
+    """
+    Check if a texture is in any of the existing texture atlases.
+
+    :param Texture texture: The texture to check
+    """
+    return texture.name in _texture_atlas_counts
+
+
+def _count_textures(names: Iterable[str]) -> None:
+    """Count textures added to an atlas"""
+    for name in names:
+        _texture_atlas_counts[name] = _texture_atlas_counts.get(name, 0) + 1
+
+
+def _uncount_textures(names: Iterable[str]) -> None:
+    """Stop counting textures removed from an atlas"""
+    for name in names:
+        count = _texture_atlas_counts.get(name, 0) - 1
+        if count > 0:
+            _texture_atlas_counts[name] = count
+        else:
+            _texture_atlas_counts.pop(name, None)
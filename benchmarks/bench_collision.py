@@ -0,0 +1,61 @@
+"""
+Spatial hash and collision benchmarks
+"""
+import random
+
+import arcade
+
+SPRITE_COUNT = 5000
+CHECK_COUNT = 500
+WORLD_SIZE = 4000
+
+
+def make_sprite_list(count, use_spatial_hash):
+    sprite_list = arcade.SpriteList(use_spatial_hash=use_spatial_hash)
+    for _ in range(count):
+        sprite = arcade.SpriteSolidColor(32, 32, arcade.color.WHITE)
+        sprite.position = random.randrange(WORLD_SIZE), random.randrange(WORLD_SIZE)
+        sprite_list.append(sprite)
+    return sprite_list
+
+
+class SpatialHashSuite:
+    """Keeping the spatial hash up to date"""
+
+    def setup(self):
+        random.seed(0)
+        self.sprite_list = make_sprite_list(SPRITE_COUNT, True)
+        self.sprites = list(self.sprite_list)
+        self.empty_list = arcade.SpriteList(use_spatial_hash=True)
+
+    def time_insert(self):
+        self.empty_list.extend(self.sprites)
+
+    def time_move(self):
+        for sprite in self.sprites:
+            sprite.center_x += 40
+
+    def time_query_point(self):
+        for _ in range(CHECK_COUNT):
+            arcade.get_sprites_at_point((random.randrange(WORLD_SIZE), random.randrange(WORLD_SIZE)), self.sprite_list)
+
+
+class CollisionSuite:
+    """Checking many sprites against a list"""
+
+    def setup(self):
+        random.seed(0)
+        self.walls = make_sprite_list(SPRITE_COUNT, True)
+        self.walls_no_hash = make_sprite_list(SPRITE_COUNT // 10, False)
+        self.players = make_sprite_list(CHECK_COUNT, False)
+
+    def time_check_with_list(self):
+        for player in self.players:
+            arcade.check_for_collision_with_list(player, self.walls)
+
+    def time_check_with_list_no_hash(self):
+        for player in self.players:
+            arcade.check_for_collision_with_list(player, self.walls_no_hash)
+
+    def time_check_between_lists(self):
+        arcade.check_for_collision_between_lists(self.players, self.walls)
@@ -0,0 +1,92 @@
+"""
+Polygon intersection and point in polygon benchmarks
+
+The shapely cases are the implementation the separating axis test replaced
+for convex hit boxes. They are kept as a baseline for small and large
+vertex counts.
+"""
+import math
+
+from shapely.geometry import Point, Polygon
+
+import arcade
+from arcade.geometry import _get_convex_orientation, _has_separating_edge
+
+SMALL_VERTEX_COUNT = 8
+LARGE_VERTEX_COUNT = 32
+CHECK_COUNT = 1000
+
+
+def make_hit_box(vertex_count, center_x, center_y, radius):
+    """Create a regular convex polygon"""
+    return [
+        (
+            center_x + radius * math.cos(math.pi * 2 * i / vertex_count),
+            center_y + radius * math.sin(math.pi * 2 * i / vertex_count),
+        )
+        for i in range(vertex_count)
+    ]
+
+
+def sat_polygons_intersecting(poly_a, poly_b):
+    """The separating axis test for convex polygons, whatever the vertex count"""
+    orientation_a = _get_convex_orientation(poly_a)
+    orientation_b = _get_convex_orientation(poly_b)
+    return not (
+        _has_separating_edge(poly_a, orientation_a, poly_b)
+        or _has_separating_edge(poly_b, orientation_b, poly_a)
+    )
+
+
+def shapely_polygons_intersecting(poly_a, poly_b):
+    """The shapely based implementation"""
+    shapely_polygon_a = Polygon(poly_a)
+    shapely_polygon_b = Polygon(poly_b)
+    return shapely_polygon_a.intersects(shapely_polygon_b) and not shapely_polygon_a.touches(shapely_polygon_b)
+
+
+class GeometrySuite:
+    """Hit box tests with a small and a large number of vertices"""
+
+    def setup(self):
+        self.cases = {}
+        for vertex_count in SMALL_VERTEX_COUNT, LARGE_VERTEX_COUNT:
+            self.cases[vertex_count] = (
+                make_hit_box(vertex_count, 0, 0, 32),
+                make_hit_box(vertex_count, 20, 10, 32),
+                make_hit_box(vertex_count, 100, 0, 32),
+            )
+
+    def _time_intersecting(self, function, vertex_count):
+        poly_a, overlapping, separate = self.cases[vertex_count]
+        for _ in range(CHECK_COUNT):
+            function(poly_a, overlapping)
+            function(poly_a, separate)
+
+    def time_polygons_small(self):
+        self._time_intersecting(arcade.are_polygons_intersecting, SMALL_VERTEX_COUNT)
+
+    def time_polygons_small_sat(self):
+        self._time_intersecting(sat_polygons_intersecting, SMALL_VERTEX_COUNT)
+
+    def time_polygons_small_shapely(self):
+        self._time_intersecting(shapely_polygons_intersecting, SMALL_VERTEX_COUNT)
+
+    def time_polygons_large(self):
+        self._time_intersecting(arcade.are_polygons_intersecting, LARGE_VERTEX_COUNT)
+
+    def time_polygons_large_sat(self):
+        self._time_intersecting(sat_polygons_intersecting, LARGE_VERTEX_COUNT)
+
+    def time_polygons_large_shapely(self):
+        self._time_intersecting(shapely_polygons_intersecting, LARGE_VERTEX_COUNT)
+
+    def time_point_in_polygon(self):
+        for poly_a, _, _ in self.cases.values():
+            for _ in range(CHECK_COUNT):
+                arcade.is_point_in_polygon(5, 5, poly_a)
+
+    def time_point_in_polygon_shapely(self):
+        for poly_a, _, _ in self.cases.values():
+            for _ in range(CHECK_COUNT):
+                Polygon(poly_a).contains(Point(5, 5))
@@ -0,0 +1,37 @@
+"""
+Path finding benchmarks
+"""
+import random
+
+import arcade
+
+GRID_SIZE = 32
+MAP_SIZE = 100
+
+
+class AStarSuite:
+    """Finding paths through a map with random walls"""
+
+    def setup(self):
+        random.seed(0)
+        self.walls = arcade.SpriteList(use_spatial_hash=True)
+        for x in range(MAP_SIZE):
+            for y in range(MAP_SIZE):
+                if random.random() < 0.2 and (x, y) not in ((1, 1), (MAP_SIZE - 2, MAP_SIZE - 2)):
+                    wall = arcade.SpriteSolidColor(GRID_SIZE, GRID_SIZE, arcade.color.WHITE)
+                    wall.position = x * GRID_SIZE + GRID_SIZE / 2, y * GRID_SIZE + GRID_SIZE / 2
+                    self.walls.append(wall)
+        self.player = arcade.SpriteSolidColor(GRID_SIZE // 2, GRID_SIZE // 2, arcade.color.RED)
+        self.end = (MAP_SIZE - 2) * GRID_SIZE + GRID_SIZE / 2, (MAP_SIZE - 2) * GRID_SIZE + GRID_SIZE / 2
+        self.player.position = GRID_SIZE * 1.5, GRID_SIZE * 1.5
+        self.barrier_list = self.make_barrier_list()
+
+    def make_barrier_list(self):
+        return arcade.AStarBarrierList(self.player, self.walls, GRID_SIZE, 0, MAP_SIZE * GRID_SIZE,
+                                       0, MAP_SIZE * GRID_SIZE)
+
+    def time_barrier_list(self):
+        self.make_barrier_list()
+
+    def time_calculate_path(self):
+        arcade.astar_calculate_path(self.player.position, self.end, self.barrier_list, max_iterations=None)
@@ -0,0 +1,54 @@
+"""
+Benchmarks for loading and generating resources
+"""
+from PIL import Image
+
+import arcade
+
+IMAGES = [
+    ":resources:images/animated_characters/robot/robot_idle.png",
+    ":resources:images/enemies/bee.png",
+    ":resources:images/enemies/saw.png",
+    ":resources:images/tiles/grassMid.png",
+]
+
+
+class HitBoxSuite:
+    """Calculating hit boxes from images"""
+
+    def setup(self):
+        self.images = [Image.open(arcade.resources.resolve_resource_path(path)).convert("RGBA") for path in IMAGES]
+
+    def time_simple(self):
+        for image in self.images:
+            arcade.calculate_hit_box_points_simple(image)
+
+    def time_detailed(self):
+        for image in self.images:
+            arcade.calculate_hit_box_points_detailed(image)
+
+
+class TileMapSuite:
+    """Loading a tiled map"""
+
+    def setup(self):
+        arcade.cleanup_texture_cache()
+
+    def teardown(self):
+        arcade.cleanup_texture_cache()
+
+    def time_load(self):
+        arcade.load_tilemap(":resources:tiled_maps/map.json")
+
+
+class TextImageSuite:
+    """Creating images with text"""
+
+    number = 10
+
+    def time_create_text_image(self):
+        arcade.create_text_image("The quick brown fox jumps over the lazy dog", arcade.color.WHITE, font_size=24)
+
+    def time_create_text_image_multiline(self):
+        arcade.create_text_image("The quick brown fox\njumps over\nthe lazy dog", arcade.color.WHITE,
+                                 font_size=24, width=400, align="center")
@@ -0,0 +1,74 @@
+"""
+Sprite list benchmarks
+"""
+import random
+
+import arcade
+
+SPRITE_COUNT = 10000
+
+
+def make_sprites(count):
+    return [arcade.SpriteSolidColor(16, 16, arcade.color.WHITE) for _ in range(count)]
+
+
+class SpriteListSuite:
+    """Changing sprite lists without drawing them"""
+
+    def setup(self):
+        random.seed(0)
+        self.sprites = make_sprites(SPRITE_COUNT)
+        self.sprite_list = arcade.SpriteList(capacity=SPRITE_COUNT)
+        self.sprite_list.extend(self.sprites)
+        self.to_remove = random.sample(self.sprites, SPRITE_COUNT // 2)
+        self.empty_list = arcade.SpriteList()
+
+    def time_append(self):
+        for sprite in self.sprites:
+            self.empty_list.append(sprite)
+
+    def time_extend(self):
+        self.empty_list.extend(self.sprites)
+
+    def time_remove(self):
+        for sprite in self.to_remove:
+            self.sprite_list.remove(sprite)
+        self.sprite_list._normalize_index_buffer()
+
+    def time_remove_all(self):
+        for sprite in self.sprites:
+            self.sprite_list.remove(sprite)
+        self.sprite_list._normalize_index_buffer()
+
+    def time_move_sprites(self):
+        for sprite in self.sprites:
+            sprite.center_x += 1
+
+    def time_move_list(self):
+        self.sprite_list.move(1, 1)
+
+
+class SpriteListDrawSuite:
+    """Uploading and drawing sprite lists"""
+
+    requires_window = True
+    number = 10
+
+    def setup(self):
+        random.seed(0)
+        self.sprite_list = arcade.SpriteList(capacity=SPRITE_COUNT)
+        for sprite in make_sprites(SPRITE_COUNT):
+            sprite.position = random.randrange(800), random.randrange(600)
+            self.sprite_list.append(sprite)
+        self.sprite_list.draw()
+
+    def teardown(self):
+        arcade.get_window().ctx.finish()
+
+    def time_draw_static(self):
+        self.sprite_list.draw()
+
+    def time_draw_moving(self):
+        for sprite in self.sprite_list:
+            sprite.center_x += 1
+        self.sprite_list.draw()
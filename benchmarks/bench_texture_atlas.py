@@ -0,0 +1,77 @@
+"""
+Texture atlas benchmarks
+"""
+import random
+
+from PIL import Image
+
+import arcade
+
+TEXTURE_COUNT = 500
+
+
+class TextureAtlasSuite:
+    """Packing textures of different sizes into an atlas"""
+
+    requires_window = True
+
+    def setup(self):
+        random.seed(0)
+        self.textures = [
+            arcade.Texture(f"bench_{i}", Image.new("RGBA", (random.randint(8, 64), random.randint(8, 64))))
+            for i in range(TEXTURE_COUNT)
+        ]
+
+    def teardown(self):
+        arcade.get_window().ctx.finish()
+
+    def time_add(self):
+        atlas = arcade.TextureAtlas((2048, 2048))
+        for texture in self.textures:
+            atlas.add(texture)
+
+    def time_add_resize(self):
+        atlas = arcade.TextureAtlas((128, 128))
+        for texture in self.textures:
+            atlas.add(texture)
+
+    def time_create_from_texture_sequence(self):
+        arcade.TextureAtlas.create_from_texture_sequence(self.textures)
+
+    def time_add_strip_allocator(self):
+        atlas = arcade.TextureAtlas((2048, 2048), allocator=arcade.StripAllocator)
+        for texture in self.textures:
+            atlas.add(texture)
+
+
+class TextureAtlasChurnSuite:
+    """Removing textures and reusing the space"""
+
+    requires_window = True
+
+    def setup(self):
+        random.seed(0)
+        textures = [
+            arcade.Texture(f"bench_{i}", Image.new("RGBA", (random.randint(8, 64), random.randint(8, 64))))
+            for i in range(TEXTURE_COUNT)
+        ]
+        self.atlas = arcade.TextureAtlas((2048, 2048), auto_resize=False)
+        for texture in textures:
+            self.atlas.add(texture)
+        self.removed = textures[::2]
+        self.kept = textures[1::2]
+
+    def teardown(self):
+        arcade.get_window().ctx.finish()
+
+    def time_remove_add(self):
+        for texture in self.removed:
+            self.atlas.remove(texture)
+        for texture in self.removed:
+            self.atlas.add(texture)
+
+    def time_defragment(self):
+        for texture in self.removed:
+            self.atlas.remove(texture)
+        while self.atlas.fragmented:
+            self.atlas.defragment(16)
@@ -0,0 +1,183 @@
+"""
+Benchmark runner
+
+Runs the benchmark suites in this directory and stores the results as JSON
+so they can be compared between commits.
+
+A suite is a class named ``*Suite`` in a ``bench_*.py`` module. Every method
+starting with ``time_`` is a benchmark. ``setup()`` is called before every
+repeat, so benchmarks can modify the data they work on. ``number`` sets how
+many times a benchmark is called per repeat. Suites with
+``requires_window = True`` need an OpenGL context and run in a hidden window.
+
+Examples::
+
+    # Run everything and store the results
+    python -m benchmarks.run --output results.json
+
+    # Run without a display and compare with earlier results
+    python -m benchmarks.run --headless --compare results.json
+
+    # Only run the sprite list benchmarks
+    python -m benchmarks.run --filter sprite_list
+"""
+import argparse
+import importlib
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+
+BENCHMARK_DIR = Path(__file__).parent
+
+
+def find_benchmarks(name_filter=None):
+    """
+    Find all benchmarks.
+
+    :returns: List of (name, suite class, method name) tuples
+    """
+    benchmarks = []
+    for path in sorted(BENCHMARK_DIR.glob("bench_*.py")):
+        module = importlib.import_module(f"benchmarks.{path.stem}")
+        for suite_name, suite in sorted(vars(module).items()):
+            if not suite_name.endswith("Suite") or not isinstance(suite, type):
+                continue
+            for method_name in sorted(vars(suite)):
+                if not method_name.startswith("time_"):
+                    continue
+                name = f"{path.stem}.{suite_name}.{method_name}"
+                if name_filter and name_filter not in name:
+                    continue
+                benchmarks.append((name, suite, method_name))
+    return benchmarks
+
+
+def run_benchmark(suite_class, method_name, repeat):
+    """
+    Run a single benchmark.
+
+    :returns: Dict with the time per call in seconds
+    """
+    number = getattr(suite_class, "number", 1)
+    times = []
+    for _ in range(repeat):
+        suite = suite_class()
+        if hasattr(suite, "setup"):
+            suite.setup()
+        times.append(timeit.timeit(getattr(suite, method_name), number=number) / number)
+        if hasattr(suite, "teardown"):
+            suite.teardown()
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "max": max(times),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def get_machine_info():
+    """Information about the environment the benchmarks ran in"""
+    import arcade
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BENCHMARK_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        ).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "arcade": arcade.__version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Print how the median times changed compared to earlier results.
+
+    :returns: Names of the benchmarks that got slower than the threshold
+    """
+    regressions = []
+    print()
+    print(f"{'Benchmark':<70} {'Before (ms)':>12} {'After (ms)':>12} {'Ratio':>7}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        ratio = result["median"] / before["median"]
+        marker = ""
+        if ratio > threshold:
+            regressions.append(name)
+            marker = "  SLOWER"
+        elif ratio < 1 / threshold:
+            marker = "  faster"
+        print(f"{name:<70} {before['median'] * 1000:>12.3f} {result['median'] * 1000:>12.3f} {ratio:>7.2f}{marker}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the arcade benchmarks")
+    parser.add_argument("--filter", help="Only run benchmarks containing this string")
+    parser.add_argument("--repeat", type=int, default=5, help="How many times to run every benchmark")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Median time ratio counted as a regression when comparing")
+    parser.add_argument("--headless", action="store_true",
+                        help="Create the OpenGL context without a display (EGL)")
+    parser.add_argument("--no-gl", action="store_true", help="Skip benchmarks that need an OpenGL context")
+    args = parser.parse_args(argv)
+
+    # Must be set before arcade creates any window
+    if args.headless:
+        import pyglet
+        pyglet.options["headless"] = True
+
+    import arcade
+
+    window = None
+    results = {}
+    print(f"{'Benchmark':<70} {'Median (ms)':>12} {'Min (ms)':>12}")
+    for name, suite_class, method_name in find_benchmarks(args.filter):
+        if getattr(suite_class, "requires_window", False):
+            if args.no_gl:
+                continue
+            if window is None:
+                window = arcade.Window(800, 600, "Benchmarks", visible=False)
+
+        result = run_benchmark(suite_class, method_name, args.repeat)
+        results[name] = result
+        print(f"{name:<70} {result['median'] * 1000:>12.3f} {result['min'] * 1000:>12.3f}")
+
+    # Read the baseline first in case it's also the output file
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fd:
+            baseline = json.load(fd)["results"]
+
+    if args.output:
+        with open(args.output, "w") as fd:
+            json.dump({"machine": get_machine_info(), "results": results}, fd, indent=2)
+
+    if baseline is not None and compare(results, baseline, args.threshold):
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
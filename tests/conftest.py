@@ -37,6 +37,16 @@ def prepare_window(window: arcade.Window):
 
 def pytest_addoption(parser):
     parser.addoption("--twm", action="store_true", default=False, help="Disable window geometry tests when using a tiling window manager" )
+    parser.addoption("--runslow", action="store_true", default=False, help="Run tests marked as slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="Slow test, use --runslow to run it")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,39 @@
+import arcade
+
+
+def test_array_emitter(window):
+    texture = arcade.make_soft_circle_texture(8, arcade.color.WHITE)
+    lifetimes = iter([1 / 60 * 2.5, 1 / 60 * 5.5, 1 / 60 * 1.5])
+    emitter = arcade.ArrayEmitter(
+        center_xy=(100, 100),
+        emit_controller=arcade.EmitBurst(3),
+        texture=texture,
+        change_xy_factory=lambda: (1, 0),
+        lifetime_factory=lambda: next(lifetimes),
+        change_angle=10,
+        start_alpha=250,
+        end_alpha=0,
+        capacity=2,
+    )
+
+    emitter.update()
+    assert emitter.get_count() == 3
+    assert emitter._pos_data[0:2].tolist() == [101, 100]
+    assert emitter._angle_data[0] == 10
+    emitter.draw()
+
+    # The shortest lived particle is removed
+    emitter.update()
+    assert emitter.get_count() == 2
+    emitter.update()
+    assert emitter.get_count() == 1
+    assert emitter._pos_data[0:2].tolist() == [103, 100]
+    assert emitter._color_data[3] == int(250 - 250 * 3 / 5.5)
+    assert not emitter.can_reap()
+    emitter.draw()
+
+    for _ in range(3):
+        emitter.update()
+    assert emitter.get_count() == 0
+    assert emitter.can_reap()
+    emitter.draw()
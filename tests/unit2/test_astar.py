@@ -106,3 +106,158 @@ def test_astar(window):
                                        diagonal_movement=True)
 
     assert path == [(160, 160), (128, 160), (96, 192), (64, 160), (64, 128), (64, 96), (64, 64), (32, 32)]
+
+
+def test_astar_search_time_sliced():
+    grid_size = 10
+    moving_sprite = arcade.SpriteSolidColor(8, 8, arcade.color.RED)
+    wall_list = arcade.SpriteList(use_spatial_hash=True)
+    # A wall the path has to go around
+    for y in range(0, 200, 10):
+        wall = arcade.SpriteSolidColor(8, 8, arcade.color.BLACK)
+        wall.position = 300, y
+        wall_list.append(wall)
+
+    barrier_list = arcade.AStarBarrierList(moving_sprite, wall_list, grid_size, 0, 600, 0, 600)
+
+    # The path is too long for the default iteration budget
+    assert arcade.astar_calculate_path((0, 0), (590, 0), barrier_list) is None
+
+    path = arcade.astar_calculate_path((0, 0), (590, 0), barrier_list, max_iterations=None)
+    assert path[0] == (0, 0)
+    assert path[-1] == (590, 0)
+    assert all((x // grid_size, y // grid_size) not in barrier_list.barrier_list for x, y in path)
+
+    # Same result when the search is spread out over several calls
+    search = arcade.AStarSearch((0, 0), (590, 0), barrier_list)
+    steps = 0
+    while not search.run(max_iterations=100):
+        assert search.path is None
+        steps += 1
+    assert steps > 1
+    assert search.finished
+    assert search.path == path
+
+
+def test_astar_barrier_list_add_remove_blocker():
+    grid_size = 10
+    moving_sprite = arcade.SpriteSolidColor(8, 8, arcade.color.RED)
+    wall_list = arcade.SpriteList()
+    wall = arcade.SpriteSolidColor(8, 8, arcade.color.BLACK)
+    wall.position = 50, 50
+    wall_list.append(wall)
+
+    barrier_list = arcade.AStarBarrierList(moving_sprite, wall_list, grid_size, 0, 100, 0, 100)
+    assert barrier_list.barrier_list == [(5, 5)]
+
+    door = arcade.SpriteSolidColor(28, 8, arcade.color.BROWN)
+    door.position = 20, 80
+    barrier_list.add_blocker(door)
+    assert barrier_list.barrier_list == [(1, 8), (2, 8), (3, 8), (5, 5)]
+    assert (2, 8) in barrier_list.grid
+
+    # The door is open again
+    barrier_list.remove_blocker(door)
+    assert barrier_list.barrier_list == [(5, 5)]
+
+    # Overlapping blockers
+    barrier_list.add_blocker(door)
+    crate = arcade.SpriteSolidColor(8, 8, arcade.color.BROWN)
+    crate.position = 30, 80
+    barrier_list.add_blocker(crate)
+    barrier_list.remove_blocker(door)
+    assert barrier_list.barrier_list == [(3, 8), (5, 5)]
+
+
+def test_astar_barrier_list_transformed_blockers():
+    grid_size = 10
+    moving_sprite = arcade.SpriteSolidColor(8, 8, arcade.color.RED)
+    wall_list = arcade.SpriteList()
+    wall = arcade.SpriteSolidColor(14, 4, arcade.color.BLACK)
+    wall.position = 10, 20
+    wall_list.append(wall)
+    wall_list.offset = 60, 10
+    wall_list.scale = 2
+    wall_list.angle = 90
+
+    # The same wall without a list transform
+    world_wall_list = arcade.SpriteList()
+    world_wall = arcade.SpriteSolidColor(8, 28, arcade.color.BLACK)
+    world_wall.position = 20, 30
+    world_wall_list.append(world_wall)
+
+    barrier_list = arcade.AStarBarrierList(moving_sprite, wall_list, grid_size, 0, 100, 0, 100)
+    world_barrier_list = arcade.AStarBarrierList(moving_sprite, world_wall_list, grid_size, 0, 100, 0, 100)
+    assert barrier_list.barrier_list == world_barrier_list.barrier_list
+    assert (2, 3) in barrier_list.grid
+
+
+def test_astar_cluster_graph():
+    grid_size = 10
+    moving_sprite = arcade.SpriteSolidColor(8, 8, arcade.color.RED)
+    wall_list = arcade.SpriteList(use_spatial_hash=True)
+    # Wall the path has to go around
+    for y in range(0, 200, 10):
+        wall = arcade.SpriteSolidColor(8, 8, arcade.color.BLACK)
+        wall.position = 250, y
+        wall_list.append(wall)
+
+    barrier_list = arcade.AStarBarrierList(moving_sprite, wall_list, grid_size, 0, 590, 0, 590)
+    cluster_graph = arcade.AStarClusterGraph(barrier_list, cluster_size=8)
+
+    path = cluster_graph.calculate_path((0, 0), (590, 0))
+    assert path[0] == (0, 0)
+    assert path[-1] == (590, 0)
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert max(abs(x1 - x2), abs(y1 - y2)) == grid_size
+    assert all((x // grid_size, y // grid_size) not in barrier_list.grid for x, y in path)
+
+    # Same cluster
+    assert cluster_graph.calculate_path((0, 0), (20, 20)) == [(0, 0), (10, 10), (20, 20)]
+
+    # Close the gap. Barriers are expensive, but not impossible to cross
+    door = arcade.SpriteSolidColor(8, 400, arcade.color.BROWN)
+    door.position = 250, 400
+    cluster_graph.add_blocker(door)
+    blocked_path = cluster_graph.calculate_path((0, 0), (590, 0))
+    assert any((x // grid_size, y // grid_size) in barrier_list.grid for x, y in blocked_path)
+
+    cluster_graph.remove_blocker(door)
+    assert cluster_graph.calculate_path((0, 0), (590, 0)) == path
+
+
+def test_flow_field():
+    grid_size = 10
+    moving_sprite = arcade.SpriteSolidColor(8, 8, arcade.color.RED)
+    wall_list = arcade.SpriteList()
+    for y in range(0, 60, 10):
+        wall = arcade.SpriteSolidColor(8, 8, arcade.color.BLACK)
+        wall.position = 50, y
+        wall_list.append(wall)
+
+    barrier_list = arcade.AStarBarrierList(moving_sprite, wall_list, grid_size, 0, 100, 0, 100)
+    flow_field = arcade.FlowField(barrier_list, (100, 0), diagonal_movement=False)
+
+    assert flow_field.get_cost((100, 0)) == 0
+    assert flow_field.get_direction((100, 0)) == (0, 0)
+    assert flow_field.get_direction((0, 0)) == (0, 1)
+    assert flow_field.get_direction((500, 0)) is None
+
+    # Following the flow field gives the same cost as A*
+    point = (0, 0)
+    path = [point]
+    while point != (100, 0):
+        point = flow_field.get_next_point(point)
+        path.append(point)
+    astar_path = arcade.astar_calculate_path((0, 0), (100, 0), barrier_list, diagonal_movement=False)
+    assert len(path) == len(astar_path)
+    assert flow_field.get_cost((0, 0)) == len(path) - 1
+
+    # Incremental updates give the same result as a full refresh
+    door = arcade.SpriteSolidColor(8, 48, arcade.color.BROWN)
+    door.position = 50, 80
+    for update in flow_field.add_blocker, flow_field.remove_blocker:
+        update(door)
+        costs = flow_field.costs
+        flow_field.refresh()
+        assert flow_field.costs == costs
@@ -1,6 +1,9 @@
+import json
+from pathlib import Path
 from uuid import uuid4
 
 import PIL
+import pytest
 from PIL.Image import Image
 
 import arcade
@@ -31,3 +34,128 @@ def test_empty_image():
     print(result)
     assert result == []
 
+
+# Representative resources for the quick check: full tiles, several
+# separate regions, odd sizes, thin lasers and detailed outlines
+HIT_BOX_RESOURCES = [
+    "images/tiles/grassCenter.png",
+    "images/tiles/boxCrate.png",
+    "images/backgrounds/abstract_1.jpg",
+    "gui_basic_assets/button_square_blue.png",
+    "images/spritesheets/codepage_437.png",
+    "images/alien/alienBlue_front.png",
+    "images/pinball/pool_cue_ball.png",
+    "images/space_shooter/laserBlue01.png",
+    "images/space_shooter/laserRed01.png",
+    "images/space_shooter/meteorGrey_med1.png",
+    "images/items/coinGold.png",
+    "images/animated_characters/female_person/femalePerson_idle.png",
+]
+
+
+def _load_expected_hit_boxes():
+    with open(Path(__file__).parent.parent / "hit_box_points.json") as fd:
+        return json.load(fd)
+
+
+def _check_resource_hit_boxes(expected, names):
+    resources = Path(arcade.resources.__file__).parent
+    for name in names:
+        points = expected[name]
+        image = PIL.Image.open(resources / name).convert("RGBA")
+        simple = arcade.calculate_hit_box_points_simple(image)
+        assert [list(point) for point in simple] == points["simple"], name
+        detailed = arcade.calculate_hit_box_points_detailed(image)
+        assert [list(point) for point in detailed] == points["detailed"], name
+
+
+def test_resources_unchanged():
+    """
+    Hit boxes for a few representative images in the resources must stay the same.
+    hit_box_points.json was created with the original getpixel based implementation.
+    """
+    _check_resource_hit_boxes(_load_expected_hit_boxes(), HIT_BOX_RESOURCES)
+
+
+@pytest.mark.slow
+def test_all_resources_unchanged():
+    """Hit boxes for every image in the resources must stay the same."""
+    expected = _load_expected_hit_boxes()
+    _check_resource_hit_boxes(expected, expected)
+
+
+def test_not_rgba():
+    with pytest.raises(TypeError):
+        arcade.calculate_hit_box_points_simple(PIL.Image.new("RGB", (10, 10)))
+    with pytest.raises(TypeError):
+        arcade.calculate_hit_box_points_detailed(PIL.Image.new("L", (10, 10)))
+
+
+def test_hit_box_cache(tmp_path, monkeypatch):
+    image = PIL.Image.open(arcade.resources.resolve_resource_path(":resources:images/items/coinGold.png")).convert("RGBA")
+    simple = arcade.calculate_hit_box_points_simple(image)
+    detailed = arcade.calculate_hit_box_points_detailed(image)
+
+    arcade.set_hit_box_cache_dir(tmp_path / "cache")
+    try:
+        assert arcade.get_hit_box_points(image, "Simple") == simple
+        assert arcade.get_hit_box_points(image, "Detailed") == detailed
+        assert len(list((tmp_path / "cache").iterdir())) == 2
+
+        # The cached hit boxes are used without calculating them again
+        def fail(*args):
+            raise AssertionError("Hit box was calculated")
+
+        monkeypatch.setattr(arcade.hitbox, "calculate_hit_box_points_simple", fail)
+        monkeypatch.setattr(arcade.hitbox, "calculate_hit_box_points_detailed", fail)
+        assert arcade.get_hit_box_points(image, "Simple") == simple
+        assert arcade.get_hit_box_points(image, "Detailed") == detailed
+        texture = arcade.Texture(str(uuid4()), image.copy(), hit_box_algorithm="Detailed")
+        assert texture.hit_box_points == detailed
+    finally:
+        arcade.set_hit_box_cache_dir(None)
+
+
+def test_hit_box_cache_full_tile(tmp_path):
+    # Fully opaque images get a hit box with float coordinates
+    image = PIL.Image.new("RGBA", (11, 10), (255, 0, 0, 255))
+    detailed = arcade.calculate_hit_box_points_detailed(image)
+
+    arcade.set_hit_box_cache_dir(tmp_path)
+    try:
+        assert list(arcade.get_hit_box_points(image, "Detailed")) == list(detailed)
+        assert list(arcade.get_hit_box_points(image, "Detailed")) == list(detailed)
+    finally:
+        arcade.set_hit_box_cache_dir(None)
+
+
+@pytest.mark.parametrize("data", [b"", b"d123", b"x12345678", b"i" + bytes(4)])
+def test_hit_box_cache_broken_file(tmp_path, data):
+    image = PIL.Image.open(arcade.resources.resolve_resource_path(":resources:images/items/coinGold.png")).convert("RGBA")
+    detailed = arcade.calculate_hit_box_points_detailed(image)
+
+    arcade.set_hit_box_cache_dir(tmp_path)
+    try:
+        arcade.get_hit_box_points(image, "Detailed")
+        path, = tmp_path.iterdir()
+        path.write_bytes(data)
+        # Broken files are calculated again and replaced
+        assert arcade.get_hit_box_points(image, "Detailed") == detailed
+        assert arcade.get_hit_box_points(image, "Detailed") == detailed
+        assert list(tmp_path.iterdir()) == [path]
+    finally:
+        arcade.set_hit_box_cache_dir(None)
+
+
+def test_prewarm_hit_box_cache(tmp_path):
+    with pytest.raises(ValueError):
+        arcade.prewarm_hit_box_cache(tmp_path)
+
+    arcade.set_hit_box_cache_dir(tmp_path)
+    try:
+        directory = arcade.resources.resolve_resource_path(":resources:images/items")
+        count = arcade.prewarm_hit_box_cache(directory)
+        assert count == len(list(directory.glob("*.png")))
+        assert len(list(tmp_path.glob("*_simple_0.bin"))) == count
+    finally:
+        arcade.set_hit_box_cache_dir(None)
@@ -16,3 +16,29 @@ def test_point_not_in_empty_polygon():
     polygon = []
     result = arcade.is_point_in_polygon(25, 25, polygon)
     assert result is False
+
+
+def test_point_on_polygon_edge():
+    polygon = [
+        (0, 0),
+        (50, 0),
+        (50, 50),
+        (0, 50),
+    ]
+    assert arcade.is_point_in_polygon(0, 25, polygon) is False
+    assert arcade.is_point_in_polygon(50, 50, polygon) is False
+    assert arcade.is_point_in_polygon(49.9, 49.9, polygon) is True
+
+
+def test_point_in_concave_polygon():
+    # A square with a notch cut into the top
+    polygon = [
+        (0, 0),
+        (50, 0),
+        (50, 50),
+        (25, 25),
+        (0, 50),
+    ]
+    assert arcade.is_point_in_polygon(25, 10, polygon) is True
+    assert arcade.is_point_in_polygon(25, 40, polygon) is False
+    assert arcade.is_point_in_polygon(5, 40, polygon) is True
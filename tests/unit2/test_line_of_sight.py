@@ -40,3 +40,43 @@ def test_line_of_sight(window):
 
     result = arcade.has_line_of_sight(player.position, enemy.position, wall_list)
     assert result
+
+
+def test_line_of_sight_many():
+    wall_list = arcade.SpriteList(use_spatial_hash=True, spatial_hash_cell_size=64)
+    for x, y in (100, 0), (-100, -100), (0, 300):
+        wall = arcade.SpriteSolidColor(50, 50, arcade.color.RED)
+        wall.position = x, y
+        wall_list.append(wall)
+
+    origins = [(0, 0), (0, 0), (-200, -100), (-200, -200), (-50, 300), (0, 0)]
+    targets = [(200, 0), (200, 100), (0, -100), (0, -200), (50, 300), (0, 100)]
+    expected = [False, True, False, True, False, True]
+    assert arcade.has_line_of_sight_many(origins, targets, wall_list) == expected
+
+    # Same result without the spatial hash
+    assert arcade.has_line_of_sight_many(origins, targets, list(wall_list)) == expected
+
+    # Lines along the edge of a wall don't cross it
+    assert arcade.has_line_of_sight((75, 25), (125, 25), wall_list)
+
+    assert arcade.has_line_of_sight_many(origins, targets, wall_list, max_distance=150) == [
+        False, False, False, False, False, True
+    ]
+
+
+def test_line_of_sight_transformed_walls():
+    wall_list = arcade.SpriteList(use_spatial_hash=True)
+    wall = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+    wall.position = 50, 0
+    wall_list.append(wall)
+    wall_list.offset = 100, 100
+    wall_list.scale = 2
+    wall_list.angle = 90
+
+    # The wall is drawn at (100, 200) with a size of 20x20
+    assert not arcade.has_line_of_sight((0, 200), (200, 200), wall_list)
+    assert arcade.has_line_of_sight((0, 0), (100, 0), wall_list)
+    assert arcade.has_line_of_sight_many(
+        [(0, 200), (0, 0)], [(200, 200), (100, 0)], list(wall_list)
+    ) == [True, False]
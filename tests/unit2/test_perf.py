@@ -0,0 +1,114 @@
+import csv
+import json
+
+import pytest
+import pyglet
+import arcade
+from arcade import perf
+from arcade.sprite_list import spatial_hash
+
+
+@pytest.fixture
+def profiler():
+    perf.reset()
+    perf.enable(history_size=100)
+    yield perf
+    perf.disable()
+    perf.reset()
+
+
+def test_disabled_by_default():
+    assert not perf.is_enabled()
+    perf.reset()
+    with perf.scope("test.disabled"):
+        pass
+    assert perf.get_stats() == {}
+
+
+def test_scope_and_stats(profiler):
+    for value in range(1, 201):
+        perf.record("test.values", value)
+
+    # Only the last 100 values are kept
+    assert perf.get_history("test.values") == list(range(101, 201))
+    stats = perf.get_stats()["test.values"]
+    assert stats["count"] == 100
+    assert stats["mean"] == pytest.approx(150.5)
+    assert stats["p50"] == 150
+    assert stats["p95"] == 195
+    assert stats["p99"] == 199
+    assert stats["max"] == 200
+
+    with perf.scope("test.scope"):
+        pass
+
+    @perf.timed("test.timed")
+    def func(value):
+        return value * 2
+
+    assert func(2) == 4
+    assert perf.get_stats()["test.scope"]["count"] == 1
+    assert perf.get_stats()["test.timed"]["count"] == 1
+
+
+def test_timed_disabled():
+    @perf.timed("test.timed")
+    def func(value):
+        return value * 2
+
+    # Nothing wraps the hot paths while the profiler is disabled
+    assert not hasattr(func, "__wrapped__")
+    assert not hasattr(arcade.check_for_collision_with_list, "__wrapped__")
+    assert not hasattr(arcade.SpriteList.draw, "__wrapped__")
+
+    perf.enable()
+    try:
+        assert arcade.check_for_collision_with_list.__wrapped__ is spatial_hash.check_for_collision_with_list.__wrapped__
+        assert hasattr(arcade.SpriteList.draw, "__wrapped__")
+    finally:
+        perf.disable()
+
+    assert not hasattr(arcade.check_for_collision_with_list, "__wrapped__")
+    assert not hasattr(spatial_hash.check_for_collision_with_list, "__wrapped__")
+    assert not hasattr(arcade.SpriteList.draw, "__wrapped__")
+
+
+def test_dump(profiler, tmp_path):
+    perf.record("test.values", 1.0)
+    perf.record("test.values", 3.0)
+
+    perf.dump_json(tmp_path / "perf.json", history=True)
+    with open(tmp_path / "perf.json") as fd:
+        data = json.load(fd)
+    assert data["test.values"]["max"] == 3.0
+    assert data["test.values"]["history"] == [1.0, 3.0]
+
+    perf.dump_csv(tmp_path / "perf.csv")
+    with open(tmp_path / "perf.csv") as fd:
+        rows = list(csv.reader(fd))
+    assert rows[0] == ["scope", "count", "mean", "p50", "p95", "p99", "max"]
+    assert rows[1][:2] == ["test.values", "2"]
+
+
+def test_hot_paths(window, profiler, monkeypatch):
+    # Dispatch events right away like the event loop does
+    monkeypatch.setattr(pyglet.app.event_loop, "is_running", True)
+    monkeypatch.setattr(window, "_enable_event_queue", False)
+    perf.enable(gpu=True)
+    sprite_list = arcade.SpriteList(atlas=arcade.TextureAtlas((256, 256)))
+    sprite = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+    sprite_list.append(sprite)
+    arcade.check_for_collision_with_list(sprite, sprite_list)
+
+    for _ in range(4):
+        window.on_draw = sprite_list.draw
+        window.dispatch_event("on_draw")
+        window.flip()
+    perf.draw_overlay()
+
+    stats = perf.get_stats()
+    for name in ("atlas.add", "sprite_list.draw", "sprite_list.write_buffers",
+                 "collision.check_for_collision_with_list", "window.on_draw"):
+        assert name in stats
+    assert stats["window.on_draw"]["count"] == 4
+    assert stats["window.on_draw.gpu"]["count"] == 2
@@ -0,0 +1,53 @@
+import math
+
+import arcade
+
+
+def test_convex_polygons_intersecting():
+    square = [(0, 0), (10, 0), (10, 10), (0, 10)]
+
+    # Overlapping
+    assert arcade.are_polygons_intersecting(square, [(5, 5), (15, 5), (15, 15), (5, 15)]) is True
+    # Contained
+    assert arcade.are_polygons_intersecting(square, [(2, 2), (4, 2), (4, 4)]) is True
+    # Touching edges does not count as intersecting
+    assert arcade.are_polygons_intersecting(square, [(10, 0), (20, 0), (20, 10), (10, 10)]) is False
+    # Separated
+    assert arcade.are_polygons_intersecting(square, [(11, 0), (20, 0), (20, 10), (11, 10)]) is False
+    # Clockwise winding
+    assert arcade.are_polygons_intersecting(square, [(5, 15), (15, 15), (15, 5), (5, 5)]) is True
+    # Separated on a diagonal
+    assert arcade.are_polygons_intersecting(square, [(16, 5), (21, 10), (16, 15), (11, 10)]) is False
+
+
+def test_concave_polygons_intersecting():
+    # A square with a notch cut into the top
+    notched = [(0, 0), (30, 0), (30, 30), (15, 10), (0, 30)]
+
+    # Inside the notch
+    assert arcade.are_polygons_intersecting(notched, [(13, 25), (17, 25), (17, 29), (13, 29)]) is False
+    # Overlapping the bottom
+    assert arcade.are_polygons_intersecting(notched, [(13, 2), (17, 2), (17, 6), (13, 6)]) is True
+
+
+def test_empty_polygons_intersecting():
+    square = [(0, 0), (10, 0), (10, 10), (0, 10)]
+    assert arcade.are_polygons_intersecting(square, []) is False
+
+
+def test_large_polygons_intersecting(monkeypatch):
+    def circle(center_x, center_y, vertex_count):
+        return [
+            (center_x + 32 * math.cos(math.pi * 2 * i / vertex_count),
+             center_y + 32 * math.sin(math.pi * 2 * i / vertex_count))
+            for i in range(vertex_count)
+        ]
+
+    cases = [(circle(20, 10, 32), True), (circle(100, 0, 32), False), (circle(30, 0, 4), True)]
+    poly_a = circle(0, 0, 32)
+
+    # Shapely is used for many vertices. Both give the same result.
+    for cutoff in 0, 32 * 32:
+        monkeypatch.setattr(arcade.geometry, "_SAT_MAX_VERTEX_PRODUCT", cutoff)
+        for poly_b, expected in cases:
+            assert arcade.are_polygons_intersecting(poly_a, poly_b) is expected
@@ -1,4 +1,6 @@
 import os
+import random
+import pytest
 import arcade
 
 
@@ -130,3 +132,147 @@ def test_sprite_collides_with_list():
     player.center_x = 5
     result = player.collides_with_list(coins)
     assert len(result) == 2, "Should collide with two"
+
+
+def test_sprite_list_collide_with_list():
+    bullets = arcade.SpriteList()
+    enemies = arcade.SpriteList()
+    for i in range(20):
+        bullet = arcade.SpriteSolidColor(4, 10, arcade.color.WHITE)
+        bullet.position = (i * 13) % 200, (i * 29) % 150
+        bullet.angle = i * 7
+        bullets.append(bullet)
+    for i in range(15):
+        enemy = arcade.SpriteSolidColor(20, 20, arcade.color.RED)
+        enemy.position = (i * 31) % 200, (i * 17) % 150
+        enemies.append(enemy)
+
+    expected = [
+        (i, j)
+        for i, bullet in enumerate(bullets)
+        for j, enemy in enumerate(enemies)
+        if arcade.check_for_collision(bullet, enemy)
+    ]
+    assert len(expected) > 0
+    assert bullets.collide_with_list(enemies) == expected
+    assert arcade.check_for_collision_between_lists(bullets, enemies) == expected
+
+    # A sprite never collides with itself
+    assert all(i != j for i, j in enemies.collide_with_list(enemies))
+    assert bullets.collide_with_list(arcade.SpriteList()) == []
+
+
+def test_collision_between_lists_random():
+    random.seed(1)
+    lists = arcade.SpriteList(), arcade.SpriteList()
+    for sprite_list in lists:
+        for _ in range(150):
+            sprite = arcade.SpriteSolidColor(random.randint(2, 40), random.randint(2, 40), arcade.color.RED)
+            sprite.position = random.uniform(0, 400), random.uniform(0, 100)
+            sprite.angle = random.uniform(0, 90)
+            sprite_list.append(sprite)
+
+    expected = [
+        (i, j)
+        for i, sprite_1 in enumerate(lists[0])
+        for j, sprite_2 in enumerate(lists[1])
+        if arcade.check_for_collision(sprite_1, sprite_2)
+    ]
+    assert len(expected) > 0
+    assert arcade.check_for_collision_between_lists(*lists) == expected
+
+
+def test_spatial_hash_move():
+    sprite_list = arcade.SpriteList(use_spatial_hash=True, spatial_hash_cell_size=100)
+    sprite = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+    sprite.position = 50, 50
+    sprite_list.append(sprite)
+    spatial_hash = sprite_list.spatial_hash
+    assert spatial_hash.cells_for_sprite[sprite] == (0, 0, 0, 0)
+
+    # Moving within the same cell keeps the same bucket
+    bucket = spatial_hash.contents[(0, 0)]
+    sprite.position = 60, 60
+    assert spatial_hash.contents[(0, 0)] is bucket
+
+    # Moving to another cell empties the old bucket
+    sprite.center_x = 250
+    assert spatial_hash.cells_for_sprite[sprite] == (2, 0, 2, 0)
+    assert (0, 0) not in spatial_hash.contents
+    assert arcade.get_sprites_at_point((250, 60), sprite_list) == [sprite]
+    assert arcade.get_sprites_at_point((60, 60), sprite_list) == []
+
+    # Growing the sprite adds it to the neighbouring cells
+    sprite.width = 120
+    assert spatial_hash.cells_for_sprite[sprite] == (1, 0, 3, 0)
+    assert arcade.get_sprites_at_point((195, 60), sprite_list) == [sprite]
+
+    sprite_list.remove(sprite)
+    assert spatial_hash.contents == {}
+    assert spatial_hash.cells_for_sprite == {}
+
+
+def test_spatial_hash_deferred():
+    sprite_list = arcade.SpriteList(
+        use_spatial_hash=True,
+        spatial_hash_cell_size=100,
+        spatial_hash_mode="deferred",
+    )
+    sprite = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+    sprite.position = 50, 50
+    sprite_list.append(sprite)
+    spatial_hash = sprite_list.spatial_hash
+
+    # Moves are not applied to the hash until the next query
+    sprite.center_x = 250
+    sprite.center_y = 150
+    assert spatial_hash.dirty == {sprite}
+    assert spatial_hash.cells_for_sprite[sprite] == (0, 0, 0, 0)
+
+    assert arcade.get_sprites_at_point((250, 150), sprite_list) == [sprite]
+    assert spatial_hash.dirty == set()
+    assert spatial_hash.cells_for_sprite[sprite] == (2, 1, 2, 1)
+
+    player = arcade.SpriteSolidColor(10, 10, arcade.color.BLUE)
+    player.position = 50, 50
+    sprite.position = 55, 55
+    assert arcade.check_for_collision_with_list(player, sprite_list) == [sprite]
+
+    # Removing a dirty sprite also forgets about it
+    sprite.position = 500, 500
+    sprite_list.remove(sprite)
+    assert spatial_hash.dirty == set()
+    assert spatial_hash.contents == {}
+
+
+def test_spatial_hash_mode_invalid():
+    with pytest.raises(ValueError):
+        arcade.SpriteList(spatial_hash_mode="sometimes")
+
+
+@pytest.mark.parametrize("use_spatial_hash", [True, False])
+def test_collision_with_transformed_list(use_spatial_hash):
+    sprite_list = arcade.SpriteList(use_spatial_hash=use_spatial_hash)
+    sprite = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+    sprite.position = 50, 0
+    sprite_list.append(sprite)
+    sprite_list.offset = 100, 100
+    sprite_list.scale = 2
+    sprite_list.angle = 90
+
+    # The sprite is drawn at (100, 200) with a size of 20x20
+    player = arcade.SpriteSolidColor(10, 10, arcade.color.BLUE)
+    player.position = 100, 212
+    assert arcade.check_for_collision_with_list(player, sprite_list) == [sprite]
+    assert arcade.check_for_collision_with_lists(player, [sprite_list]) == [sprite]
+    player.position = 50, 0
+    assert arcade.check_for_collision_with_list(player, sprite_list) == []
+
+    assert arcade.get_sprites_at_point((108, 208), sprite_list) == [sprite]
+    assert arcade.get_sprites_at_point((50, 0), sprite_list) == []
+
+    player_list = arcade.SpriteList()
+    player_list.append(player)
+    player.position = 100, 212
+    assert arcade.check_for_collision_between_lists(player_list, sprite_list) == [(0, 0)]
+    assert arcade.get_closest_sprite(player, sprite_list) == (sprite, pytest.approx(12))
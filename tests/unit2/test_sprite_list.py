@@ -1,5 +1,7 @@
+from array import array
 
 import pytest
+from PIL import ImageChops
 import arcade
 
 
@@ -90,3 +92,356 @@ def test_can_shuffle():
         assert spritelist._sprite_buffer_slots == 10
         assert spritelist._sprite_index_slots == 10
         assert len(spritelist) == 10
+
+
+def test_partial_buffer_upload(window):
+    spritelist = arcade.SpriteList(capacity=1000)
+    for i in range(1000):
+        sprite = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+        sprite.position = i, i
+        spritelist.append(sprite)
+    spritelist.draw()
+    assert spritelist.bytes_uploaded > 1000 * 8
+
+    # Nothing changed
+    spritelist.draw()
+    assert spritelist.bytes_uploaded == 0
+
+    # Only the slots between the two moved sprites are written
+    spritelist[10].center_x = 500
+    spritelist[12].center_y = 600
+    spritelist.draw()
+    assert spritelist.bytes_uploaded == 3 * 2 * 4
+    data = spritelist._sprite_pos_buf.read(size=1000 * 2 * 4)
+    assert data == spritelist._sprite_pos_data[:1000 * 2].tobytes()
+
+    # Most of the sprites moved. Write the whole used buffer
+    for sprite in spritelist[:800]:
+        sprite.angle = 45
+    spritelist.draw()
+    assert spritelist.bytes_uploaded == 1000 * 4
+
+
+def test_remove_compacts_index_buffer_on_draw(window):
+    spritelist = arcade.SpriteList()
+    for i in range(100):
+        sprite = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+        sprite.name = i
+        spritelist.append(sprite)
+    spritelist.draw()
+
+    for sprite in spritelist[::3]:
+        spritelist.remove(sprite)
+    assert [s.name for s in spritelist] == [i for i in range(100) if i % 3]
+    # Removed sprites are only hidden until the next draw
+    assert spritelist._sprite_index_slots == 100
+
+    spritelist.draw()
+    slots = [spritelist.sprite_slot[s] for s in spritelist]
+    assert spritelist._sprite_index_slots == len(slots) == 66
+    assert list(spritelist._sprite_index_data[:66]) == slots
+    data = spritelist._sprite_index_buf.read(size=66 * 4)
+    assert data == spritelist._sprite_index_data[:66].tobytes()
+
+
+def check_index_positions(spritelist):
+    """The list position of every sprite can be found from the index buffer"""
+    for position, sprite in enumerate(spritelist):
+        idx_slot = spritelist._sprite_index_positions[spritelist.sprite_slot[sprite]]
+        assert idx_slot - spritelist._count_tombstones_before(idx_slot) == position
+
+
+def test_remove_while_index_buffer_grows():
+    """Removed sprites are still tracked when the index buffer grows"""
+    spritelist = arcade.SpriteList(capacity=4)
+    sprites = []
+    for i in range(3):
+        sprite = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+        sprite.name = i
+        sprites.append(sprite)
+    spritelist.extend(sprites)
+    spritelist.remove(sprites[1])
+
+    # Append until the index buffer grows with removed sprites left in it
+    for i in range(3, 20):
+        sprite = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+        sprite.name = i
+        spritelist.append(sprite)
+        check_index_positions(spritelist)
+        if i % 3 == 0:
+            spritelist.remove(spritelist[1])
+            check_index_positions(spritelist)
+
+    names = [s.name for s in spritelist]
+    for sprite in list(spritelist):
+        spritelist.remove(sprite)
+        names.pop(0)
+        assert [s.name for s in spritelist] == names
+        check_index_positions(spritelist)
+
+
+def test_extend_reuses_slots_and_writes_buffers():
+    spritelist = make_named_sprites(10)
+    for sprite in spritelist[2:5]:
+        spritelist.remove(sprite)
+
+    sprites = []
+    for i in range(10, 20):
+        sprite = arcade.Sprite(center_x=i, center_y=-i, angle=i)
+        sprite.name = i
+        sprites.append(sprite)
+    spritelist.extend(sprites)
+
+    assert [s.name for s in spritelist] == [0, 1, 5, 6, 7, 8, 9] + list(range(10, 20))
+    # Freed slots are used first, the rest is added to the end of the buffers
+    assert [spritelist.sprite_slot[s] for s in sprites] == [2, 3, 4] + list(range(10, 17))
+    for sprite in sprites:
+        slot = spritelist.sprite_slot[sprite]
+        assert list(spritelist._sprite_pos_data[slot * 2:slot * 2 + 2]) == [sprite.center_x, sprite.center_y]
+        assert spritelist._sprite_angle_data[slot] == sprite.angle
+
+    with pytest.raises(ValueError):
+        spritelist.extend([sprites[0]])
+    with pytest.raises(ValueError):
+        spritelist.extend([arcade.Sprite()] * 2)
+
+
+def test_from_arrays(window):
+    texture = arcade.load_texture(":resources:images/items/coinGold.png")
+    count = 1000
+    spritelist = arcade.SpriteList.from_arrays(
+        positions=[(i, i * 2) for i in range(count)],
+        sizes=[(64, 32)] * count,
+        angles=[45] * count,
+        colors=[(255, 0, 0, 128)] * count,
+        textures=[texture] * count,
+    )
+    assert len(spritelist) == count
+    assert spritelist._buf_capacity == spritelist._idx_capacity == count + 1
+    spritelist.draw()
+    # Drawing doesn't need the sprite objects
+    assert not spritelist._sprite_list
+
+    sprite = spritelist[10]
+    assert sprite.position == (10, 20)
+    assert (sprite.width, sprite.height) == (64, 32)
+    assert sprite.scale == 64 / texture.width
+    assert sprite.angle == 45
+    assert sprite.color == (255, 0, 0)
+    assert sprite.alpha == 128
+    assert sprite.texture == texture
+
+    # The hit box follows the non-square size like a regular sprite
+    expected = arcade.Sprite(texture=texture, center_x=10, center_y=20, angle=45)
+    expected.width = 64
+    expected.height = 32
+    for point, expected_point in zip(sprite.get_adjusted_hit_box(), expected.get_adjusted_hit_box()):
+        assert point == pytest.approx(expected_point, abs=0.01)
+
+    sprite.center_x = 100
+    spritelist.remove(spritelist[0])
+    assert len(spritelist) == count - 1
+    spritelist.draw()
+
+
+def test_clear(window):
+    spritelist = arcade.SpriteList(use_spatial_hash=True, capacity=10)
+    sprites = [arcade.SpriteSolidColor(10, 10, arcade.color.RED) for _ in range(100)]
+    spritelist.extend(sprites)
+    spritelist.draw()
+    pos_buf = spritelist._sprite_pos_buf
+    capacity = spritelist._buf_capacity
+
+    spritelist.clear()
+    assert len(spritelist) == 0
+    assert not spritelist.sprite_slot
+    assert all(not sprite.sprite_lists for sprite in sprites)
+    assert arcade.check_for_collision_with_list(sprites[0], spritelist) == []
+    # The buffers are kept for the next sprites
+    assert spritelist._sprite_pos_buf is pos_buf
+    assert spritelist._buf_capacity == capacity
+    spritelist.draw()
+
+    spritelist.extend(sprites[:5])
+    assert [spritelist.sprite_slot[s] for s in spritelist] == [0, 1, 2, 3, 4]
+    assert set(arcade.check_for_collision_with_list(sprites[0], spritelist)) == set(sprites[1:5])
+    spritelist.draw()
+
+    spritelist.clear(keep_capacity=False)
+    assert spritelist._buf_capacity == spritelist._idx_capacity == 10
+    assert len(spritelist._sprite_pos_data) == 20
+    spritelist.extend(sprites)
+    spritelist.draw()
+    assert len(spritelist) == 100
+
+
+def test_list_transform(window):
+    spritelist = arcade.SpriteList()
+    sprite = arcade.SpriteSolidColor(20, 20, arcade.color.RED)
+    sprite.position = 50, 50
+    spritelist.append(sprite)
+
+    spritelist.offset = 100, 0
+    spritelist.scale = 2
+    spritelist.angle = 90
+    window.clear()
+    spritelist.draw()
+    # (50, 50) is scaled to (100, 100), rotated to (-100, 100) and moved to (0, 100)
+    assert arcade.get_pixel(5, 100) == (255, 0, 0)
+    assert arcade.get_pixel(50, 50) != (255, 0, 0)
+    # Sprites are not moved
+    assert sprite.position == (50, 50)
+    assert spritelist._sprite_pos_data[:2].tolist() == [50, 50]
+
+    with pytest.raises(ValueError):
+        spritelist.scale = 0
+
+
+def test_bulk_transforms():
+    spritelist = arcade.SpriteList(use_spatial_hash=True)
+    other = arcade.SpriteList()
+    for x in (0, 100):
+        sprite = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+        sprite.position = x, 0
+        spritelist.append(sprite)
+        other.append(sprite)
+    sprite_1, sprite_2 = spritelist
+
+    # Rescaling uses the center of the list before any sprite moved
+    spritelist.rescale(2)
+    assert sprite_1.position == (-50, 0)
+    assert sprite_2.position == (150, 0)
+    assert sprite_1.scale == sprite_2.scale == 2
+
+    spritelist.move(50, 10)
+    assert sprite_1.position == (0, 10)
+    assert list(spritelist._sprite_pos_data[:4]) == [0, 10, 200, 10]
+    # Other lists containing the sprites are updated as well
+    assert list(other._sprite_pos_data[:4]) == [0, 10, 200, 10]
+    assert spritelist.spatial_hash.get_objects_for_point((200, 10)) == [sprite_2]
+
+    spritelist.rotate_about((0, 10), 90)
+    assert sprite_2.position == pytest.approx((0, 210))
+    assert sprite_1.angle == sprite_2.angle == 90
+    assert list(spritelist._sprite_angle_data[:2]) == [90, 90]
+
+    spritelist.set_color((10, 20, 30, 40))
+    assert sprite_1.color == (10, 20, 30)
+    assert sprite_2.alpha == 40
+    spritelist.set_alpha(128)
+    assert list(spritelist._sprite_color_data[:8]) == [10, 20, 30, 128] * 2
+    assert list(other._sprite_color_data[:8]) == [10, 20, 30, 128] * 2
+
+    with pytest.raises(ValueError):
+        spritelist.set_alpha(300)
+    with pytest.raises(ValueError):
+        spritelist.set_color((1, 2))
+
+
+def test_bulk_transforms_overridden_setters():
+    class SnappingSprite(arcade.SpriteSolidColor):
+        """Keeps its position on whole numbers"""
+
+        def _set_position(self, new_value):
+            super()._set_position((round(new_value[0]), round(new_value[1])))
+
+        position = property(arcade.Sprite._get_position, _set_position)
+
+        def _set_alpha(self, alpha):
+            super()._set_alpha(min(alpha, 200))
+
+        alpha = property(arcade.Sprite._get_alpha, _set_alpha)
+
+    spritelist = arcade.SpriteList(use_spatial_hash=True)
+    plain = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+    snapping = SnappingSprite(10, 10, arcade.color.RED)
+    spritelist.extend([plain, snapping])
+
+    spritelist.move(0.4, 0.6)
+    assert plain.position == (0.4, 0.6)
+    assert snapping.position == (0, 1)
+    assert list(spritelist._sprite_pos_data[:4]) == pytest.approx([0.4, 0.6, 0, 1])
+    assert snapping in spritelist.spatial_hash.get_objects_for_point((0, 1))
+
+    spritelist.rotate_about((0, 0), 45)
+    assert snapping.position == (-1, 1)
+    assert snapping.angle == 45
+
+    spritelist.rescale(1.5)
+    assert snapping.scale == 1.5
+    assert snapping.position == tuple(round(v) for v in snapping.position)
+
+    spritelist.set_alpha(255)
+    assert plain.alpha == 255
+    assert snapping.alpha == 200
+    assert list(spritelist._sprite_color_data[3:8:4]) == [255, 200]
+
+
+def test_sort():
+    spritelist = make_named_sprites(5)
+    for sprite, y in zip(spritelist, [3, 1, 4, 1, 5]):
+        sprite.center_y = y
+
+    spritelist.sort(key=lambda sprite: sprite.center_y)
+    assert [s.name for s in spritelist] == [1, 3, 0, 2, 4]
+    assert list(spritelist._sprite_index_data[:5]) == [1, 3, 0, 2, 4]
+
+    spritelist.sort(key=lambda sprite: sprite.name, reverse=True)
+    assert [s.name for s in spritelist] == [4, 3, 2, 1, 0]
+    assert list(spritelist._sprite_index_data[:5]) == [4, 3, 2, 1, 0]
+
+
+def test_sort_by_y(window):
+    spritelist = arcade.SpriteList(sort_by="y")
+    for y in [30, 10, 40, 10, 50]:
+        sprite = arcade.SpriteSolidColor(10, 10, arcade.color.RED)
+        sprite.center_y = y
+        spritelist.append(sprite)
+
+    def index_buffer():
+        return list(array("I", spritelist._sprite_index_buf.read(size=5 * 4)))
+
+    spritelist.draw()
+    # The list order doesn't change
+    assert [s.center_y for s in spritelist] == [30, 10, 40, 10, 50]
+    assert index_buffer() == [4, 2, 0, 1, 3]
+
+    spritelist[1].center_y = 100
+    spritelist.draw()
+    assert index_buffer() == [1, 4, 2, 0, 3]
+    # Only the changed position and the index buffer are uploaded
+    assert spritelist.bytes_uploaded == 2 * 4 + 5 * 4
+
+    with pytest.raises(ValueError):
+        arcade.SpriteList(sort_by="z")
+
+
+def test_render_mode_instanced(window):
+    images = []
+    for render_mode in ("geometry", "instanced"):
+        spritelist = arcade.SpriteList(render_mode=render_mode)
+        for i, color in enumerate([arcade.color.RED, arcade.color.GREEN, arcade.color.BLUE]):
+            sprite = arcade.SpriteSolidColor(40, 20, color)
+            sprite.position = 50 + i * 60, 50
+            sprite.angle = 30 * i
+            spritelist.append(sprite)
+        removed = arcade.SpriteSolidColor(40, 40, arcade.color.WHITE)
+        removed.position = 250, 50
+        spritelist.append(removed)
+        spritelist.draw()
+        spritelist.remove(removed)
+
+        window.clear()
+        spritelist.draw()
+        assert arcade.get_pixel(50, 50) == (255, 0, 0)
+        assert arcade.get_pixel(250, 50) != (255, 255, 255)
+        images.append(arcade.get_image(0, 0, 300, 100).convert("RGB"))
+
+    # Only a few pixels on the edges of the rotated sprites can differ
+    diff = ImageChops.difference(*images).convert("L").point(lambda v: 255 if v > 16 else 0)
+    assert diff.histogram()[255] < 10
+
+    with pytest.raises(ValueError):
+        arcade.SpriteList(render_mode="points")
+    with pytest.raises(ValueError):
+        arcade.SpriteList(render_mode="instanced", sort_by="y")
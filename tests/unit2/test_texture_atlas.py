@@ -243,3 +243,138 @@ def test_max_size(ctx):
     # Create an unreasonable sized atlas
     with pytest.raises(ValueError):
         TextureAtlas((100_000, 100_000))
+
+
+def make_texture(name, size, color):
+    """Solid color texture with a white pixel in the corner to detect flipped copies"""
+    image = PIL.Image.new("RGBA", size, color)
+    image.putpixel((0, 0), (255, 255, 255, 255))
+    return arcade.Texture(name, image=image)
+
+
+def region_image(atlas, name):
+    region = atlas.get_region_info(name)
+    return atlas.to_image().crop((region.x, region.y, region.x + region.width, region.y + region.height))
+
+
+def test_skyline_allocator():
+    allocator = arcade.SkylineAllocator(100, 100)
+    positions = [allocator.alloc(50, 50) for _ in range(4)]
+    assert positions == [(0, 0), (50, 0), (0, 50), (50, 50)]
+    with pytest.raises(AllocatorException):
+        allocator.alloc(1, 1)
+
+    # Freed space is reused
+    allocator.free(50, 50, 50, 50)
+    assert allocator.free_rects == [(50, 50, 50, 50)]
+    assert allocator.alloc(50, 50) == (50, 50)
+    assert allocator.free_rects == []
+
+    # Neighbouring free rectangles are merged
+    allocator.free(50, 50, 50, 50)
+    allocator.free(0, 50, 50, 50)
+    assert allocator.alloc(100, 50) == (0, 50)
+
+    # Move a rectangle to the freed space closer to the origin
+    allocator.free(0, 0, 50, 50)
+    assert allocator.relocate(50, 0, 50, 50) == (0, 0)
+    assert allocator.relocate(0, 0, 50, 50) is None
+
+
+def test_remove_reuse_space(ctx):
+    """Removed textures leave space for new ones"""
+    atlas = TextureAtlas((100, 100), border=1, auto_resize=False)
+    textures = [make_texture(f"t{i}", (48, 48), (i * 50, 0, 0, 255)) for i in range(4)]
+    for texture in textures:
+        atlas.add(texture)
+
+    texture = make_texture("new", (48, 48), (0, 255, 0, 255))
+    with pytest.raises(AllocatorException):
+        atlas.add(texture)
+
+    region = atlas.get_region_info(textures[1].name)
+    atlas.remove(textures[1])
+    atlas.add(texture)
+    check_internals(atlas, 4)
+    assert atlas.get_region_info(texture.name).x == region.x
+    assert atlas.get_region_info(texture.name).y == region.y
+    assert region_image(atlas, texture.name).tobytes() == texture.image.tobytes()
+
+
+def test_defragment(ctx):
+    atlas = TextureAtlas((200, 200), border=1, auto_resize=False)
+    textures = [make_texture(f"t{i}", (48, 48), (i * 20, 255 - i * 20, 100, 255)) for i in range(12)]
+    for texture in textures:
+        atlas.add(texture)
+    slots = {texture.name: atlas.get_texture_id(texture.name) for texture in textures}
+
+    # Nothing to do before textures are removed
+    assert atlas.defragment() == 0
+
+    # Remove the textures closest to the origin
+    textures.sort(key=lambda t: (atlas.get_region_info(t.name).y, atlas.get_region_info(t.name).x))
+    for texture in textures[:4]:
+        atlas.remove(texture)
+    textures = textures[4:]
+    top = max(atlas.get_region_info(t.name).y for t in textures)
+
+    assert atlas.fragmented
+    assert atlas.defragment(budget=2) == 2
+    moved = 2
+    while atlas.fragmented:
+        moved += atlas.defragment(budget=2)
+    assert moved >= 4
+    assert atlas.defragment() == 0
+    assert max(atlas.get_region_info(t.name).y for t in textures) < top
+
+    # Pixels, texture coordinates and texture ids follow the textures
+    for texture in textures:
+        assert region_image(atlas, texture.name).tobytes() == texture.image.tobytes()
+        slot = atlas.get_texture_id(texture.name)
+        assert slot == slots[texture.name]
+        assert tuple(atlas._uv_data[slot * 4:slot * 4 + 4]) == pytest.approx(
+            atlas.get_region_info(texture.name).texture_coordinates
+        )
+    check_internals(atlas, 8)
+
+    # The space left at the top can be used again
+    for i in range(4):
+        atlas.add(make_texture(f"new{i}", (48, 48), (0, 0, 255, 255)))
+
+
+def test_defragment_bounded_work(ctx, monkeypatch):
+    atlas = TextureAtlas((1024, 1024), border=0, auto_resize=False)
+    textures = [make_texture(f"t{i}", (16, 16), (255, 0, 0, 255)) for i in range(2000)]
+    for texture in textures:
+        atlas.add(texture)
+    for texture in textures[::2]:
+        atlas.remove(texture)
+
+    relocated = []
+    relocate = atlas._allocator.relocate
+
+    def counting_relocate(*args):
+        relocated.append(args)
+        return relocate(*args)
+
+    monkeypatch.setattr(atlas._allocator, "relocate", counting_relocate)
+
+    # Every call looks at a limited number of textures, including the last ones
+    calls = 0
+    while atlas.fragmented:
+        relocated.clear()
+        atlas.defragment(budget=4, max_regions=32)
+        assert len(relocated) <= 32
+        calls += 1
+    assert calls > 1000 // 32
+    check_internals(atlas, 1000)
+
+
+def test_defragment_strip_allocator(ctx):
+    atlas = TextureAtlas((200, 200), allocator=arcade.StripAllocator)
+    texture_a = make_texture("a", (48, 48), (255, 0, 0, 255))
+    texture_b = make_texture("b", (48, 48), (0, 255, 0, 255))
+    atlas.add(texture_a)
+    atlas.add(texture_b)
+    atlas.remove(texture_a)
+    assert atlas.defragment() == 0
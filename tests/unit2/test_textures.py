@@ -1,5 +1,9 @@
+import gc
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import PIL.Image
 import pytest
 import arcade
 from arcade import Texture
@@ -86,3 +90,155 @@ def test_crate_empty():
         (128.0, 128.0),
         (-128.0, 128.0)
     )
+
+
+def test_texture_cache():
+    cache = arcade.TextureCache(max_bytes=3 * 10 * 10 * 4)
+    textures = [Texture.create_empty(f"cache_{i}", (10, 10)) for i in range(4)]
+    for texture in textures[:3]:
+        cache.put(texture.name, texture)
+    assert cache.bytes_used == 3 * 10 * 10 * 4
+
+    # Using a texture makes it the most recently used one
+    assert cache.get("cache_0") is textures[0]
+    assert cache.get("missing") is None
+    cache.pin("cache_1")
+
+    cache.put("cache_3", textures[3])
+    assert "cache_2" not in cache
+    assert "cache_0" in cache and "cache_1" in cache and "cache_3" in cache
+    assert cache.stats == {"size": 3, "bytes_used": 1200, "hits": 1, "misses": 1, "evictions": 1}
+
+    # Textures sharing an image are only counted once
+    cache.put("cache_0_copy", Texture("cache_0_copy", textures[0].image))
+    assert cache.bytes_used == 1200
+
+    # Pinned textures are kept even if the cache is over the limit
+    cache.max_bytes = 0
+    assert list(cache._entries) == ["cache_1"]
+    cache.unpin("cache_1")
+    assert len(cache) == 0 and cache.bytes_used == 0
+
+
+def test_texture_cache_keeps_atlas_textures(window):
+    arcade.cleanup_texture_cache()
+    cache = arcade.get_texture_cache()
+    path = ":resources:images/items/coinGold.png"
+    texture = arcade.load_texture(path)
+    assert arcade.load_texture(path) is texture
+    assert cache.hits == 1
+
+    atlas = arcade.TextureAtlas((256, 256))
+    atlas.add(texture)
+    cache.max_bytes = 0
+    try:
+        assert cache.is_pinned(texture.name)
+        assert list(cache._entries) == [texture.name]
+
+        # The source image is decoded again after it was evicted
+        flipped = arcade.load_texture(path, flipped_vertically=True)
+        assert flipped.image.size == texture.image.size
+        assert cache.evictions == 3
+    finally:
+        cache.max_bytes = None
+        arcade.cleanup_texture_cache()
+
+    sheet = arcade.load_spritesheet(":resources:images/spritesheets/explosion.png", 256, 256, 16, 2)
+    assert arcade.load_spritesheet(":resources:images/spritesheets/explosion.png", 256, 256, 16, 2) == sheet
+    arcade.cleanup_texture_cache()
+
+
+def test_texture_cache_atlas_pins_released(window):
+    cache = arcade.TextureCache()
+    textures = [Texture.create_empty(f"atlas_pin_{i}", (10, 10)) for i in range(3)]
+    for texture in textures:
+        cache.put(texture.name, texture)
+
+    atlas = arcade.TextureAtlas((256, 256), textures=textures)
+    other_atlas = arcade.TextureAtlas((256, 256), textures=textures[:1])
+    assert all(cache.is_pinned(texture.name) for texture in textures)
+
+    atlas.remove(textures[1])
+    assert not cache.is_pinned(textures[1].name)
+    atlas.rebuild()
+    assert cache.is_pinned(textures[2].name)
+    atlas.clear()
+    assert not cache.is_pinned(textures[2].name)
+    assert cache.is_pinned(textures[0].name)
+
+    # Collected atlases don't pin their textures
+    del other_atlas
+    gc.collect()
+    assert not cache.is_pinned(textures[0].name)
+
+    cache.max_bytes = 0
+    assert len(cache) == 0
+
+
+def test_preload_textures(window):
+    arcade.cleanup_texture_cache()
+    path = ":resources:images/enemies/bee.png"
+    loading = arcade.preload_textures(
+        [path, {"file_name": path, "flipped_horizontally": True, "hit_box_algorithm": "Detailed"}],
+        max_workers=2,
+    )
+    textures = loading.result(timeout=10)
+    assert loading.done and loading.progress == 1.0 and loading.completed == 2
+    assert textures[0] is arcade.load_texture(path)
+    assert textures[1] is arcade.load_texture(path, flipped_horizontally=True, hit_box_algorithm="Detailed")
+    assert textures[1]._hit_box_points is not None
+
+    atlas = arcade.TextureAtlas((512, 512))
+    assert not loading.uploaded
+    assert not loading.upload(atlas, max_textures=1)
+    assert loading.upload(atlas, max_textures=1)
+    assert all(atlas.has_texture(texture) for texture in textures)
+
+    # Textures are added to the atlas every frame when an atlas is given
+    atlas = arcade.TextureAtlas((512, 512))
+    loading = arcade.preload_textures([path], atlas=atlas)
+    loading.result(timeout=10)
+    loading._upload_frame(1 / 60)
+    assert loading.uploaded and atlas.has_texture(textures[0])
+    arcade.cleanup_texture_cache()
+
+
+def test_preload_textures_failing(window):
+    arcade.cleanup_texture_cache()
+    path = ":resources:images/enemies/bee.png"
+    atlas = arcade.TextureAtlas((512, 512))
+    loading = arcade.preload_textures(["nope.png", path], atlas=atlas)
+    with pytest.raises(FileNotFoundError):
+        loading.result(timeout=10)
+    # result() raises on the first error without waiting for the others
+    while not loading.done:
+        time.sleep(0.01)
+
+    # The failed texture is skipped and the error is only raised by result()
+    loading._upload_frame(1 / 60)
+    assert loading.uploaded
+    assert atlas.has_texture(arcade.load_texture(path))
+    loading._upload_frame(1 / 60)
+    arcade.cleanup_texture_cache()
+
+
+def test_load_texture_threads(monkeypatch):
+    arcade.cleanup_texture_cache()
+    path = ":resources:images/enemies/bee.png"
+    opened = []
+    open_image = PIL.Image.open
+
+    def slow_open(*args, **kwargs):
+        opened.append(args[0])
+        time.sleep(0.05)
+        return open_image(*args, **kwargs)
+
+    monkeypatch.setattr(PIL.Image, "open", slow_open)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        textures = list(executor.map(lambda _: arcade.load_texture(path), range(8)))
+
+    # The file is decoded once and every thread gets the same texture
+    assert len(opened) == 1
+    assert all(texture is textures[0] for texture in textures)
+    assert not arcade.get_texture_cache()._loading
+    arcade.cleanup_texture_cache()
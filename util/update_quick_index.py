@@ -22,6 +22,7 @@
     'joysticks.py': ['Game Controller Support', 'game_controller.rst'],
     'particle.py': ['Particles', 'particle_emitter.rst'],
     'paths.py': ['Pathfinding', 'path_finding.rst'],
+    'perf.py': ['Performance Profiling', 'perf.rst'],
     'physics_engines.py': ['Physics Engines', 'physics_engines.rst'],
     'pymunk_physics_engine.py': ['Physics Engines', 'physics_engines.rst'],
     'sound.py': ['Sound', 'sound.rst'],